@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -11,10 +12,30 @@ class LoginCommand:
 class TokenResult:
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RefreshTokenCommand:
+    refresh_token: str
+
+
+@dataclass(frozen=True)
+class LogoutCommand:
+    access_jti: Optional[str]
+    access_expires_at: Optional[int]        # access token `exp` (unix seconds)
+    refresh_token: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RefreshTokenGrant:
+    user_id: int
+    family_id: str
 
 @dataclass(frozen=True)
 class GetAdminQuery:
     id: int
+    username: Optional[str] = None   # from the verified token claims, when available
 
 @dataclass(frozen=True)
 class AdminResult:
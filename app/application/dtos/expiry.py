@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ExpireCommand:
+    pending_older_than: timedelta          # PENDING payments created before now - this are canceled
+    batch_size: int = 500                  # rows per statement / transaction
+    max_batches: Optional[int] = None      # per kind and run (None = until nothing is left)
+    now: Optional[datetime] = None         # reference time; None = current time
+
+
+@dataclass(frozen=True)
+class ExpireResult:
+    payments_canceled: int
+    reservations_expired: int
+    batches: int
+    elapsed_seconds: float
@@ -1,5 +1,7 @@
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional
+from domain.enums.payment import PaymentStatus
 from domain.value_objects.payer_info import PayerInfo
 from domain.value_objects.reservation_info import ReservationInfo
 
@@ -32,6 +34,61 @@ class MpgForm:
 
     
 
+def _to_int(v: Any) -> Optional[int]:
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_datetime(v: Any) -> Optional[datetime]:
+    # Newebpay sends "2023-09-27 14:21:59" (String mode may carry "+" for the space)
+    if not isinstance(v, str) or not v.strip():
+        return None
+    try:
+        return datetime.fromisoformat(v.replace("+", " "))
+    except ValueError:
+        return None
+
+
+_TRADE_RESULT_KEYS = frozenset((
+    "Status", "Message", "MerchantID", "MerchantOrderNo", "Amt", "TradeNo", "PaymentType", "PayTime", "RespondType", "IP",
+))
+
+
+@dataclass(frozen=True, slots=True)
+class TradeResult:
+    """Decrypted TradeInfo (notify) or QueryTradeInfo Result, with the fields we act on typed."""
+    status: str = ""
+    message: str = ""
+    merchant_id: str = ""
+    merchant_order_no: str = ""
+    amt: Optional[int] = None
+    trade_no: str = ""
+    payment_type: str = ""
+    pay_time: Optional[datetime] = None
+    respond_type: str = ""
+    ip: str = ""
+    extra: Dict[str, Any] = field(default_factory=dict)  # payment-method specific fields, as sent
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any], status: str = "", message: str = "") -> "TradeResult":
+        """`data` is the flat field map; `status`/`message` override the ones inside it (JSON envelope)."""
+        return cls(
+            status=str(status or data.get("Status") or ""),
+            message=str(message or data.get("Message") or ""),
+            merchant_id=str(data.get("MerchantID") or ""),
+            merchant_order_no=str(data.get("MerchantOrderNo") or ""),
+            amt=_to_int(data.get("Amt")),
+            trade_no=str(data.get("TradeNo") or ""),
+            payment_type=str(data.get("PaymentType") or ""),
+            pay_time=_to_datetime(data.get("PayTime")),
+            respond_type=str(data.get("RespondType") or ""),
+            ip=str(data.get("IP") or ""),
+            extra={k: v for k, v in data.items() if k not in _TRADE_RESULT_KEYS},
+        )
+
+
 @dataclass(frozen=True)
 class NewebpayNotify:
     status: str
@@ -39,7 +96,29 @@ class NewebpayNotify:
     version: str
     trade_info_hex: str
     trade_sha: str
-    result: Optional[Dict[str, Any]] # decrypted and parsed
+    result: Optional[TradeResult] # decrypted and parsed
+
+
+@dataclass(frozen=True)
+class InboxNotify:
+    id: int
+    notify: NewebpayNotify
+    received_at: datetime
+    attempts: int
+
+
+@dataclass(frozen=True)
+class DrainInboxResult:
+    processed: int
+    failed: int
+    lags_seconds: tuple = ()      # received_at -> processed, per item
+
+
+@dataclass(frozen=True)
+class NotifyBatchItem:
+    index: int                               # position in the input stream
+    notify: Optional[NewebpayNotify] = None  # verified + decrypted, when ok
+    error: Optional[str] = None              # why this item was rejected
 
 
 @dataclass(frozen=True)
@@ -68,4 +147,49 @@ class CreatePaymentResult:
 class HandleNotifyResult:
     ok: bool
     merchant_order_no: Optional[str] = None
-    new_status: Optional[str] = None
\ No newline at end of file
+    new_status: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PaymentTransition:
+    """A conditional status change: applied only if the payment is currently in one of `from_statuses`."""
+    payment_id: str
+    notify_key: str                       # TradeSha of the callback (or QueryTradeInfo key), recorded in the processed-notify ledger
+    to_status: PaymentStatus
+    from_statuses: FrozenSet[PaymentStatus]
+    trade_no: Optional[str] = None
+    payment_type: Optional[str] = None
+    pay_time: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class TransitionOutcome:
+    found: bool                           # payment exists
+    applied: bool                         # status was changed by this call
+    duplicate: bool = False               # callback already in the ledger; nothing was read or written
+    status: Optional[PaymentStatus] = None
+
+
+@dataclass(frozen=True)
+class PaymentCursor:
+    # position of the last row of a page in (created_at DESC, id DESC) order
+    created_at: datetime
+    id: str
+
+
+@dataclass(frozen=True)
+class PaymentListQuery:
+    statuses: Optional[List[PaymentStatus]] = None
+    reservation_id: Optional[int] = None
+    created_from: Optional[datetime] = None        # inclusive
+    created_before: Optional[datetime] = None      # exclusive
+    payer_email: Optional[str] = None              # case-insensitive exact match
+    after: Optional[PaymentCursor] = None
+    limit: int = 50
+
+
+@dataclass(frozen=True)
+class PaymentPage:
+    items: List[Any]                                # domain Payment entities
+    next_cursor: Optional[PaymentCursor] = None
+
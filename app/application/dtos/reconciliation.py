@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ReconcileCommand:
+    older_than: timedelta
+    batch_size: int = 200
+    max_payments: Optional[int] = None     # stop after checking this many (None = all)
+
+
+@dataclass(frozen=True)
+class ReconcileResult:
+    checked: int
+    updated: int
+    still_pending: int
+    errors: int
+    elapsed_seconds: float
+    orders_per_second: float
+    # age of each checked payment (now - created_at) when it was queried
+    lags_seconds: Tuple[float, ...] = ()
+    lag_p50_seconds: Optional[float] = None
+    lag_p95_seconds: Optional[float] = None
+    lag_max_seconds: Optional[float] = None
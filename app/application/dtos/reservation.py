@@ -32,3 +32,12 @@ class ReservationResult:
     created_at: datetime
     updated_at: datetime
 
+
+@dataclass(frozen=True)
+class ReservationTotals:
+    reservation_id: int
+    paid_count: int
+    paid_amount_twd: int
+    outstanding_amount_twd: int
+    status: str
+
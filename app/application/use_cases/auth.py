@@ -1,12 +1,43 @@
 from __future__ import annotations
+import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
-from domain.exceptions.auth import InvalidCredentials
-from domain.ports.password_hasher import PasswordHasher
+from domain.exceptions.auth import AdminNotFound, InvalidCredentials, InvalidToken
+from domain.ports.auth_token_repository import IRefreshTokenRepository, IRevokedTokenRepository
+from domain.ports.token_denylist import ITokenDenylist
+from domain.ports.password_hasher import PasswordHasher, AsyncPasswordHasher
 from domain.ports.token_service import TokenService
-from domain.ports.user_repository import IAdminUserRepository
-from application.dtos.auth import LoginCommand, TokenResult, GetAdminQuery, AdminResult
+from domain.ports.unit_of_work import IAsyncUnitOfWork, IUnitOfWork
+from domain.ports.user_repository import IAdminUserRepository, IAsyncAdminUserRepository
+from application.dtos.auth import LoginCommand, TokenResult, GetAdminQuery, AdminResult, RefreshTokenCommand, LogoutCommand
+from domain.entities.user import AdminUser
+
+
+async def _issue_tokens(
+    user: AdminUser,
+    token_service: TokenService,
+    refresh_tokens: Optional[IRefreshTokenRepository],
+    access_token_ttl_minutes: int,
+    refresh_token_ttl_days: int,
+    family_id: Optional[str] = None,
+) -> TokenResult:
+    access_token = token_service.create_access_token(
+        subject=user.username,
+        id=user.id,
+        expires_delta=timedelta(minutes=access_token_ttl_minutes),
+    )
+    if refresh_tokens is None:
+        return TokenResult(access_token=access_token)
+    refresh_token, token_hash = token_service.create_refresh_token()
+    await refresh_tokens.add(
+        user_id=user.id,
+        token_hash=token_hash,
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=refresh_token_ttl_days),
+    )
+    return TokenResult(access_token=access_token, refresh_token=refresh_token)
 
 
 @dataclass
@@ -14,20 +45,23 @@ class LoginUseCase:
     repo: IAdminUserRepository
     hasher: PasswordHasher
     token_service: TokenService
+    uow: IUnitOfWork
     access_token_ttl_minutes: int = 30
 
     def execute(self, cmd: LoginCommand) -> TokenResult:
-        user = self.repo.get_admin(cmd.username)
+        with self.uow:
+            user = self.repo.get_admin(cmd.username)
 
-        if user is None:
-            raise InvalidCredentials()
+            if user is None:
+                raise InvalidCredentials()
 
-        if not self.hasher.verify(cmd.password, user.password_hash):
-            raise InvalidCredentials()
+            if not self.hasher.verify(cmd.password, user.password_hash):
+                raise InvalidCredentials()
 
-        now = datetime.now(timezone.utc)
-        user.record_login(now)
-        self.repo.save_admin(user)
+            now = datetime.now(timezone.utc)
+            user.record_login(now)
+            self.repo.save_admin(user)
+            self.uow.commit()
 
         token = self.token_service.create_access_token(
             subject=user.username,
@@ -36,14 +70,122 @@ class LoginUseCase:
         )
         return TokenResult(access_token=token)
     
+
+@dataclass
+class AsyncLoginUseCase:
+    repo: IAsyncAdminUserRepository
+    hasher: AsyncPasswordHasher
+    token_service: TokenService
+    uow: IAsyncUnitOfWork
+    access_token_ttl_minutes: int = 30
+    refresh_tokens: Optional[IRefreshTokenRepository] = None   # None: access token only, as before
+    refresh_token_ttl_days: int = 14
+
+    async def execute(self, cmd: LoginCommand) -> TokenResult:
+        async with self.uow:
+            user = await self.repo.get_admin(cmd.username)
+            # end the read transaction before the (possibly queued) hash check
+            await self.uow.rollback()
+
+            if user is None:
+                raise InvalidCredentials()
+
+            # may raise PasswordHasherBusy; the controller turns that into 429
+            valid, new_hash = await self.hasher.verify_and_update(cmd.password, user.password_hash)
+            if not valid:
+                raise InvalidCredentials()
+            if new_hash:
+                # cost parameters changed since this hash was stored: upgrade it while we know the password
+                user.change_password_hash(new_hash)
+
+            now = datetime.now(timezone.utc)
+            user.record_login(now)
+            # login stamp, rehash and the new refresh token land in one commit
+            await self.repo.save_admin(user)
+            tokens = await _issue_tokens(
+                user, self.token_service, self.refresh_tokens,
+                self.access_token_ttl_minutes, self.refresh_token_ttl_days,
+            )
+            await self.uow.commit()
+        return tokens
+
+
+@dataclass
+class RefreshAccessTokenUseCase:
+    """Trade a refresh token for a new access token and a new refresh token; no password check."""
+    repo: IAsyncAdminUserRepository
+    refresh_tokens: IRefreshTokenRepository
+    token_service: TokenService
+    uow: IAsyncUnitOfWork
+    access_token_ttl_minutes: int = 30
+    refresh_token_ttl_days: int = 14
+
+    async def execute(self, cmd: RefreshTokenCommand) -> TokenResult:
+        token_hash = self.token_service.hash_refresh_token(cmd.refresh_token)
+        async with self.uow:
+            grant = await self.refresh_tokens.consume(token_hash)
+            if grant is None:
+                # a rotated token presented again means it leaked: cut off the whole login
+                await self.refresh_tokens.revoke_family_of(token_hash)
+                await self.uow.commit()
+                raise InvalidToken("refresh token is invalid or already used")
+
+            user = await self.repo.get_by_id(grant.user_id)
+            if user is None:
+                raise InvalidToken("refresh token owner no longer exists")
+
+            tokens = await _issue_tokens(
+                user, self.token_service, self.refresh_tokens,
+                self.access_token_ttl_minutes, self.refresh_token_ttl_days,
+                family_id=grant.family_id,
+            )
+            await self.uow.commit()
+        return tokens
+
+
+@dataclass
+class LogoutUseCase:
+    revoked_tokens: IRevokedTokenRepository
+    denylist: ITokenDenylist
+    refresh_tokens: IRefreshTokenRepository
+    token_service: TokenService
+    uow: IAsyncUnitOfWork
+
+    async def execute(self, cmd: LogoutCommand) -> None:
+        expires_at = None
+        async with self.uow:
+            if cmd.access_jti and cmd.access_expires_at:
+                expires_at = datetime.fromtimestamp(cmd.access_expires_at, tz=timezone.utc)
+                await self.revoked_tokens.add(cmd.access_jti, expires_at)
+            if cmd.refresh_token:
+                await self.refresh_tokens.revoke_family_of(self.token_service.hash_refresh_token(cmd.refresh_token))
+            await self.uow.commit()
+        if expires_at is not None:
+            self.denylist.add(cmd.access_jti, expires_at)
+
+
 @dataclass
 class GetAdminUseCase:
     repo: IAdminUserRepository
     def execute(self, query: GetAdminQuery) -> AdminResult:
         user = self.repo.get_by_id(query.id)
         if not user:
-            return None
+            raise AdminNotFound()
         return AdminResult(
             id=user.id,
             username=user.username,
         )
+
+
+@dataclass
+class GetAdminFromClaimsUseCase:
+    """Identity straight from verified token claims; no repository round trip."""
+    def execute(self, query: GetAdminQuery) -> AdminResult:
+        # a token without `sub` cannot answer without the database
+        if query.username is None:
+            raise InvalidToken("token has no sub claim")
+        return AdminResult(
+            id=query.id,
+            username=query.username,
+        )
+
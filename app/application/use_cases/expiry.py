@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, Tuple
+
+from application.dtos.expiry import ExpireCommand, ExpireResult
+from domain.ports.expiry_repository import IExpiryRepository
+from domain.ports.unit_of_work import IAsyncUnitOfWork
+
+
+class ExpireStaleRecordsUseCase:
+    """
+    Cancels PENDING payments nobody paid within the allowed time and expires UNPAID reservations
+    whose start time has passed. Works in short batches, one transaction each, so row locks are
+    held for milliseconds and a concurrent notify for the same payment never waits long.
+    """
+
+    def __init__(self, repo: IExpiryRepository, uow: IAsyncUnitOfWork):
+        self.repo = repo
+        self.uow = uow
+
+    async def execute(self, cmd: ExpireCommand) -> ExpireResult:
+        started = time.perf_counter()
+        # payments.created_at is naive local time, reservations.starts_at is timestamptz
+        now = cmd.now or datetime.now()
+        canceled, payment_batches = await self._sweep(
+            lambda limit: self.repo.cancel_pending_payments(now - cmd.pending_older_than, limit), cmd,
+        )
+        expired, reservation_batches = await self._sweep(
+            lambda limit: self.repo.expire_unpaid_reservations(now.astimezone(timezone.utc), limit), cmd,
+        )
+        return ExpireResult(
+            payments_canceled=canceled,
+            reservations_expired=expired,
+            batches=payment_batches + reservation_batches,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+
+    async def _sweep(self, batch: Callable[[int], Awaitable[int]], cmd: ExpireCommand) -> Tuple[int, int]:
+        total = batches = 0
+        while cmd.max_batches is None or batches < cmd.max_batches:
+            async with self.uow:
+                changed = await batch(cmd.batch_size)
+                await self.uow.commit()
+            batches += 1
+            total += changed
+            # a short batch means nothing else is due (or the rest is locked by another worker)
+            if changed < cmd.batch_size:
+                break
+        return total, batches
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from application.dtos.payment import DrainInboxResult, HandleNotifyResult, NewebpayNotify
+from application.use_cases.payment import AsyncHandleNewebpayNotifyUseCase
+from domain.exceptions.payment import NotifyInboxFull, NotifyInboxUnavailable
+from domain.ports.notify_inbox import INotifyInbox
+from domain.ports.payment_gateway import PaymentGateway
+from domain.ports.unit_of_work import IAsyncUnitOfWork
+
+
+############# Use Case: Enqueue Payment Notification #############
+
+class EnqueueNewebpayNotifyUseCase:
+    """
+    Stores the callback so the route can answer "OK" before decryption or payment I/O. The
+    TradeSha is checked first, so forged posts are rejected like on the inline path and never
+    take inbox capacity from real callbacks.
+    """
+
+    def __init__(
+        self,
+        inbox: INotifyInbox,
+        gateway: PaymentGateway,
+        uow: IAsyncUnitOfWork,
+        max_depth: int,
+        current_depth: Callable[[], int],
+    ):
+        self.inbox = inbox
+        self.gateway = gateway
+        self.uow = uow
+        self.max_depth = max_depth
+        # cheap, possibly slightly stale depth (refreshed by the inbox workers); avoids a COUNT per callback
+        self.current_depth = current_depth
+
+    async def execute(self, cmd: NewebpayNotify) -> HandleNotifyResult:
+        if not self.gateway.verify_notify_signature(cmd):
+            raise ValueError("Invalid TradeSha (SHA256 check failed)")
+        if self.current_depth() >= self.max_depth:
+            raise NotifyInboxFull()
+        try:
+            async with self.uow:
+                await self.inbox.enqueue(cmd)
+                await self.uow.commit()
+        except Exception as e:
+            raise NotifyInboxUnavailable(str(e)) from e
+        return HandleNotifyResult(ok=True)
+
+
+############# Use Case: Drain Notification Inbox #############
+
+class DrainNotifyInboxUseCase:
+    def __init__(
+        self,
+        inbox: INotifyInbox,
+        handler: AsyncHandleNewebpayNotifyUseCase,
+        uow: IAsyncUnitOfWork,
+        lease_seconds: int = 60,
+        max_attempts: int = 10,
+    ):
+        self.inbox = inbox
+        self.handler = handler
+        self.uow = uow
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    async def execute(self, limit: int) -> DrainInboxResult:
+        async with self.uow:
+            items = await self.inbox.claim(limit, self.lease_seconds)
+            await self.uow.commit()
+        processed = failed = 0
+        lags: List[float] = []
+        for item in items:
+            async with self.uow:
+                try:
+                    # inbox and handler share one session: the handler's commit carries the inbox
+                    # row's done mark together with the payment change
+                    await self.inbox.mark_done(item.id)
+                    await self.handler.execute(item.notify)
+                except Exception as e:
+                    failed += 1
+                    # drop whatever the failed handler left half-done in this session
+                    await self.uow.rollback()
+                    await self.inbox.mark_failed(
+                        item.id,
+                        f"{type(e).__name__}: {e}",
+                        give_up=item.attempts >= self.max_attempts,
+                    )
+                    await self.uow.commit()
+                    continue
+            processed += 1
+            lags.append((datetime.now(timezone.utc) - item.received_at).total_seconds())
+        return DrainInboxResult(processed=processed, failed=failed, lags_seconds=tuple(lags))
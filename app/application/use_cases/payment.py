@@ -1,5 +1,4 @@
 from __future__ import annotations
-import time
 
 from dataclasses import dataclass
 from typing import Dict, Optional
@@ -7,109 +6,195 @@ from uuid import uuid4
 
 from infrastructure.database.repositories.payment import PaymentRepository
 from domain.entities.payment import Payment
-from application.dtos.payment import CreatePaymentCommand, CreatePaymentResult, MpgForm, NewebpayNotify, HandleNotifyResult
-from domain.ports.payment_repository import IPaymentRepository
+from application.dtos.payment import CreatePaymentCommand, CreatePaymentResult, MpgForm, NewebpayNotify, HandleNotifyResult, PaymentTransition, PaymentListQuery, PaymentPage
+from domain.ports.payment_repository import IPaymentRepository, IAsyncPaymentRepository
 from domain.ports.payment_gateway import PaymentGateway, NewebpayNotify
+from domain.ports.order_number import OrderNumberGenerator
+from domain.ports.unit_of_work import IAsyncUnitOfWork, IUnitOfWork
 from datetime import datetime
 from domain.enums.payment import PaymentStatus, PaymentProvider
 
 
+def _new_pending_payment(cmd: CreatePaymentCommand, order_numbers: OrderNumberGenerator) -> Payment:
+    if cmd.amount_twd <= 0:
+        raise ValueError("amount_twd must be positive")
+
+    # MerchantOrderNo must be unique and <= 30 chars; generated in-process, so two checkouts
+    # for the same reservation in the same second no longer hit the unique index
+    merchant_order_no = order_numbers.next_order_no()
+
+    payment = Payment(
+        id=merchant_order_no,
+        reservation_info=cmd.reservation_info,
+        payer_info=cmd.payer_info,
+        amount_twd=cmd.amount_twd,
+        status=PaymentStatus.PENDING,
+        payment_provider=PaymentProvider.NEWEBPAY,
+        merchant_order_no=merchant_order_no,
+        trade_no="",
+        payment_type="",
+        pay_time=None,
+    )
+    payment.mark_pending()
+    return payment
+
+
+def _build_create_result(cmd: CreatePaymentCommand, payment: Payment, gateway: PaymentGateway) -> CreatePaymentResult:
+    mpg_form = MpgForm(
+        merchant_order_no=payment.merchant_order_no,
+        amount_twd=cmd.amount_twd,
+        item_desc=cmd.item_desc,
+        notify_url=cmd.notify_url,
+        return_url=cmd.return_url,
+        customer_url=cmd.customer_url,
+        client_back_url=cmd.client_back_url,
+        respond_type=cmd.respond_type,
+        lang_type=cmd.lang_type,
+        enable_payments=cmd.enable_payments,
+    )
+
+    mpg_form_request = gateway.build_mpg_form(mpg_form=mpg_form)
+
+    return CreatePaymentResult(
+        merchant_order_no=payment.merchant_order_no,
+        mpg_form_request=mpg_form_request,
+    )
+
+
+# A callback may arrive more than once and out of order. SUCCESS can still settle a payment a
+# failure notice got to first, or one the expiry sweep canceled locally; a failure never
+# overwrites PAID (or a refund state).
+_PAYABLE_FROM = frozenset({
+    PaymentStatus.CREATED, PaymentStatus.PENDING, PaymentStatus.FAILED, PaymentStatus.CANCELED,
+})
+_FAILABLE_FROM = frozenset({PaymentStatus.CREATED, PaymentStatus.PENDING})
+
+
+def build_transition(notify: NewebpayNotify) -> PaymentTransition:
+    """
+    Turn a verified notify into the conditional status change the repository applies atomically.
+    Callbacks carry SUCCESS or an error code; "CANCELED" only comes from reconciliation
+    (QueryTradeInfo TradeStatus 3) and, like a failure, never overwrites PAID.
+    """
+    result = notify.result
+    if notify.status == "SUCCESS":
+        return PaymentTransition(
+            payment_id=result.merchant_order_no,
+            notify_key=notify.trade_sha,
+            to_status=PaymentStatus.PAID,
+            from_statuses=_PAYABLE_FROM,
+            trade_no=result.trade_no,
+            payment_type=result.payment_type,
+            pay_time=result.pay_time,
+        )
+    return PaymentTransition(
+        payment_id=result.merchant_order_no,
+        notify_key=notify.trade_sha,
+        to_status=PaymentStatus.CANCELED if notify.status == "CANCELED" else PaymentStatus.FAILED,
+        from_statuses=_FAILABLE_FROM,
+    )
+
+
 ############# Use Case: Create Payment #############
 
 class CreatePaymentUseCase:
-    def __init__(self, repo: IPaymentRepository, gateway: PaymentGateway):
+    def __init__(
+        self,
+        repo: IPaymentRepository,
+        gateway: PaymentGateway,
+        uow: IUnitOfWork,
+        order_numbers: OrderNumberGenerator,
+    ):
         self.repo = repo
         self.gateway = gateway
+        self.uow = uow
+        self.order_numbers = order_numbers
 
     def execute(self, cmd: CreatePaymentCommand) -> CreatePaymentResult:
-        if cmd.amount_twd <= 0:
-            raise ValueError("amount_twd must be positive")
-
-
-        # MerchantOrderNo needs to be unique, <= 30 chars typically.
-        # Use a deterministic + unique scheme:
-        raw = f"RES{cmd.reservation_info.id}-{int(time.time())}".replace("-", "")
-        merchant_order_no = raw[:30]
-
-        payment = Payment(
-            id=merchant_order_no,
-            reservation_info=cmd.reservation_info,
-            payer_info=cmd.payer_info,
-            amount_twd=cmd.amount_twd,
-            status=PaymentStatus.PENDING,
-            payment_provider=PaymentProvider.NEWEBPAY,
-            merchant_order_no=merchant_order_no,
-            trade_no="",
-            payment_type="",
-            pay_time=datetime.now,
-        )
-        payment.mark_pending()
-        self.repo.add(payment)
-
+        payment = _new_pending_payment(cmd, self.order_numbers)
+        with self.uow:
+            self.repo.add(payment)
+            self.uow.commit()
+        return _build_create_result(cmd, payment, self.gateway)
+
+
+class AsyncCreatePaymentUseCase:
+    def __init__(
+        self,
+        repo: IAsyncPaymentRepository,
+        gateway: PaymentGateway,
+        uow: IAsyncUnitOfWork,
+        order_numbers: OrderNumberGenerator,
+    ):
+        self.repo = repo
+        self.gateway = gateway
+        self.uow = uow
+        self.order_numbers = order_numbers
 
-        mpg_form = MpgForm(
-            merchant_order_no=merchant_order_no,
-            amount_twd=cmd.amount_twd,
-            item_desc=cmd.item_desc,
-            notify_url=cmd.notify_url,
-            return_url=cmd.return_url,
-            customer_url=cmd.customer_url,
-            client_back_url=cmd.client_back_url,
-            respond_type=cmd.respond_type,
-            lang_type=cmd.lang_type,
-            enable_payments=cmd.enable_payments,
-        )              
-
-        mpg_form_request = self.gateway.build_mpg_form(mpg_form=mpg_form)
-
-        return CreatePaymentResult(
-            merchant_order_no=merchant_order_no,
-            mpg_form_request=mpg_form_request,
-        )
+    async def execute(self, cmd: CreatePaymentCommand) -> CreatePaymentResult:
+        payment = _new_pending_payment(cmd, self.order_numbers)
+        async with self.uow:
+            await self.repo.add(payment)
+            await self.uow.commit()
+        return _build_create_result(cmd, payment, self.gateway)
 
 
 ############# Use Case: Handle Payment Notification #############
 
 
 class HandleNewebpayNotifyUseCase:
-    def __init__(self, repo: IPaymentRepository, gateway: PaymentGateway):
+    def __init__(self, repo: IPaymentRepository, gateway: PaymentGateway, uow: IUnitOfWork):
         self.repo = repo
         self.gateway = gateway
+        self.uow = uow
 
     def execute(self, cmd: NewebpayNotify) -> HandleNotifyResult:
         notify = self.gateway.parse_and_verify_notify(cmd)
+        merchant_order_no = notify.result.merchant_order_no
+
+        # no read-then-write: the repository inserts into the processed-notify ledger and runs a
+        # conditional UPDATE in one transaction, so duplicate and concurrent callbacks are harmless
+        with self.uow:
+            outcome = self.repo.apply_transition(build_transition(notify))
+            self.uow.commit()
+        # Don't explode on unknown orders; caller (route) should still return 200
+        return HandleNotifyResult(
+            ok=outcome.found,
+            merchant_order_no=merchant_order_no,
+            new_status=outcome.status.value if outcome.status else None,
+        )
+
+
+class AsyncHandleNewebpayNotifyUseCase:
+    def __init__(self, repo: IAsyncPaymentRepository, gateway: PaymentGateway, uow: IAsyncUnitOfWork):
+        self.repo = repo
+        self.gateway = gateway
+        self.uow = uow
+
+    async def execute(self, cmd: NewebpayNotify) -> HandleNotifyResult:
+        notify = self.gateway.parse_and_verify_notify(cmd)
+        merchant_order_no = notify.result.merchant_order_no
 
-        # decrypted result often includes these
-        merchant_order_no = str(notify.result.get("MerchantOrderNo") or "")
-        trade_no = str(notify.result.get("TradeNo") or "")
-        payment_type = str(notify.result.get("PaymentType") or "")
-        pay_time_raw = notify.result.get("PayTime")
-
-        payment = self.repo.get_by_id(merchant_order_no)
-        if not payment:
-            # Don't explode; caller (route) should still return 200
-            return HandleNotifyResult(ok=False, merchant_order_no=merchant_order_no)
-
-        # Idempotency: if already paid, ignore repeats
-        if payment.status == PaymentStatus.PAID and notify.status == "SUCCESS":
-            return HandleNotifyResult(ok=True, merchant_order_no=merchant_order_no, new_status=payment.status.value)
-
-        if notify.status == "SUCCESS":
-            pay_time = None
-            if isinstance(pay_time_raw, str) and pay_time_raw.strip():
-                safe = pay_time_raw.replace("+", " ")
-                try:
-                    pay_time = datetime.strptime(safe, "%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    pay_time = None
-            payment.mark_paid(trade_no=trade_no, payment_type=payment_type, pay_time=pay_time)
-        else:
-            payment.mark_failed()
-
-        self.repo.update(payment)
+        async with self.uow:
+            outcome = await self.repo.apply_transition(build_transition(notify))
+            await self.uow.commit()
         return HandleNotifyResult(
-            ok=True,
+            ok=outcome.found,
             merchant_order_no=merchant_order_no,
-            new_status=payment.status.value,
+            new_status=outcome.status.value if outcome.status else None,
         )
 
+
+############# Use Case: List Payments (admin) #############
+
+class ListPaymentsUseCase:
+    MAX_LIMIT = 200
+
+    def __init__(self, repo: IAsyncPaymentRepository):
+        self.repo = repo
+
+    async def execute(self, query: PaymentListQuery) -> PaymentPage:
+        if not 1 <= query.limit <= self.MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {self.MAX_LIMIT}")
+        return await self.repo.list_page(query)
+
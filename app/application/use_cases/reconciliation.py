@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from application.dtos.payment import NewebpayNotify, PaymentTransition, TradeResult
+from application.dtos.reconciliation import ReconcileCommand, ReconcileResult
+from application.use_cases.payment import build_transition
+from domain.entities.payment import Payment
+from domain.ports.payment_gateway import PaymentGateway
+from domain.ports.payment_repository import IAsyncPaymentRepository
+from domain.ports.unit_of_work import IAsyncUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+# QueryTradeInfo Result.TradeStatus -> the notify Status that drives the same transition.
+# "0" (unpaid) and anything unknown leave the payment PENDING.
+_TRADE_STATUS_TO_NOTIFY_STATUS = {
+    "1": "SUCCESS",
+    "2": "FAILED",
+    "3": "CANCELED",
+}
+
+
+class _RateLimiter:
+    """Hands out evenly spaced start slots, `rate` per second, shared by all concurrent callers."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class ReconcilePendingPaymentsUseCase:
+    """
+    Re-checks PENDING payments whose NotifyURL callback never arrived by asking Newebpay (QueryTradeInfo),
+    then applies the answer through the same transitions and processed-notify ledger as
+    HandleNewebpayNotifyUseCase.
+    """
+
+    def __init__(
+        self,
+        repo: IAsyncPaymentRepository,
+        gateway: PaymentGateway,
+        uow: IAsyncUnitOfWork,
+        concurrency: int = 8,
+        rate_per_second: float = 5.0,
+    ):
+        self.repo = repo
+        self.gateway = gateway
+        self.uow = uow
+        self.concurrency = concurrency
+        self.rate_per_second = rate_per_second
+
+    async def execute(self, cmd: ReconcileCommand) -> ReconcileResult:
+        started = time.perf_counter()
+        now = datetime.now()
+        cutoff = now - cmd.older_than
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = _RateLimiter(self.rate_per_second)
+
+        checked = updated = errors = 0
+        lags: List[float] = []
+        after_id: Optional[str] = None
+
+        while cmd.max_payments is None or checked < cmd.max_payments:
+            limit = cmd.batch_size
+            if cmd.max_payments is not None:
+                limit = min(limit, cmd.max_payments - checked)
+            # read and write-back are separate short transactions; no connection sits idle in
+            # a transaction while the gateway is queried
+            async with self.uow:
+                page = await self.repo.list_pending_before(cutoff, after_id, limit)
+            if not page:
+                break
+            after_id = page[-1].id
+
+            async def query(p: Payment) -> Tuple[Payment, Optional[Dict[str, Any]]]:
+                async with semaphore:
+                    await limiter.wait()
+                    try:
+                        return p, await self.gateway.query_trade_info(p.merchant_order_no, p.amount_twd)
+                    except Exception:
+                        # counted with the rejected answers in ReconcileResult.errors
+                        logger.warning(
+                            "QueryTradeInfo failed for payment %s (MerchantOrderNo=%s)",
+                            p.id, p.merchant_order_no, exc_info=True,
+                        )
+                        return p, None
+
+            transitions: List[PaymentTransition] = []
+            for payment, response in await asyncio.gather(*(query(p) for p in page)):
+                checked += 1
+                lags.append((now - payment.created_at).total_seconds())
+                if response is None or not self._trusted(payment, response):
+                    errors += 1
+                    continue
+                transition = self._transition(response)
+                if transition is not None:
+                    transitions.append(transition)
+
+            async with self.uow:
+                for transition in transitions:
+                    outcome = await self.repo.apply_transition(transition)
+                    if outcome.applied:
+                        updated += 1
+                await self.uow.commit()
+
+        elapsed = time.perf_counter() - started
+        return ReconcileResult(
+            checked=checked,
+            updated=updated,
+            still_pending=checked - updated - errors,
+            errors=errors,
+            elapsed_seconds=elapsed,
+            orders_per_second=checked / elapsed if elapsed > 0 else 0.0,
+            lags_seconds=tuple(lags),
+            lag_p50_seconds=statistics.median(lags) if lags else None,
+            lag_p95_seconds=_percentile(lags, 0.95),
+            lag_max_seconds=max(lags) if lags else None,
+        )
+
+    def _trusted(self, payment: Payment, response: Dict[str, Any]) -> bool:
+        """
+        A SUCCESS answer is only acted on if its CheckCode verifies and it is about this payment's
+        order and amount; anything else is logged and counted as an error, never applied.
+        """
+        if response.get("Status") != "SUCCESS":
+            return True
+        result = response.get("Result") or {}
+        if not self.gateway.verify_check_code(result):
+            problem = "CheckCode mismatch"
+        elif str(result.get("MerchantOrderNo", "")) != payment.merchant_order_no:
+            problem = "MerchantOrderNo mismatch"
+        elif str(result.get("Amt", "")) != str(payment.amount_twd):
+            problem = "Amt mismatch"
+        else:
+            return True
+        logger.warning(
+            "QueryTradeInfo result rejected (%s) for payment %s: MerchantOrderNo=%s Amt=%s, expected %s / %s",
+            problem, payment.id, result.get("MerchantOrderNo"), result.get("Amt"),
+            payment.merchant_order_no, payment.amount_twd,
+        )
+        return False
+
+    @staticmethod
+    def _transition(response: Dict[str, Any]) -> Optional[PaymentTransition]:
+        if response.get("Status") != "SUCCESS":
+            # e.g. order unknown to Newebpay: the payer never submitted the MPG form
+            return None
+        result = response.get("Result") or {}
+        trade_status = str(result.get("TradeStatus", ""))
+        notify_status = _TRADE_STATUS_TO_NOTIFY_STATUS.get(trade_status)
+        if notify_status is None:
+            return None
+        # the answer has no TradeSha; its verified CheckCode does not cover TradeStatus, so the
+        # ledger key folds that in (hex SHA-256, same shape as a TradeSha)
+        notify_key = hashlib.sha256(f"{result.get('CheckCode')}:{trade_status}".encode()).hexdigest().upper()
+        return build_transition(NewebpayNotify(
+            status=notify_status,
+            merchant_id=str(result.get("MerchantID", "")),
+            version="",
+            trade_info_hex="",
+            trade_sha=notify_key,
+            result=TradeResult.from_mapping(result),
+        ))
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
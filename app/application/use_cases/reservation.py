@@ -1,22 +1,89 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 from application.dtos.reservation import ReservationCreateCommand, ReservationResult
+from domain.entities.player import Player
 from domain.entities.reservation import Reservation
+from domain.enums.reservation import ReservationStatus
 from domain.exceptions.reservation import ReservationValidationError
+from domain.ports.player_repository import IPlayerRepository
 from domain.ports.reservation_repository import IReservationRepository
+from domain.ports.reservation_totals_repository import IReservationTotalsRepository
+from domain.ports.unit_of_work import IAsyncUnitOfWork, IUnitOfWork
 
 @dataclass
 class DraftReservationUseCase:
     repo: IReservationRepository
-    def execute(self, cmd: ReservationCreateCommand) -> Reservation:
+    players: IPlayerRepository
+    uow: IUnitOfWork
+    def execute(self, cmd: ReservationCreateCommand) -> ReservationResult:
         if cmd.court_name is None or cmd.court_name.strip() == "":
             raise ReservationValidationError("Court name cannot be empty.")
         if cmd.starts_at is None:
             raise ReservationValidationError("Start time is required.")
 
         # 交給 repo 做交易處理與 player upsert/關聯
-        return ReservationResult
+        # whole roster -> ids in one statement, committed together with the reservation
+        with self.uow:
+            ids = self.players.upsert_many(cmd.players)
+            reservation = self._build(cmd, ids)
+            self.repo.save(reservation)
+            self.uow.commit()
 
+        return ReservationResult(
+            id=reservation.id,
+            starts_at=reservation.starts_at,
+            court_name=reservation.court_name,
+            court_note=reservation.court_note,
+            players=[p.name for p in reservation.players],
+            fee_per_person=reservation.fee_per_person,
+            bank_account=reservation.bank_account,
+            allow_multi_payer=reservation.allow_multi_payer,
+            auto_issue_invoice=reservation.auto_issue_invoice,
+            paid_amount=reservation.paid_amount,
+            status=reservation.status.value,
+            created_at=reservation.created_at,
+            updated_at=reservation.updated_at,
+        )
 
+    @staticmethod
+    def _build(cmd: ReservationCreateCommand, ids: dict) -> Reservation:
+        now = datetime.now()
+        return Reservation(
+            id=None,
+            starts_at=cmd.starts_at,
+            court_name=cmd.court_name.strip(),
+            court_note=cmd.court_note,
+            fee_per_person=cmd.fee_per_person,
+            paid_amount=cmd.paid_amount,
+            bank_account=cmd.bank_account or "",
+            allow_multi_payer=cmd.allow_multi_payer,
+            auto_issue_invoice=cmd.auto_issue_invoice,
+            players=[Player(id=player_id, name=name, created_at=None) for name, player_id in ids.items()],
+            status=ReservationStatus.EDITING,
+            created_at=now,
+            updated_at=now,
+        )
 
 
+@dataclass
+class RebuildReservationTotalsUseCase:
+    """Recompute every reservation's payment aggregate, e.g. after a backfill or a manual fix."""
+    repo: IReservationTotalsRepository
+    uow: IAsyncUnitOfWork
+    batch_size: int = 1000
+
+    async def execute(self) -> int:
+        done = 0
+        after = 0
+        while True:
+            # one short transaction per batch; row locks are not held for the whole run
+            async with self.uow:
+                ids = await self.repo.next_reservation_ids(after, self.batch_size)
+                if not ids:
+                    return done
+                await self.repo.refresh(ids)
+                await self.uow.commit()
+            done += len(ids)
+            after = ids[-1]
+
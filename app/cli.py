@@ -0,0 +1,107 @@
+"""
+Operational commands, run from the app/ directory:
+
+    python cli.py reconcile [--older-than-minutes N] [--max-payments N]
+    python cli.py rebuild-totals [--batch-size N]
+    python cli.py expire [--pending-older-than-minutes N] [--batch-size N] [--max-batches N]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict
+from datetime import timedelta
+
+from infrastructure.config.container import aclose_container
+from infrastructure.config.settings import get_settings
+from infrastructure.database.session import async_engine
+from infrastructure.observability.structured_logging import configure_logging
+
+
+async def _reconcile(args: argparse.Namespace) -> int:
+    from presentation.tasks.reconciliation import run_reconciliation
+
+    try:
+        result = await run_reconciliation(
+            older_than=timedelta(minutes=args.older_than_minutes) if args.older_than_minutes is not None else None,
+            max_payments=args.max_payments,
+        )
+    finally:
+        await aclose_container()
+        await async_engine.dispose()
+
+    if result is None:
+        print("another reconciliation run holds the lock; nothing done")
+        return 1
+    summary = asdict(result)
+    summary.pop("lags_seconds")
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+async def _rebuild_totals(args: argparse.Namespace) -> int:
+    from application.use_cases.reservation import RebuildReservationTotalsUseCase
+    from infrastructure.database.repositories.reservation_totals import ReservationTotalsRepository
+    from infrastructure.database.session import AsyncSessionLocal
+    from infrastructure.database.unit_of_work import AsyncSqlAlchemyUnitOfWork
+
+    try:
+        async with AsyncSessionLocal() as db:
+            uc = RebuildReservationTotalsUseCase(
+                ReservationTotalsRepository(db), AsyncSqlAlchemyUnitOfWork(db), batch_size=args.batch_size
+            )
+            count = await uc.execute()
+    finally:
+        await async_engine.dispose()
+
+    print(json.dumps({"reservations": count}, indent=2))
+    return 0
+
+
+async def _expire(args: argparse.Namespace) -> int:
+    from presentation.tasks.expiry import run_expiry
+
+    try:
+        result = await run_expiry(
+            pending_older_than=(
+                timedelta(minutes=args.pending_older_than_minutes)
+                if args.pending_older_than_minutes is not None else None
+            ),
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+        )
+    finally:
+        await aclose_container()
+        await async_engine.dispose()
+
+    print(json.dumps(asdict(result), indent=2))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="cli.py")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = sub.add_parser("reconcile", help="re-check stale PENDING payments with QueryTradeInfo")
+    reconcile.add_argument("--older-than-minutes", type=int, default=None)
+    reconcile.add_argument("--max-payments", type=int, default=None)
+    reconcile.set_defaults(handler=_reconcile)
+
+    rebuild = sub.add_parser("rebuild-totals", help="recompute every reservation's payment aggregate")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    rebuild.set_defaults(handler=_rebuild_totals)
+
+    expire = sub.add_parser("expire", help="cancel stale PENDING payments and expire past UNPAID reservations")
+    expire.add_argument("--pending-older-than-minutes", type=int, default=None)
+    expire.add_argument("--batch-size", type=int, default=None)
+    expire.add_argument("--max-batches", type=int, default=None)
+    expire.set_defaults(handler=_expire)
+
+    args = parser.parse_args(argv)
+    # stdout carries the JSON summary; logs go to stderr
+    configure_logging(get_settings().logging, stream=sys.stderr)
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
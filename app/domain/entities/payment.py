@@ -24,7 +24,7 @@ class Payment:
 
     def mark_pending(self) -> None:
         self.status = PaymentStatus.PENDING
-        self.updated_at = datetime.now
+        self.updated_at = datetime.now()
 
     def mark_paid(
         self,
@@ -36,16 +36,16 @@ class Payment:
         self.trade_no = trade_no
         self.payment_type = payment_type
         self.pay_time = pay_time
-        self.updated_at = datetime.now
+        self.updated_at = datetime.now()
 
     def mark_failed(self) -> None:
         self.status = PaymentStatus.FAILED
-        self.updated_at = datetime.now
+        self.updated_at = datetime.now()
 
     def mark_refund_pending(self) -> None:
         self.status = PaymentStatus.REFUND_PENDING
-        self.updated_at = datetime.now
+        self.updated_at = datetime.now()
 
     def mark_refunded(self) -> None:
         self.status = PaymentStatus.REFUNDED
-        self.updated_at = datetime.now
+        self.updated_at = datetime.now()
@@ -3,8 +3,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List
 
-from app.domain.entities.player import Player
-from app.domain.enums.reservation import ReservationStatus, PaymentMethod, PaymentStatus
+from domain.entities.payment import Payment
+from domain.entities.player import Player
+from domain.enums.reservation import ReservationStatus, PaymentMethod, PaymentStatus
 
 @dataclass
 class Reservation:
@@ -21,6 +22,7 @@ class Reservation:
     status: str
     created_at: datetime
     updated_at: datetime
+    payments: List[Payment] = field(default_factory=list)
 
     def record_update(self) -> None:
         self.updated_at = datetime.now()
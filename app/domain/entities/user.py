@@ -11,4 +11,7 @@ class AdminUser:
     last_login_at: Optional[datetime] = None
 
     def record_login(self, when: Optional[datetime] = None) -> None:
-        self.last_login_at = when or datetime.now()
\ No newline at end of file
+        self.last_login_at = when or datetime.now()
+
+    def change_password_hash(self, password_hash: str) -> None:
+        self.password_hash = password_hash
@@ -5,4 +5,10 @@ class InvalidToken(Exception):
     """The provided token is invalid."""
     
 class AdminRequired(Exception):
-    """Admin privileges are required to perform this action."""
\ No newline at end of file
+    """Admin privileges are required to perform this action."""
+
+class AdminNotFound(Exception):
+    """The admin the token refers to no longer exists."""
+
+class PasswordHasherBusy(Exception):
+    """Too many password checks are already running; the caller should retry later."""
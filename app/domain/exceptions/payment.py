@@ -0,0 +1,5 @@
+class NotifyInboxUnavailable(Exception):
+    """The notify could not be stored durably; the gateway must not get "OK" and should retry."""
+
+class NotifyInboxFull(NotifyInboxUnavailable):
+    """The notify inbox is over its configured depth."""
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from application.dtos.auth import RefreshTokenGrant
+
+
+class IRefreshTokenRepository(ABC):
+    @abstractmethod
+    async def add(self, user_id: int, token_hash: str, family_id: str, expires_at: datetime) -> None: ...
+
+    @abstractmethod
+    async def consume(self, token_hash: str) -> Optional[RefreshTokenGrant]:
+        """Atomically mark a live token as rotated and return its grant; None if unknown, used, revoked or expired."""
+
+    @abstractmethod
+    async def revoke_family_of(self, token_hash: str) -> bool:
+        """Revoke every token issued from the same login as `token_hash`; False if the hash is unknown."""
+
+
+class IRevokedTokenRepository(ABC):
+    @abstractmethod
+    async def add(self, jti: str, expires_at: datetime) -> None: ...
+
+    @abstractmethod
+    async def list_revoked_since(self, since: Optional[datetime]) -> List[Tuple[str, datetime, datetime]]:
+        """(jti, expires_at, revoked_at) of unexpired entries revoked after `since` (all if None)."""
+
+    @abstractmethod
+    async def prune(self, before: datetime) -> int:
+        """Delete entries that expired before `before`."""
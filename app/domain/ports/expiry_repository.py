@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class IExpiryRepository(ABC):
+    """
+    Bounded, lock-skipping status sweeps. Each call touches at most `limit` rows and skips rows
+    another transaction holds, so several workers can sweep at once without waiting on each other.
+    """
+
+    @abstractmethod
+    async def cancel_pending_payments(self, created_before: datetime, limit: int) -> int:
+        """PENDING payments created before `created_before` -> CANCELED; returns rows changed."""
+
+    @abstractmethod
+    async def expire_unpaid_reservations(self, starts_before: datetime, limit: int) -> int:
+        """UNPAID reservations starting before `starts_before` -> EXPIRED; returns rows changed."""
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List
+
+from application.dtos.payment import InboxNotify, NewebpayNotify
+
+
+class INotifyInbox(ABC):
+    """Durable queue of raw notify callbacks, acknowledged to Newebpay before they are processed."""
+
+    @abstractmethod
+    async def enqueue(self, notify: NewebpayNotify) -> bool:
+        """Persist the raw callback. Returns False if the same TradeSha is already in the inbox."""
+
+    @abstractmethod
+    async def depth(self) -> int:
+        """Number of callbacks not yet processed."""
+
+    @abstractmethod
+    async def claim(self, limit: int, lease_seconds: int) -> List[InboxNotify]:
+        """Lease up to `limit` unprocessed callbacks to the caller; other workers skip them until the lease ends."""
+
+    @abstractmethod
+    async def mark_done(self, inbox_id: int) -> None: ...
+
+    @abstractmethod
+    async def mark_failed(self, inbox_id: int, error: str, give_up: bool) -> None:
+        """Record the error; the item is retried after its lease unless `give_up` is set."""
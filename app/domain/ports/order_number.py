@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+
+
+class OrderNumberGenerator(ABC):
+    @abstractmethod
+    def next_order_no(self) -> str:
+        """A new MerchantOrderNo, never handed out before by any process."""
+        raise NotImplementedError
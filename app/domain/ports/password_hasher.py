@@ -1,6 +1,19 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Tuple
 
 class PasswordHasher(ABC):
     @abstractmethod
     def verify(self, plain_password: str, password_hash: str) -> bool:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+
+class AsyncPasswordHasher(ABC):
+    """Password checks off the event loop; implementations bound how many may be in flight."""
+
+    @abstractmethod
+    async def verify_and_update(self, plain_password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Return (valid, new_hash). `new_hash` is set when the password is valid but the stored hash
+        uses outdated parameters and should be replaced. Raises PasswordHasherBusy when saturated.
+        """
+        raise NotImplementedError
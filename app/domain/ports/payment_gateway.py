@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from typing import Any, Dict, Mapping, Optional
 from application.dtos.payment import MpgForm, MpgFormRequest, NewebpayNotify
 
 
@@ -13,8 +13,17 @@ class PaymentGateway(ABC):
     @abstractmethod
     def parse_and_verify_notify(self, form: Dict[str, str]) -> NewebpayNotify: ...
 
+    @abstractmethod
+    def verify_notify_signature(self, form: NewebpayNotify) -> bool: ...
+
     @abstractmethod
     def build_query_payload(self, merchant_order_no: str, amount_twd: int) -> Dict[str, str]: ...
 
     @abstractmethod
-    def create_check_value(self, merchant_order_no: str, amount_twd: int) -> str: ...
\ No newline at end of file
+    def create_check_value(self, merchant_order_no: str, amount_twd: int) -> str: ...
+
+    @abstractmethod
+    def verify_check_code(self, result: Mapping[str, Any]) -> bool: ...
+
+    @abstractmethod
+    async def query_trade_info(self, merchant_order_no: str, amount_twd: int) -> Dict[str, Any]: ...
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from domain.entities.payment import Payment
+from application.dtos.payment import PaymentListQuery, PaymentPage, PaymentTransition, TransitionOutcome
 
 
 class IPaymentRepository(ABC):
@@ -17,3 +19,33 @@ class IPaymentRepository(ABC):
 
     @abstractmethod
     def update(self, payment: Payment) -> None: ...
+
+    @abstractmethod
+    def apply_transition(self, t: PaymentTransition) -> TransitionOutcome:
+        """Record `t.notify_key` and apply `t` atomically; a key seen before is a no-op."""
+
+
+class IAsyncPaymentRepository(ABC):
+    """Same contract as IPaymentRepository, for callers running on the event loop."""
+
+    @abstractmethod
+    async def add(self, payment: Payment) -> None: ...
+
+    @abstractmethod
+    async def get_by_id(self, payment_id: str) -> Optional[Payment]: ...
+
+    @abstractmethod
+    async def update(self, payment: Payment) -> None: ...
+
+    @abstractmethod
+    async def apply_transition(self, t: PaymentTransition) -> TransitionOutcome: ...
+
+    @abstractmethod
+    async def list_pending_before(
+        self, cutoff: datetime, after_id: Optional[str], limit: int
+    ) -> List[Payment]:
+        """PENDING payments created before `cutoff`, ordered by id, starting after `after_id` (keyset paging)."""
+
+    @abstractmethod
+    async def list_page(self, query: PaymentListQuery) -> PaymentPage:
+        """Newest first, keyset-paginated on (created_at, id)."""
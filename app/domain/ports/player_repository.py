@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Optional, Sequence
 
 from domain.entities.player import Player
 
@@ -13,3 +13,8 @@ class IPlayerRepository(ABC):
 
     @abstractmethod
     def create(self, name: str) -> Player: ...
+
+    @abstractmethod
+    def upsert_many(self, names: Sequence[str]) -> Dict[str, int]:
+        """Resolve a roster to player ids, creating missing players; name -> id, in the caller's transaction."""
+
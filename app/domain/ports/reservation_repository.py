@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Optional
 
 from domain.entities.reservation import Reservation
+from domain.value_objects.reservation_page import ReservationListQuery, ReservationPage
 
 @abstractmethod
 class IReservationRepository(ABC):
@@ -27,3 +28,8 @@ class IReservationRepository(ABC):
         """Return a list of all reservations."""
         raise NotImplementedError
 
+    @abstractmethod
+    def list_page(self, query: ReservationListQuery) -> ReservationPage:
+        """One page in (starts_at, id) order, with players and payments loaded."""
+        raise NotImplementedError
+
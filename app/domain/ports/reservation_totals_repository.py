@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from application.dtos.reservation import ReservationTotals
+from domain.enums.reservation import ReservationStatus
+
+
+class IReservationTotalsRepository(ABC):
+    """Per-reservation payment aggregates; kept current by the payment repositories."""
+
+    @abstractmethod
+    async def next_reservation_ids(self, after: int, limit: int) -> List[int]:
+        """Reservation ids greater than `after`, ascending; drives batched rebuilds."""
+
+    @abstractmethod
+    async def refresh(self, reservation_ids: List[int]) -> None:
+        """Recompute the aggregates of `reservation_ids` from payments, in the caller's transaction."""
+
+    @abstractmethod
+    async def list_between(
+        self, starts_from: datetime, starts_before: datetime, status: Optional[ReservationStatus] = None
+    ) -> List[ReservationTotals]: ...
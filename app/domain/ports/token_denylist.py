@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+
+class ITokenDenylist(ABC):
+    """In-process view of revoked access tokens; lookups must not do I/O."""
+
+    @abstractmethod
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, jti: str, expires_at: datetime) -> None:
+        raise NotImplementedError
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 class TokenService(ABC):
     @abstractmethod
@@ -7,4 +7,13 @@ class TokenService(ABC):
         raise NotImplementedError
 
     def decode_access_token(self, token: str) -> Dict[str, Any]:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_refresh_token(self) -> Tuple[str, str]:
+        """Return (opaque token for the client, hash to store)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def hash_refresh_token(self, token: str) -> str:
+        raise NotImplementedError
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+
+class IUnitOfWork(ABC):
+    """
+    The transaction boundary of one use case. Repositories built for the same request share its
+    session and never commit themselves; the use case calls `commit()` once. Leaving the
+    `with` block without committing (or with an exception) rolls back.
+    """
+
+    @abstractmethod
+    def __enter__(self) -> "IUnitOfWork": ...
+
+    @abstractmethod
+    def __exit__(self, exc_type, exc, tb) -> None: ...
+
+    @abstractmethod
+    def commit(self) -> None: ...
+
+    @abstractmethod
+    def rollback(self) -> None: ...
+
+
+class IAsyncUnitOfWork(ABC):
+    """Same contract as IUnitOfWork, for use cases running on the event loop."""
+
+    @abstractmethod
+    async def __aenter__(self) -> "IAsyncUnitOfWork": ...
+
+    @abstractmethod
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
+
+    @abstractmethod
+    async def commit(self) -> None: ...
+
+    @abstractmethod
+    async def rollback(self) -> None: ...
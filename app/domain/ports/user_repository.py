@@ -21,4 +21,19 @@ class IAdminUserRepository(ABC):
     def get_by_id(self, id: int) -> Optional[AdminUser]:
         """Return the admin user by ID, or None if not found."""
         raise NotImplementedError
-    
\ No newline at end of file
+
+
+class IAsyncAdminUserRepository(ABC):
+    """Same contract as IAdminUserRepository, for callers running on the event loop."""
+
+    @abstractmethod
+    async def get_admin(self, username: str) -> Optional[AdminUser]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_admin(self, admin: AdminUser) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_id(self, id: int) -> Optional[AdminUser]:
+        raise NotImplementedError
@@ -2,5 +2,5 @@ from dataclasses import dataclass
 
 @dataclass
 class ReservationInfo:
-    id: str
+    id: int
     players: list[str]
\ No newline at end of file
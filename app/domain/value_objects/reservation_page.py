@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from domain.entities.reservation import Reservation
+
+
+@dataclass(frozen=True)
+class ReservationCursor:
+    # position of the last row of a page in (starts_at, id) order
+    starts_at: datetime
+    id: int
+
+
+@dataclass(frozen=True)
+class ReservationListQuery:
+    starts_from: Optional[datetime] = None        # inclusive
+    starts_before: Optional[datetime] = None      # exclusive
+    statuses: Optional[List[str]] = None          # ReservationStatus values; None = any
+    after: Optional[ReservationCursor] = None
+    limit: int = 50
+
+
+@dataclass(frozen=True)
+class ReservationPage:
+    items: List[Reservation]
+    next_cursor: Optional[ReservationCursor] = None
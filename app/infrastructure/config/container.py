@@ -0,0 +1,117 @@
+# infrastructure/config/container.py
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+
+from infrastructure.config.settings import Settings, get_settings
+from infrastructure.external.newebpay.client import NewebpayClient
+from infrastructure.external.newebpay.order_number import SnowflakeOrderNumberGenerator, default_node_id
+from infrastructure.external.security.jwt_token import JwtTokenService
+from infrastructure.external.security.password_hasher import AsyncBcryptPasswordHasher
+from infrastructure.external.security.token_cache import VerifiedTokenCache
+
+
+@dataclass(frozen=True)
+class Container:
+    """
+    Process-wide objects that are built once and shared by every request.
+    Everything in here is read-only, so it is safe to use from any thread;
+    each uvicorn worker process builds its own copy at startup.
+    """
+    settings: Settings
+    payment_gateway: NewebpayClient
+    password_hasher: AsyncBcryptPasswordHasher
+    token_service: JwtTokenService
+    order_numbers: SnowflakeOrderNumberGenerator
+
+
+_lock = threading.Lock()
+_container: Optional[Container] = None
+# containers replaced by reload_container(); their HTTP pools are closed at shutdown
+_retired: List[Container] = []
+
+
+def _build_token_cache(settings: Settings) -> Optional[VerifiedTokenCache]:
+    if settings.jwt.JWT_VERIFY_CACHE_SIZE <= 0:
+        return None
+    return VerifiedTokenCache(
+        maxsize=settings.jwt.JWT_VERIFY_CACHE_SIZE,
+        max_ttl_seconds=settings.jwt.JWT_VERIFY_CACHE_TTL_SECONDS,
+    )
+
+
+def _order_node_id(settings: Settings) -> int:
+    node_id = settings.order_numbers.ORDER_NO_NODE_ID
+    if node_id is not None:
+        return node_id
+    if settings.order_numbers.ORDER_NO_NODE_ID_FROM_HOSTNAME:
+        return default_node_id()
+    # two hosts/pods with the same node id (and, in containers, the same pid 1) issue identical ids
+    raise ValueError(
+        "ORDER_NO_NODE_ID is not set; give every host/pod a distinct value "
+        "(or ORDER_NO_NODE_ID_FROM_HOSTNAME=true for local development)"
+    )
+
+
+def _build_container(order_numbers: Optional[SnowflakeOrderNumberGenerator] = None) -> Container:
+    settings = get_settings()
+    return Container(
+        settings=settings,
+        payment_gateway=NewebpayClient(settings=settings),
+        password_hasher=AsyncBcryptPasswordHasher(
+            max_workers=settings.password_hashing.PASSWORD_HASH_WORKERS,
+            max_pending=settings.password_hashing.PASSWORD_HASH_MAX_PENDING,
+        ),
+        token_service=JwtTokenService(
+            secret_key=settings.jwt.JWT_SECRET_KEY,
+            algorithm=settings.jwt.JWT_ALGORITHM,
+            cache=_build_token_cache(settings),
+        ),
+        order_numbers=order_numbers or SnowflakeOrderNumberGenerator(
+            node_id=_order_node_id(settings),
+            prefix=settings.order_numbers.ORDER_NO_PREFIX,
+        ),
+    )
+
+
+def get_container() -> Container:
+    global _container
+    container = _container
+    if container is None:
+        with _lock:
+            if _container is None:
+                _container = _build_container()
+            container = _container
+    return container
+
+
+def reload_container() -> Container:
+    """
+    Re-read settings (e.g. after rotating HASH_KEY/HASH_IV or the JWT secret) and
+    atomically swap in a new container. Requests already holding the old one finish with it.
+    The order number generator is carried over: node and prefix are fixed for the process.
+    Triggered by SIGHUP, see main.py for the settings that still need a restart.
+    """
+    global _container
+    with _lock:
+        get_settings.cache_clear()
+        order_numbers = None
+        if _container is not None:
+            _retired.append(_container)
+            order_numbers = _container.order_numbers
+        _container = _build_container(order_numbers)
+        return _container
+
+
+async def aclose_container() -> None:
+    """Release network resources and executors held by the current and any retired containers."""
+    global _container
+    with _lock:
+        containers = _retired + ([_container] if _container is not None else [])
+        _retired.clear()
+        _container = None
+    for container in containers:
+        await container.payment_gateway.aclose()
+        container.password_hasher.close()
@@ -1,4 +1,8 @@
 # infrastructure/config/settings.py
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,11 +11,18 @@ class BasicSettings(BaseSettings):
         env_file=".env.dev",
         env_file_encoding="utf-8",
         extra="ignore",
+        frozen=True,
     )
 
 class JwtSettings(BasicSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
+    JWT_VERIFY_CACHE_SIZE: int = 1024              # verified tokens kept per worker; 0 disables the cache
+    JWT_VERIFY_CACHE_TTL_SECONDS: float = 300.0    # upper bound on reuse, below the token's own exp
+    JWT_IDENTITY_FROM_CLAIMS: bool = False         # answer /me from the token claims without a DB lookup
+    JWT_ACCESS_TOKEN_TTL_MINUTES: int = 30
+    JWT_REFRESH_TOKEN_TTL_DAYS: int = 14
+    JWT_DENYLIST_SYNC_SECONDS: float = 30.0        # how often each worker pulls revoked jtis; 0 disables
 
 class NewebpayEndpoints(BasicSettings):
     MPG: str 
@@ -25,11 +36,88 @@ class NewebpaySecrets(BasicSettings):
     HASH_KEY: str
     HASH_IV: str
 
+class NewebpayHttpSettings(BasicSettings):
+    # one pooled httpx.AsyncClient per gateway; seconds unless noted
+    NEWEBPAY_HTTP_TIMEOUT: float = 10.0
+    NEWEBPAY_HTTP_CONNECT_TIMEOUT: float = 5.0
+    NEWEBPAY_HTTP_MAX_CONNECTIONS: int = 20
+    NEWEBPAY_HTTP_MAX_KEEPALIVE: int = 10
+    NEWEBPAY_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    NEWEBPAY_HTTP2: bool = True
+    # retries apply to idempotent calls (QueryTradeInfo) only
+    NEWEBPAY_QUERY_RETRIES: int = 3
+    NEWEBPAY_QUERY_BACKOFF: float = 0.2
+
+class ReconciliationSettings(BasicSettings):
+    RECONCILE_INTERVAL_SECONDS: int = 0      # background loop period; 0 disables it
+    RECONCILE_MIN_AGE_MINUTES: int = 15      # only PENDING payments older than this
+    RECONCILE_BATCH_SIZE: int = 200
+    RECONCILE_CONCURRENCY: int = 8
+    RECONCILE_RATE_PER_SECOND: float = 5.0   # QueryTradeInfo calls per second, per worker
+
+class ExpirySettings(BasicSettings):
+    EXPIRY_INTERVAL_SECONDS: int = 300        # background sweep period; 0 disables it
+    EXPIRY_PENDING_PAYMENT_MINUTES: int = 1440  # PENDING payments older than this become CANCELED
+    EXPIRY_BATCH_SIZE: int = 500
+    EXPIRY_MAX_BATCHES: int = 100             # per kind and run; the next run picks up the rest
+
+class NotifyInboxSettings(BasicSettings):
+    NOTIFY_INGEST_MODE: str = "inline"        # "inline": process in the request; "inbox": store, answer OK, drain async
+    NOTIFY_INBOX_WORKERS: int = 2             # drain tasks per app worker process
+    NOTIFY_INBOX_BATCH_SIZE: int = 20
+    NOTIFY_INBOX_POLL_SECONDS: float = 0.5
+    NOTIFY_INBOX_LEASE_SECONDS: int = 60
+    NOTIFY_INBOX_MAX_ATTEMPTS: int = 10
+    NOTIFY_INBOX_MAX_DEPTH: int = 10000       # above this the route answers 503 so Newebpay retries later
+
+class OrderNumberSettings(BasicSettings):
+    ORDER_NO_NODE_ID: Optional[int] = None    # 0..1295, distinct per host / pod; required unless the next is set
+    ORDER_NO_NODE_ID_FROM_HOSTNAME: bool = False  # development only: hash the hostname, collisions possible
+    ORDER_NO_PREFIX: str = "RES"
+
+class PasswordHashingSettings(BasicSettings):
+    PASSWORD_HASH_WORKERS: int = 2            # bcrypt threads per app worker process
+    PASSWORD_HASH_MAX_PENDING: int = 8        # queued + running checks; beyond this /login answers 429
+
+class DatabasePoolSettings(BasicSettings):
+    # Per engine, per worker: (DB_POOL_SIZE + DB_MAX_OVERFLOW) * 2 engines * workers must fit max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0       # seconds to wait for a free connection before raising
+    DB_POOL_RECYCLE: int = 1800         # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+
+class SqlProfilingSettings(BasicSettings):
+    SQL_SLOW_QUERY_MS: float = 250.0      # statements slower than this are logged; 0 disables
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10    # same statement shape more often than this in one request; 0 disables
+    SQL_DEBUG_HEADERS: bool = False       # X-DB-* response headers; debug only, leaks query counts
+
+class LoggingSettings(BasicSettings):
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"                # "json": one object per line; "text": human-readable
+    LOG_QUEUE_SIZE: int = 10000             # records waiting for the writer thread; beyond this they are dropped
+    LOG_ERROR_BURST: int = 5                # identical errors logged per window before sampling; 0 disables sampling
+    LOG_ERROR_WINDOW_SECONDS: float = 60.0
+    LOG_ERROR_SAMPLE_EVERY: int = 100       # after the burst, 1 in N identical errors is logged
+
 class Settings(BasicSettings):
     DATABASE_URL: str
-    jwt: JwtSettings = JwtSettings()
-    newebpay_endpoints: NewebpayEndpoints = NewebpayEndpoints()
-    newebpay_secrets: NewebpaySecrets = NewebpaySecrets()
+    db_pool: DatabasePoolSettings = Field(default_factory=DatabasePoolSettings)
+    sql_profiling: SqlProfilingSettings = Field(default_factory=SqlProfilingSettings)
+    logging: LoggingSettings = Field(default_factory=LoggingSettings)
+    reconciliation: ReconciliationSettings = Field(default_factory=ReconciliationSettings)
+    expiry: ExpirySettings = Field(default_factory=ExpirySettings)
+    notify_inbox: NotifyInboxSettings = Field(default_factory=NotifyInboxSettings)
+    password_hashing: PasswordHashingSettings = Field(default_factory=PasswordHashingSettings)
+    order_numbers: OrderNumberSettings = Field(default_factory=OrderNumberSettings)
+    # default_factory so that a reload re-reads the nested models as well
+    jwt: JwtSettings = Field(default_factory=JwtSettings)
+    newebpay_endpoints: NewebpayEndpoints = Field(default_factory=NewebpayEndpoints)
+    newebpay_secrets: NewebpaySecrets = Field(default_factory=NewebpaySecrets)
+    newebpay_http: NewebpayHttpSettings = Field(default_factory=NewebpayHttpSettings)
+
 
-def get_settings() -> BasicSettings:
-    return Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    # Parsed once per process; use infrastructure.config.container.reload_container() to re-read.
+    return Settings()
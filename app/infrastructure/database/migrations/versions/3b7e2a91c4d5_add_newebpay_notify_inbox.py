@@ -0,0 +1,44 @@
+"""add newebpay notify inbox
+
+Revision ID: 3b7e2a91c4d5
+Revises: c7a2e9f4b1d8
+Create Date: 2026-10-18 14:30:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e2a91c4d5'
+down_revision: Union[str, Sequence[str], None] = 'c7a2e9f4b1d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('newebpay_notify_inbox',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('status', sa.String(length=32), nullable=False),
+    sa.Column('merchant_id', sa.String(length=32), nullable=False),
+    sa.Column('version', sa.String(length=10), nullable=False),
+    sa.Column('trade_info', sa.Text(), nullable=False),
+    sa.Column('trade_sha', sa.String(length=64), nullable=False),
+    sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('trade_sha')
+    )
+    op.create_index('ix_notify_inbox_pending', 'newebpay_notify_inbox', ['id'], unique=False, postgresql_where=sa.text('processed_at IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notify_inbox_pending', table_name='newebpay_notify_inbox', postgresql_where=sa.text('processed_at IS NULL'))
+    op.drop_table('newebpay_notify_inbox')
@@ -0,0 +1,36 @@
+"""add processed notifies ledger
+
+Revision ID: 8c41d0f7e2ab
+Revises: 3b7e2a91c4d5
+Create Date: 2026-10-18 15:05:47.102394
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41d0f7e2ab'
+down_revision: Union[str, Sequence[str], None] = '3b7e2a91c4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('processed_notifies',
+    sa.Column('trade_sha', sa.String(length=64), nullable=False),
+    sa.Column('merchant_order_no', sa.String(length=30), nullable=False),
+    sa.Column('status', sa.String(length=32), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('trade_sha')
+    )
+    op.create_index(op.f('ix_processed_notifies_merchant_order_no'), 'processed_notifies', ['merchant_order_no'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_processed_notifies_merchant_order_no'), table_name='processed_notifies')
+    op.drop_table('processed_notifies')
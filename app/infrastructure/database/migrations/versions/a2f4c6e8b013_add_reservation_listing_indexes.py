@@ -0,0 +1,30 @@
+"""add reservation listing indexes
+
+Revision ID: a2f4c6e8b013
+Revises: b6f2d9a4e8c1
+Create Date: 2026-10-18 17:02:41.906114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2f4c6e8b013'
+down_revision: Union[str, Sequence[str], None] = 'b6f2d9a4e8c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_reservations_starts_at_id', 'reservations', ['starts_at', 'id'], unique=False)
+    op.create_index('ix_reservation_participants_reservation_id', 'reservation_participants', ['reservation_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservation_participants_reservation_id', table_name='reservation_participants')
+    op.drop_index('ix_reservations_starts_at_id', table_name='reservations')
@@ -0,0 +1,37 @@
+"""add payment listing indexes
+
+Revision ID: a7c1e5d3f9b2
+Revises: a2f4c6e8b013
+Create Date: 2026-10-18 17:40:19.275530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c1e5d3f9b2'
+down_revision: Union[str, Sequence[str], None] = 'a2f4c6e8b013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY so a large payments table stays writable while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index('ix_payments_created_at_id', 'payments', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_payments_status_created_at_id', 'payments', ['status', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_payments_reservation_id_created_at_id', 'payments', ['reservation_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_payments_payer_email_created_at_id', 'payments', [sa.text('lower(payer_email)'), 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payments_payer_email_created_at_id', table_name='payments', postgresql_concurrently=True)
+        op.drop_index('ix_payments_reservation_id_created_at_id', table_name='payments', postgresql_concurrently=True)
+        op.drop_index('ix_payments_status_created_at_id', table_name='payments', postgresql_concurrently=True)
+        op.drop_index('ix_payments_created_at_id', table_name='payments', postgresql_concurrently=True)
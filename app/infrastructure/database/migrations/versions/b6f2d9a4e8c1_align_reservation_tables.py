@@ -0,0 +1,101 @@
+"""align reservation and player tables with the models
+
+Revision ID: b6f2d9a4e8c1
+Revises: 5e9d3c7a1f20
+Create Date: 2026-10-18 16:58:27.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f2d9a4e8c1'
+down_revision: Union[str, Sequence[str], None] = '5e9d3c7a1f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# shared with reservation_payment_totals.status
+reservation_status = postgresql.ENUM(
+    'EDITING', 'EXPIRED', 'UNPAID', 'PAID_PARTIAL', 'PAID_ALL', name='reservationstatus', create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # f9601fb1666c created players.display_name, VARCHAR participant / player ids and no
+    # reservations.status / total_amount_twd; ReservationRepository maps the models, which
+    # differ on all of them. Player ids are cast, so they must be numeric (the app only ever
+    # wrote integers); the cast fails loudly otherwise.
+
+    # the amount payments are measured against: fee per person for every participant
+    op.add_column('reservations', sa.Column('total_amount_twd', sa.Integer(), nullable=True))
+    op.execute("""
+        UPDATE reservations r SET total_amount_twd = r.fee_per_person * (
+            SELECT count(*) FROM reservation_participants rp WHERE rp.reservation_id = r.id
+        )
+    """)
+    op.alter_column('reservations', 'total_amount_twd', nullable=False)
+
+    # reservations.status: a constant default fills existing rows without rewriting the table,
+    # then PAID payments against total_amount_twd decide PAID_PARTIAL / PAID_ALL
+    reservation_status.create(op.get_bind(), checkfirst=True)
+    op.add_column('reservations', sa.Column('status', reservation_status, server_default='UNPAID', nullable=False))
+    op.execute("""
+        UPDATE reservations r SET status = CASE
+            WHEN paid.amount >= r.total_amount_twd THEN 'PAID_ALL'::reservationstatus
+            ELSE 'PAID_PARTIAL'::reservationstatus
+        END
+        FROM (
+            SELECT reservation_id, sum(amount_twd) AS amount FROM payments
+            WHERE status = 'PAID' GROUP BY reservation_id
+        ) paid
+        WHERE paid.reservation_id = r.id AND paid.amount > 0
+    """)
+    # the model sets the default on insert
+    op.alter_column('reservations', 'status', server_default=None)
+
+    # participants are added without an id; nothing references the column, so rows are renumbered
+    op.add_column('reservation_participants', sa.Column('new_id', sa.Integer(), sa.Identity(always=False), nullable=False))
+    op.drop_constraint('reservation_participants_pkey', 'reservation_participants', type_='primary')
+    op.drop_column('reservation_participants', 'id')
+    op.alter_column('reservation_participants', 'new_id', new_column_name='id')
+    op.create_primary_key('reservation_participants_pkey', 'reservation_participants', ['id'])
+
+    # players: the model calls the column `name`, and ids come from the database
+    op.alter_column('players', 'display_name', new_column_name='name')
+    op.drop_constraint('reservation_participants_player_id_fkey', 'reservation_participants', type_='foreignkey')
+    op.alter_column('players', 'id', type_=sa.Integer(), postgresql_using='id::integer')
+    op.alter_column('reservation_participants', 'player_id', type_=sa.Integer(), postgresql_using='player_id::integer')
+    op.create_foreign_key(
+        'reservation_participants_player_id_fkey', 'reservation_participants', 'players',
+        ['player_id'], ['id'], ondelete='RESTRICT',
+    )
+    op.execute("ALTER TABLE players ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('players', 'id'), coalesce(max(id), 0) + 1, false)
+        FROM players
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE players ALTER COLUMN id DROP IDENTITY")
+    op.drop_constraint('reservation_participants_player_id_fkey', 'reservation_participants', type_='foreignkey')
+    op.alter_column('players', 'id', type_=sa.String(), postgresql_using='id::varchar')
+    op.alter_column('reservation_participants', 'player_id', type_=sa.String(), postgresql_using='player_id::varchar')
+    op.create_foreign_key(
+        'reservation_participants_player_id_fkey', 'reservation_participants', 'players',
+        ['player_id'], ['id'], ondelete='RESTRICT',
+    )
+    op.alter_column('players', 'name', new_column_name='display_name')
+
+    op.execute("ALTER TABLE reservation_participants ALTER COLUMN id DROP IDENTITY")
+    op.alter_column('reservation_participants', 'id', type_=sa.String(), postgresql_using='id::varchar')
+
+    op.drop_column('reservations', 'status')
+    reservation_status.drop(op.get_bind(), checkfirst=True)
+    op.drop_column('reservations', 'total_amount_twd')
@@ -0,0 +1,47 @@
+"""add reservation payment totals
+
+Revision ID: c3d8e1f5a7b9
+Revises: a7c1e5d3f9b2
+Create Date: 2026-10-18 18:21:55.630418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8e1f5a7b9'
+down_revision: Union[str, Sequence[str], None] = 'a7c1e5d3f9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# shared with reservations.status
+reservation_status = postgresql.ENUM(
+    'EDITING', 'EXPIRED', 'UNPAID', 'PAID_PARTIAL', 'PAID_ALL', name='reservationstatus', create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    reservation_status.create(op.get_bind(), checkfirst=True)
+    op.create_table('reservation_payment_totals',
+    sa.Column('reservation_id', sa.Integer(), nullable=False),
+    sa.Column('paid_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('paid_amount_twd', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('outstanding_amount_twd', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('status', reservation_status, nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['reservation_id'], ['reservations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('reservation_id')
+    )
+    op.create_index(op.f('ix_reservation_payment_totals_status'), 'reservation_payment_totals', ['status'], unique=False)
+    # fill it with: python cli.py rebuild-totals
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reservation_payment_totals_status'), table_name='reservation_payment_totals')
+    op.drop_table('reservation_payment_totals')
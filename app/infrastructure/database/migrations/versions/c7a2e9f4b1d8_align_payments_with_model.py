@@ -0,0 +1,77 @@
+"""align payments with the model: enum columns, integer reservation ids
+
+Revision ID: c7a2e9f4b1d8
+Revises: f9601fb1666c
+Create Date: 2026-10-18 12:41:09.274415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a2e9f4b1d8'
+down_revision: Union[str, Sequence[str], None] = 'f9601fb1666c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+payment_status = postgresql.ENUM(
+    'CREATED', 'PENDING', 'PAID', 'FAILED', 'CANCELED', 'REFUND_PENDING', 'REFUNDED',
+    name='paymentstatus', create_type=False,
+)
+payment_provider = postgresql.ENUM('NEWEBPAY', name='paymentprovider', create_type=False)
+
+# tables whose reservation_id references reservations.id
+_REFERENCING = ('payments', 'reservation_participants')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the model binds these as enums; asyncpg sends `$1::paymentstatus`, which a VARCHAR column
+    # cannot be compared with. Rows already hold the member names, so the cast is exact.
+    bind = op.get_bind()
+    payment_status.create(bind, checkfirst=True)
+    payment_provider.create(bind, checkfirst=True)
+    op.alter_column('payments', 'status', type_=payment_status, postgresql_using='status::paymentstatus')
+    op.alter_column(
+        'payments', 'payment_provider', type_=payment_provider, postgresql_using='payment_provider::paymentprovider',
+    )
+
+    # payments.reservation_id is an integer in the model, so reservations.id (VARCHAR in
+    # f9601fb1666c) and everything referencing it become integers numbered by the database.
+    # The app has only ever written integer ids; the cast fails loudly if a row says otherwise.
+    for table in _REFERENCING:
+        op.drop_constraint(f'{table}_reservation_id_fkey', table, type_='foreignkey')
+    op.alter_column('reservations', 'id', type_=sa.Integer(), postgresql_using='id::integer')
+    for table in _REFERENCING:
+        op.alter_column(table, 'reservation_id', type_=sa.Integer(), postgresql_using='reservation_id::integer')
+        op.create_foreign_key(
+            f'{table}_reservation_id_fkey', table, 'reservations', ['reservation_id'], ['id'], ondelete='CASCADE',
+        )
+    op.execute("ALTER TABLE reservations ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('reservations', 'id'), coalesce(max(id), 0) + 1, false)
+        FROM reservations
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE reservations ALTER COLUMN id DROP IDENTITY")
+    for table in _REFERENCING:
+        op.drop_constraint(f'{table}_reservation_id_fkey', table, type_='foreignkey')
+    op.alter_column('reservations', 'id', type_=sa.String(), postgresql_using='id::varchar')
+    for table in _REFERENCING:
+        op.alter_column(table, 'reservation_id', type_=sa.String(), postgresql_using='reservation_id::varchar')
+        op.create_foreign_key(
+            f'{table}_reservation_id_fkey', table, 'reservations', ['reservation_id'], ['id'], ondelete='CASCADE',
+        )
+
+    op.alter_column('payments', 'payment_provider', type_=sa.String(32), postgresql_using='payment_provider::varchar')
+    op.alter_column('payments', 'status', type_=sa.String(32), postgresql_using='status::varchar')
+    bind = op.get_bind()
+    payment_provider.drop(bind, checkfirst=True)
+    payment_status.drop(bind, checkfirst=True)
@@ -0,0 +1,40 @@
+"""unique player name
+
+Revision ID: d4e7f2a9c1b6
+Revises: c3d8e1f5a7b9
+Create Date: 2026-10-18 19:03:27.114952
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e7f2a9c1b6'
+down_revision: Union[str, Sequence[str], None] = 'c3d8e1f5a7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # fold duplicate names onto the oldest player so the unique index can be built
+    op.execute("""
+        WITH keep AS (
+            SELECT id, min(id) OVER (PARTITION BY name) AS keep_id FROM players
+        )
+        UPDATE reservation_participants rp SET player_id = keep.keep_id
+        FROM keep WHERE rp.player_id = keep.id AND keep.id <> keep.keep_id
+    """)
+    op.execute("""
+        DELETE FROM players p USING players older
+        WHERE p.name = older.name AND p.id > older.id
+    """)
+    op.create_index(op.f('ix_players_name'), 'players', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_players_name'), table_name='players')
@@ -0,0 +1,33 @@
+"""add partial index for the reservation expiry sweep
+
+Revision ID: e5f8a3b2c7d1
+Revises: d4e7f2a9c1b6
+Create Date: 2026-10-18 21:05:42.610395
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f8a3b2c7d1'
+down_revision: Union[str, Sequence[str], None] = 'd4e7f2a9c1b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reservations_unpaid_starts_at', 'reservations', ['starts_at'], unique=False,
+            postgresql_where=sa.text("status = 'UNPAID'"), postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_reservations_unpaid_starts_at', table_name='reservations', postgresql_concurrently=True)
@@ -3,6 +3,10 @@ from .user import UserModel
 from .reservation import Reservation, ReservationParticipant
 from .player import Player
 from .payment import PaymentModel
+from .notify_inbox import NotifyInboxModel
+from .processed_notify import ProcessedNotifyModel
+from .auth_token import RefreshTokenModel, RevokedTokenModel
+from .reservation_totals import ReservationPaymentTotals
 # later:
 # from .session import SessionORM
 # from .reservation import ReservationORM
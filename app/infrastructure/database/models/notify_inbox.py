@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class NotifyInboxModel(Base):
+    """Append-only inbox of raw Newebpay NotifyURL posts, drained by background workers."""
+    __tablename__ = "newebpay_notify_inbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    # raw form fields, exactly as posted
+    status: Mapped[str] = mapped_column(String(32))
+    merchant_id: Mapped[str] = mapped_column(String(32))
+    version: Mapped[str] = mapped_column(String(10))
+    trade_info: Mapped[str] = mapped_column(Text)
+    trade_sha: Mapped[str] = mapped_column(String(64), unique=True)   # dedups gateway retries
+
+    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_notify_inbox_pending", "id", postgresql_where=text("processed_at IS NULL")),
+    )
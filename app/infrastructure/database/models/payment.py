@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, Enum, Index, ForeignKey
+from sqlalchemy import String, Integer, DateTime, Enum, Index, ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import ARRAY
 
@@ -16,7 +16,8 @@ class PaymentModel(Base):
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
 
     reservation_id: Mapped[int] = mapped_column(ForeignKey("reservations.id", ondelete="CASCADE"), index=True)
-    players: Mapped[list["Player"]] = relationship(back_populates="player_id", cascade="all, delete-orphan")
+    reservation: Mapped["Reservation"] = relationship(back_populates="payments")
+    players: Mapped[list["ReservationParticipant"]] = relationship(back_populates="payment")
 
     payer_name: Mapped[str] = mapped_column(String(100))
     payer_email: Mapped[str] = mapped_column(String(100))
@@ -37,6 +38,11 @@ class PaymentModel(Base):
 
     __table_args__ = (
         Index("ix_payments_reservation_status", "reservation_id", "status"),
+        # admin listing: newest first, keyset on (created_at, id), one index per filter shape
+        Index("ix_payments_created_at_id", "created_at", "id"),
+        Index("ix_payments_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_payments_reservation_id_created_at_id", "reservation_id", "created_at", "id"),
+        Index("ix_payments_payer_email_created_at_id", func.lower(payer_email), "created_at", "id"),
     )
 
     
\ No newline at end of file
@@ -10,5 +10,5 @@ class Player(Base):
     __tablename__ = "players"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    name: Mapped[str] = mapped_column(String(100))
+    name: Mapped[str] = mapped_column(String(100), unique=True, index=True)   # roster names resolve by exact match
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ProcessedNotifyModel(Base):
+    """Ledger of notify callbacks already applied; the primary key makes duplicate callbacks a one-row no-op."""
+    __tablename__ = "processed_notifies"
+
+    trade_sha: Mapped[str] = mapped_column(String(64), primary_key=True)
+    merchant_order_no: Mapped[str] = mapped_column(String(30), index=True)
+    status: Mapped[str] = mapped_column(String(32))
+    processed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,7 +1,7 @@
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, Integer, ForeignKey, Boolean, func, Enum
+from sqlalchemy import String, DateTime, Integer, ForeignKey, Boolean, func, Enum, Index, text
 from domain.enums.reservation import ReservationStatus
 
 from .base import Base
@@ -32,8 +32,15 @@ class Reservation(Base):
         onupdate=func.now()
     )
 
-    players: Mapped[List["ReservationParticipant"]] = relationship(back_populates={"reservation_id"}, cascade="all, delete-orphan")
-    payments: Mapped[List["PaymentModel"]] = relationship(back_populates={"reservation_id"}, cascade="all, delete-orphan")
+    players: Mapped[List["ReservationParticipant"]] = relationship(back_populates="reservation", cascade="all, delete-orphan")
+    payments: Mapped[List["PaymentModel"]] = relationship(back_populates="reservation", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # keyset pagination / date-range listing order
+        Index("ix_reservations_starts_at_id", "starts_at", "id"),
+        # expiry sweep: only still-UNPAID rows, so expired history does not slow it down
+        Index("ix_reservations_unpaid_starts_at", "starts_at", postgresql_where=text("status = 'UNPAID'")),
+    )
 
 
 class ReservationParticipant(Base):
@@ -57,8 +64,11 @@ class ReservationParticipant(Base):
         nullable=True,
     )
 
+    reservation: Mapped["Reservation"] = relationship(back_populates="players")
+    payment: Mapped[Optional["PaymentModel"]] = relationship(back_populates="players")
+    player: Mapped["Player"] = relationship()
 
-
-
-
-
+    __table_args__ = (
+        # selectinload(Reservation.players) filters on reservation_id IN (...)
+        Index("ix_reservation_participants_reservation_id", "reservation_id"),
+    )
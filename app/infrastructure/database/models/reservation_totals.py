@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from domain.enums.reservation import ReservationStatus
+from .base import Base
+
+
+class ReservationPaymentTotals(Base):
+    """
+    Per-reservation payment aggregate, recomputed for the touched reservation in the same
+    transaction as every payment status change; `cli.py rebuild-totals` recomputes all rows.
+    """
+    __tablename__ = "reservation_payment_totals"
+
+    reservation_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("reservations.id", ondelete="CASCADE"), primary_key=True,
+    )
+    paid_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    paid_amount_twd: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    outstanding_amount_twd: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    status: Mapped[ReservationStatus] = mapped_column(Enum(ReservationStatus), default=ReservationStatus.UNPAID, index=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
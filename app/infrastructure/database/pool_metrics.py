@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections opened beyond pool_size (negative while the pool is not yet full)",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, including connecting overflow connections",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ["engine"],
+)
+POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations_total",
+    "Connections invalidated (failed pre-ping, disconnect errors, soft invalidation)",
+    ["engine", "kind"],
+)
+
+
+class _TimedCheckoutMixin:
+    # class attribute instead of __init__ arg: Pool.recreate() rebuilds the pool from its own args
+    engine_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(self.engine_label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.engine_label).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+def instrument_pool(engine: Engine, label: str) -> None:
+    """Keep the pool gauges/counters of `engine` current. For an AsyncEngine pass `.sync_engine`."""
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        POOL_CHECKED_OUT.labels(label).inc()
+        POOL_OVERFLOW.labels(label).set(engine.pool.overflow())
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        POOL_CHECKED_OUT.labels(label).dec()
+        POOL_OVERFLOW.labels(label).set(engine.pool.overflow())
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exception):
+        POOL_INVALIDATIONS.labels(label, "hard").inc()
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_conn, record, exception):
+        POOL_INVALIDATIONS.labels(label, "soft").inc()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter as ShapeCounter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from infrastructure.config.settings import SqlProfilingSettings
+
+logger = logging.getLogger(__name__)
+
+SQL_SLOW_QUERIES = Counter(
+    "sql_slow_queries_total",
+    "Statements slower than SQL_SLOW_QUERY_MS",
+)
+SQL_REPEATED_STATEMENTS = Counter(
+    "sql_repeated_statements_total",
+    "Statement shapes repeated more than SQL_N_PLUS_ONE_THRESHOLD times in one request",
+)
+
+MAX_LOGGED_STATEMENT = 2000
+_STARTED_KEY = "_query_profiler_started"
+
+# expanding IN lists render one placeholder per element; collapse them so that
+# "IN (%(id_1_1)s, %(id_1_2)s)" and "IN ($1, $2, $3)" count as the same shape
+_PLACEHOLDER = r"(?:%\(\w+\)s|%s|\$\d+(?:::\w+(?:\[\])?)?|\?|:\w+)"
+_IN_LIST = re.compile(rf"\bIN \(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryProfile:
+    statements: int = 0
+    db_seconds: float = 0.0
+    shapes: ShapeCounter = field(default_factory=ShapeCounter)
+    repeated: List[str] = field(default_factory=list)   # shapes that crossed the N+1 threshold
+
+
+# one profile per request, set by the presentation middleware; like the unit-of-work stats
+# it reaches the listeners through the threadpool hand-off and SQLAlchemy's greenlets
+_active_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+def start_profile() -> Token:
+    return _active_profile.set(QueryProfile())
+
+
+def finish_profile(token: Token) -> None:
+    _active_profile.reset(token)
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _active_profile.get()
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _mask(value: Any) -> str:
+    return "NULL" if value is None else f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Keep parameter names/positions and types, never values (passwords, tokens, card data)."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        if not parameters:
+            return []
+        return {"rows": len(parameters), "first": redact_parameters(parameters[0])}
+    if isinstance(parameters, dict):
+        return {key: _mask(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_mask(value) for value in parameters]
+    return _mask(parameters)
+
+
+def install_query_profiler(engine: Engine, settings: SqlProfilingSettings) -> None:
+    """Time every statement of `engine`. For an AsyncEngine pass `.sync_engine`."""
+    slow_seconds = settings.SQL_SLOW_QUERY_MS / 1000
+    repeat_threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            setattr(context, _STARTED_KEY, time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, _STARTED_KEY, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+
+        if slow_seconds > 0 and elapsed >= slow_seconds:
+            SQL_SLOW_QUERIES.inc()
+            logger.warning(
+                "slow query %.1f ms: %s params=%r",
+                elapsed * 1000,
+                statement[:MAX_LOGGED_STATEMENT],
+                redact_parameters(parameters, executemany),
+            )
+
+        profile = _active_profile.get()
+        if profile is None:
+            return
+        profile.statements += 1
+        profile.db_seconds += elapsed
+        if repeat_threshold > 0:
+            shape = statement_shape(statement)
+            profile.shapes[shape] += 1
+            # recorded once per shape and request, when it first goes over the threshold;
+            # the middleware logs it together with the route
+            if profile.shapes[shape] == repeat_threshold + 1:
+                profile.repeated.append(shape)
+                SQL_REPEATED_STATEMENTS.inc()
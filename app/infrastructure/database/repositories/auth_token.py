@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.dtos.auth import RefreshTokenGrant
+from domain.ports.auth_token_repository import IRefreshTokenRepository, IRevokedTokenRepository
+from infrastructure.database.models.auth_token import RefreshTokenModel, RevokedTokenModel
+from infrastructure.observability.metrics import instrument_methods
+
+
+@instrument_methods("repository")
+class RefreshTokenRepository(IRefreshTokenRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, user_id: int, token_hash: str, family_id: str, expires_at: datetime) -> None:
+        self.db.add(RefreshTokenModel(
+            user_id=user_id, token_hash=token_hash, family_id=family_id, expires_at=expires_at,
+        ))
+
+    async def consume(self, token_hash: str) -> Optional[RefreshTokenGrant]:
+        # single statement, so two concurrent refreshes with the same token cannot both win
+        stmt = (
+            update(RefreshTokenModel)
+            .where(
+                RefreshTokenModel.token_hash == token_hash,
+                RefreshTokenModel.rotated_at.is_(None),
+                RefreshTokenModel.revoked_at.is_(None),
+                RefreshTokenModel.expires_at > func.now(),
+            )
+            .values(rotated_at=func.now())
+            .returning(RefreshTokenModel.user_id, RefreshTokenModel.family_id)
+        )
+        row = (await self.db.execute(stmt)).first()
+        return RefreshTokenGrant(user_id=row.user_id, family_id=row.family_id) if row else None
+
+    async def revoke_family_of(self, token_hash: str) -> bool:
+        family = (
+            select(RefreshTokenModel.family_id)
+            .where(RefreshTokenModel.token_hash == token_hash)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.family_id == family, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+        )
+        return result.rowcount > 0
+
+
+@instrument_methods("repository")
+class RevokedTokenRepository(IRevokedTokenRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(self, jti: str, expires_at: datetime) -> None:
+        await self.db.execute(
+            pg_insert(RevokedTokenModel)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedTokenModel.jti])
+        )
+
+    async def list_revoked_since(self, since: Optional[datetime]) -> List[Tuple[str, datetime, datetime]]:
+        stmt = select(
+            RevokedTokenModel.jti, RevokedTokenModel.expires_at, RevokedTokenModel.revoked_at,
+        ).where(RevokedTokenModel.expires_at > func.now())
+        if since is not None:
+            stmt = stmt.where(RevokedTokenModel.revoked_at > since)
+        return [tuple(r) for r in (await self.db.execute(stmt)).all()]
+
+    async def prune(self, before: datetime) -> int:
+        result = await self.db.execute(delete(RevokedTokenModel).where(RevokedTokenModel.expires_at < before))
+        return result.rowcount
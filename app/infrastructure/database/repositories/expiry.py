@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.enums.payment import PaymentStatus
+from domain.enums.reservation import ReservationStatus
+from domain.ports.expiry_repository import IExpiryRepository
+from infrastructure.database.models.payment import PaymentModel
+from infrastructure.database.models.reservation import Reservation
+from infrastructure.observability.metrics import instrument_methods
+
+
+def _cancel_pending_stmt(created_before: datetime, limit: int):
+    # oldest first through ix_payments_status_created_at_id; rows a notify or another sweeper
+    # is updating right now are skipped instead of waited for
+    picked = (
+        select(PaymentModel.id)
+        .where(PaymentModel.status == PaymentStatus.PENDING, PaymentModel.created_at < created_before)
+        .order_by(PaymentModel.created_at, PaymentModel.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(PaymentModel)
+        .where(PaymentModel.id.in_(picked.scalar_subquery()), PaymentModel.status == PaymentStatus.PENDING)
+        .values(status=PaymentStatus.CANCELED, updated_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _expire_unpaid_stmt(starts_before: datetime, limit: int):
+    # partial index ix_reservations_unpaid_starts_at: already expired rows are not rescanned
+    picked = (
+        select(Reservation.id)
+        .where(Reservation.status == ReservationStatus.UNPAID, Reservation.starts_at < starts_before)
+        .order_by(Reservation.starts_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(Reservation)
+        .where(Reservation.id.in_(picked.scalar_subquery()), Reservation.status == ReservationStatus.UNPAID)
+        .values(status=ReservationStatus.EXPIRED, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+@instrument_methods("repository")
+class ExpiryRepository(IExpiryRepository):
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def cancel_pending_payments(self, created_before: datetime, limit: int) -> int:
+        result = await self.db.execute(_cancel_pending_stmt(created_before, limit))
+        return result.rowcount
+
+    async def expire_unpaid_reservations(self, starts_before: datetime, limit: int) -> int:
+        result = await self.db.execute(_expire_unpaid_stmt(starts_before, limit))
+        return result.rowcount
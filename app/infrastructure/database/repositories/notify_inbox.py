@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.dtos.payment import InboxNotify, NewebpayNotify
+from domain.ports.notify_inbox import INotifyInbox
+from infrastructure.database.models.notify_inbox import NotifyInboxModel
+from infrastructure.observability.metrics import instrument_methods
+
+
+def _to_dto(m: NotifyInboxModel) -> InboxNotify:
+    return InboxNotify(
+        id=m.id,
+        notify=NewebpayNotify(
+            status=m.status,
+            merchant_id=m.merchant_id,
+            version=m.version,
+            trade_info_hex=m.trade_info,
+            trade_sha=m.trade_sha,
+            result=None,
+        ),
+        received_at=m.received_at,
+        attempts=m.attempts,
+    )
+
+
+@instrument_methods("repository")
+class NotifyInboxRepository(INotifyInbox):
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def enqueue(self, notify: NewebpayNotify) -> bool:
+        stmt = (
+            insert(NotifyInboxModel)
+            .values(
+                status=notify.status,
+                merchant_id=notify.merchant_id,
+                version=notify.version,
+                trade_info=notify.trade_info_hex,
+                trade_sha=notify.trade_sha,
+            )
+            .on_conflict_do_nothing(index_elements=[NotifyInboxModel.trade_sha])
+            .returning(NotifyInboxModel.id)
+        )
+        inserted = (await self.db.execute(stmt)).scalar_one_or_none()
+        return inserted is not None
+
+    async def depth(self) -> int:
+        stmt = select(func.count()).select_from(NotifyInboxModel).where(NotifyInboxModel.processed_at.is_(None))
+        return (await self.db.execute(stmt)).scalar_one()
+
+    async def claim(self, limit: int, lease_seconds: int) -> List[InboxNotify]:
+        now = datetime.now(timezone.utc)
+        claimable = (
+            select(NotifyInboxModel.id)
+            .where(
+                NotifyInboxModel.processed_at.is_(None),
+                or_(NotifyInboxModel.locked_until.is_(None), NotifyInboxModel.locked_until < now),
+            )
+            .order_by(NotifyInboxModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(NotifyInboxModel)
+            .where(NotifyInboxModel.id.in_(claimable.scalar_subquery()))
+            .values(
+                locked_until=now + timedelta(seconds=lease_seconds),
+                attempts=NotifyInboxModel.attempts + 1,
+            )
+            .returning(NotifyInboxModel)
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await self.db.scalars(stmt)).all()
+        return sorted((_to_dto(m) for m in rows), key=lambda i: i.id)
+
+    async def mark_done(self, inbox_id: int) -> None:
+        await self.db.execute(
+            update(NotifyInboxModel)
+            .where(NotifyInboxModel.id == inbox_id)
+            .values(processed_at=func.now(), locked_until=None, last_error=None)
+        )
+
+    async def mark_failed(self, inbox_id: int, error: str, give_up: bool) -> None:
+        values = {"last_error": error[:2000]}
+        if give_up:
+            values["processed_at"] = func.now()
+        await self.db.execute(update(NotifyInboxModel).where(NotifyInboxModel.id == inbox_id).values(**values))
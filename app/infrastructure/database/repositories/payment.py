@@ -1,23 +1,37 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from application.dtos.payment import PaymentCursor, PaymentListQuery, PaymentPage, PaymentTransition, TransitionOutcome
 from domain.entities.payment import Payment
 from domain.enums.payment import PaymentStatus
-from domain.ports.payment_repository import IPaymentRepository
+from domain.ports.payment_repository import IPaymentRepository, IAsyncPaymentRepository
+from domain.value_objects.payer_info import PayerInfo
+from domain.value_objects.reservation_info import ReservationInfo
 from infrastructure.database.models.payment import PaymentModel
+from infrastructure.database.models.processed_notify import ProcessedNotifyModel
+from infrastructure.database.repositories.reservation_totals import (
+    refresh_reservation_totals,
+    refresh_reservation_totals_sync,
+)
+from infrastructure.observability.metrics import instrument_methods
 
 
 def _to_entity(m: PaymentModel) -> Payment:
     return Payment(
         id=m.id,
-        reservation_info=m.reservation_id,
-        payer_id=m.payer_id,
+        reservation_info=ReservationInfo(id=m.reservation_id, players=[]),
+        payer_info=PayerInfo(name=m.payer_name, email=m.payer_email, phone=m.payer_phone),
         amount_twd=m.amount_twd,
         status=PaymentStatus(m.status),
-        payment_provider=m.provider,
+        payment_provider=m.payment_provider,
         merchant_order_no=m.merchant_order_no,
         trade_no=m.trade_no,
         payment_type=m.payment_type,
@@ -29,13 +43,12 @@ def _to_entity(m: PaymentModel) -> Payment:
 
 def _apply_model(m: PaymentModel, e: Payment) -> None:
     m.reservation_id = e.reservation_info.id
-    m.player_id = e.reservation_info.players
     m.payer_name = e.payer_info.name
     m.payer_email = e.payer_info.email
     m.payer_phone = e.payer_info.phone
     m.amount_twd = e.amount_twd
     m.payment_provider = e.payment_provider
-    m.status = e.status.value
+    m.status = e.status
     m.merchant_order_no = e.merchant_order_no
     m.trade_no = e.trade_no
     m.payment_type = e.payment_type
@@ -44,6 +57,36 @@ def _apply_model(m: PaymentModel, e: Payment) -> None:
     m.updated_at = e.updated_at
 
 
+def _claim_notify_stmt(t: PaymentTransition):
+    return (
+        pg_insert(ProcessedNotifyModel)
+        .values(trade_sha=t.notify_key, merchant_order_no=t.payment_id, status=t.to_status)
+        .on_conflict_do_nothing(index_elements=[ProcessedNotifyModel.trade_sha])
+        .returning(ProcessedNotifyModel.trade_sha)
+    )
+
+
+def _transition_stmt(t: PaymentTransition):
+    values = {"status": t.to_status, "updated_at": datetime.now()}
+    if t.to_status == PaymentStatus.PAID:
+        values.update(trade_no=t.trade_no, payment_type=t.payment_type, pay_time=t.pay_time)
+    return (
+        update(PaymentModel)
+        .where(PaymentModel.id == t.payment_id, PaymentModel.status.in_(t.from_statuses))
+        .values(**values)
+        .returning(PaymentModel.status, PaymentModel.reservation_id)
+    )
+
+
+def _status_stmt(t: PaymentTransition):
+    return select(PaymentModel.status).where(PaymentModel.id == t.payment_id)
+
+
+def _release_notify_stmt(t: PaymentTransition):
+    return delete(ProcessedNotifyModel).where(ProcessedNotifyModel.trade_sha == t.notify_key)
+
+
+@instrument_methods("repository")
 class PaymentRepository(IPaymentRepository):
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -52,7 +95,6 @@ class PaymentRepository(IPaymentRepository):
         m = PaymentModel(id=payment.id)
         _apply_model(m, payment)
         self.db.add(m)
-        # self.db.commit()
 
     def get_by_id(self, payment_id: str) -> Optional[Payment]:
         m = self.db.get(PaymentModel, payment_id)
@@ -72,4 +114,93 @@ class PaymentRepository(IPaymentRepository):
             # if you prefer raising domain exception, do it in use case
             return
         _apply_model(m, payment)
-        self.db.commit()
+
+    def apply_transition(self, t: PaymentTransition) -> TransitionOutcome:
+        # ledger insert and conditional UPDATE in the caller's transaction: concurrent duplicates
+        # serialise on the ledger primary key instead of a read-modify-write on the payment row
+        if self.db.scalar(_claim_notify_stmt(t)) is None:
+            return TransitionOutcome(found=True, applied=False, duplicate=True)
+        row = self.db.execute(_transition_stmt(t)).first()
+        if row is not None:
+            # reservation aggregate moves in the same transaction as the payment row
+            refresh_reservation_totals_sync(self.db, [row.reservation_id])
+            return TransitionOutcome(found=True, applied=True, status=PaymentStatus(row.status))
+        status = self.db.scalar(_status_stmt(t))
+        if status is None:
+            # keep the key unrecorded so a retry after the payment row exists can still apply
+            self.db.execute(_release_notify_stmt(t))
+            return TransitionOutcome(found=False, applied=False)
+        return TransitionOutcome(found=True, applied=False, status=PaymentStatus(status))
+
+
+@instrument_methods("repository")
+class AsyncPaymentRepository(IAsyncPaymentRepository):
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def add(self, payment: Payment) -> None:
+        m = PaymentModel(id=payment.id)
+        _apply_model(m, payment)
+        self.db.add(m)
+
+    async def get_by_id(self, payment_id: str) -> Optional[Payment]:
+        m = await self.db.get(PaymentModel, payment_id)
+        return _to_entity(m) if m else None
+
+    async def update(self, payment: Payment) -> None:
+        m = await self.db.get(PaymentModel, payment.id)
+        if not m:
+            return
+        _apply_model(m, payment)
+
+    async def apply_transition(self, t: PaymentTransition) -> TransitionOutcome:
+        if await self.db.scalar(_claim_notify_stmt(t)) is None:
+            return TransitionOutcome(found=True, applied=False, duplicate=True)
+        row = (await self.db.execute(_transition_stmt(t))).first()
+        if row is not None:
+            await refresh_reservation_totals(self.db, [row.reservation_id])
+            return TransitionOutcome(found=True, applied=True, status=PaymentStatus(row.status))
+        status = await self.db.scalar(_status_stmt(t))
+        if status is None:
+            await self.db.execute(_release_notify_stmt(t))
+            return TransitionOutcome(found=False, applied=False)
+        return TransitionOutcome(found=True, applied=False, status=PaymentStatus(status))
+
+    async def list_pending_before(
+        self, cutoff: datetime, after_id: Optional[str], limit: int
+    ) -> List[Payment]:
+        stmt = (
+            select(PaymentModel)
+            .where(PaymentModel.status == PaymentStatus.PENDING, PaymentModel.created_at < cutoff)
+            .order_by(PaymentModel.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.where(PaymentModel.id > after_id)
+        rows = await self.db.scalars(stmt)
+        return [_to_entity(m) for m in rows]
+
+    async def list_page(self, query: PaymentListQuery) -> PaymentPage:
+        # status, reservation_id and payer_email each lead a (filter, created_at, id) index (a7c1e5d3f9b2);
+        # a combination of filters walks one of them and checks the rest per row
+        stmt = select(PaymentModel)
+        if query.statuses:
+            stmt = stmt.where(PaymentModel.status.in_(query.statuses))
+        if query.reservation_id is not None:
+            stmt = stmt.where(PaymentModel.reservation_id == query.reservation_id)
+        if query.created_from is not None:
+            stmt = stmt.where(PaymentModel.created_at >= query.created_from)
+        if query.created_before is not None:
+            stmt = stmt.where(PaymentModel.created_at < query.created_before)
+        if query.payer_email:
+            stmt = stmt.where(func.lower(PaymentModel.payer_email) == query.payer_email.lower())
+        if query.after is not None:
+            stmt = stmt.where(tuple_(PaymentModel.created_at, PaymentModel.id) < (query.after.created_at, query.after.id))
+        stmt = stmt.order_by(PaymentModel.created_at.desc(), PaymentModel.id.desc()).limit(query.limit + 1)
+
+        rows = list(await self.db.scalars(stmt))
+        next_cursor = None
+        if len(rows) > query.limit:
+            rows = rows[:query.limit]
+            next_cursor = PaymentCursor(created_at=rows[-1].created_at, id=rows[-1].id)
+        return PaymentPage(items=[_to_entity(m) for m in rows], next_cursor=next_cursor)
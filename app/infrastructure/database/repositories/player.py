@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, List, Optional, Sequence
 
+from sqlalchemy import String, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.orm import Session
 
 from domain.entities.player import Player as PlayerEntity
 from domain.enums.payment import PaymentStatus
 from domain.ports.player_repository import IPlayerRepository
 from infrastructure.database.models.player import Player as PlayerModel
+from infrastructure.observability.metrics import instrument_methods
 
 
 def _to_entity(m: PlayerModel) -> PlayerEntity:
@@ -23,6 +26,27 @@ def _apply_model(m: PlayerModel, e: PlayerEntity) -> None:
     m.created_at = e.created_at
     
 
+def _clean_roster(names: Sequence[str]) -> List[str]:
+    # trimmed, non-empty, first occurrence wins
+    return list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+
+
+_ROSTER = select(func.unnest(bindparam("names", type_=ARRAY(String))).column_valued("name"))
+_INSERTED = (
+    pg_insert(PlayerModel)
+    .from_select(["name"], _ROSTER)
+    .on_conflict_do_nothing(index_elements=[PlayerModel.name])
+    .returning(PlayerModel.id, PlayerModel.name)
+    .cte("inserted")
+)
+# One statement, one array parameter whatever the roster size: new rows come back from the
+# INSERT, existing ones from the lookup (the statement snapshot predates the insert, so no overlap).
+_UPSERT_MANY = select(_INSERTED.c.id, _INSERTED.c.name).union_all(
+    select(PlayerModel.id, PlayerModel.name).where(PlayerModel.name.in_(_ROSTER.scalar_subquery()))
+)
+
+
+@instrument_methods("repository")
 class PlayerRepository(IPlayerRepository):
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -32,7 +56,6 @@ class PlayerRepository(IPlayerRepository):
         if not self.get_by_id(player.id):
             _apply_model(m, player)
             self.db.add(m)
-            self.db.commit()
 
     def get_by_id(self, player_id: int) -> Optional[PlayerEntity]:
         m = self.db.get(PlayerModel, player_id)
@@ -41,3 +64,16 @@ class PlayerRepository(IPlayerRepository):
     def get_by_name(self, name: str) -> Optional[PlayerEntity]:
         m = self.db.query(PlayerModel).filter(PlayerModel.name == name).first()
         return _to_entity(m) if m else None
+
+    def upsert_many(self, names: Sequence[str]) -> Dict[str, int]:
+        roster = _clean_roster(names)
+        if not roster:
+            return {}
+        ids = {name: id for id, name in self.db.execute(_UPSERT_MANY, {"names": roster})}
+        missing = [n for n in roster if n not in ids]
+        if missing:
+            # a concurrent transaction inserted these after our snapshot; they are committed now
+            rows = self.db.execute(select(PlayerModel.id, PlayerModel.name).where(PlayerModel.name.in_(missing)))
+            ids.update({name: id for id, name in rows})
+        return {n: ids[n] for n in roster if n in ids}   # roster order
+
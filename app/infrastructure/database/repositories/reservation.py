@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+
+from domain.value_objects.reservation_page import ReservationCursor, ReservationListQuery, ReservationPage
+from domain.entities.player import Player as PlayerEntity
+from domain.entities.reservation import Reservation as ReservationEntity
+from domain.enums.payment import PaymentStatus
+from domain.enums.reservation import ReservationStatus
+from domain.ports.reservation_repository import IReservationRepository
+from infrastructure.database.models.reservation import Reservation, ReservationParticipant
+from infrastructure.database.repositories.payment import _to_entity as _payment_to_entity
+from infrastructure.observability.metrics import instrument_methods
+
+
+# Three statements whatever the page size: reservations, participants JOIN players, payments.
+# raiseload("*") turns any other lazy load into an error instead of a silent N+1.
+_LOAD_GRAPH = (
+    selectinload(Reservation.players).joinedload(ReservationParticipant.player),
+    selectinload(Reservation.payments),
+    raiseload("*"),
+)
+
+
+def _to_entity(m: Reservation) -> ReservationEntity:
+    return ReservationEntity(
+        id=m.id,
+        starts_at=m.starts_at,
+        court_name=m.court_name,
+        court_note=m.notes,
+        fee_per_person=m.fee_per_person,
+        paid_amount=sum(p.amount_twd for p in m.payments if p.status == PaymentStatus.PAID),
+        bank_account="",  # not persisted yet
+        allow_multi_payer=m.allow_multi_payer,
+        auto_issue_invoice=m.auto_issue_invoice,
+        players=[PlayerEntity(id=p.player.id, name=p.player.name, created_at=p.player.created_at) for p in m.players],
+        status=m.status,
+        created_at=m.created_at,
+        updated_at=m.updated_at,
+        payments=[_payment_to_entity(p) for p in m.payments],
+    )
+
+
+def _apply_model(m: Reservation, e: ReservationEntity) -> None:
+    m.starts_at = e.starts_at
+    m.court_name = e.court_name
+    m.notes = e.court_note
+    m.fee_per_person = e.fee_per_person
+    m.total_amount_twd = e.fee_per_person * len(e.players)
+    m.allow_multi_payer = e.allow_multi_payer
+    m.auto_issue_invoice = e.auto_issue_invoice
+    m.status = ReservationStatus(e.status)
+
+    # players must already exist (see PlayerRepository); only the links are synced here
+    wanted = {p.id for p in e.players}
+    m.players = [p for p in m.players if p.player_id in wanted]
+    have = {p.player_id for p in m.players}
+    m.players.extend(ReservationParticipant(player_id=pid) for pid in wanted - have)
+
+
+@instrument_methods("repository")
+class ReservationRepository(IReservationRepository):
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def get_by_id(self, id: int) -> Optional[ReservationEntity]:
+        m = self.db.get(Reservation, id, options=_LOAD_GRAPH)
+        return _to_entity(m) if m else None
+
+    def save(self, reservation: ReservationEntity) -> None:
+        m = None
+        if reservation.id is not None:
+            m = self.db.get(Reservation, reservation.id, options=(selectinload(Reservation.players),))
+        if m is None:
+            m = Reservation(players=[])
+            self.db.add(m)
+        _apply_model(m, reservation)
+        self.db.flush()  # assigns the id; the caller's unit of work commits
+        reservation.id = m.id
+
+    def delete(self, reservation: ReservationEntity) -> None:
+        m = self.db.get(Reservation, reservation.id)
+        if not m:
+            return
+        self.db.delete(m)
+
+    def list_all(self) -> List[ReservationEntity]:
+        stmt = select(Reservation).options(*_LOAD_GRAPH).order_by(Reservation.starts_at, Reservation.id)
+        return [_to_entity(m) for m in self.db.scalars(stmt)]
+
+    def list_page(self, query: ReservationListQuery) -> ReservationPage:
+        stmt = select(Reservation).options(*_LOAD_GRAPH)
+        if query.starts_from is not None:
+            stmt = stmt.where(Reservation.starts_at >= query.starts_from)
+        if query.starts_before is not None:
+            stmt = stmt.where(Reservation.starts_at < query.starts_before)
+        if query.statuses:
+            stmt = stmt.where(Reservation.status.in_([ReservationStatus(s) for s in query.statuses]))
+        if query.after is not None:
+            # row-value comparison matches the (starts_at, id) index order
+            stmt = stmt.where(tuple_(Reservation.starts_at, Reservation.id) > (query.after.starts_at, query.after.id))
+        # one extra row tells whether another page exists without a COUNT
+        stmt = stmt.order_by(Reservation.starts_at, Reservation.id).limit(query.limit + 1)
+
+        rows = list(self.db.scalars(stmt))
+        next_cursor = None
+        if len(rows) > query.limit:
+            rows = rows[:query.limit]
+            next_cursor = ReservationCursor(starts_at=rows[-1].starts_at, id=rows[-1].id)
+        return ReservationPage(items=[_to_entity(m) for m in rows], next_cursor=next_cursor)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import and_, case, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from application.dtos.reservation import ReservationTotals
+from domain.enums.payment import PaymentStatus
+from domain.enums.reservation import ReservationStatus
+from domain.ports.reservation_totals_repository import IReservationTotalsRepository
+from infrastructure.database.models.payment import PaymentModel
+from infrastructure.database.models.reservation import Reservation
+from infrastructure.database.models.reservation_totals import ReservationPaymentTotals as Totals
+from infrastructure.observability.metrics import instrument_methods
+
+# reservation statuses that only follow from payments; EXPIRED is never overwritten
+_PAYMENT_DERIVED = (ReservationStatus.UNPAID, ReservationStatus.PAID_PARTIAL, ReservationStatus.PAID_ALL)
+
+
+def _status_literal(s: ReservationStatus):
+    return literal(s, Totals.status.type)
+
+
+def _lock_stmt(ids: List[int]):
+    # serialises concurrent refreshes of one reservation, so the recompute below always
+    # starts after the other transaction's payment change is committed and visible.
+    # FOR NO KEY UPDATE: the id is never changed, so payment inserts (FOR KEY SHARE on the FK) are not blocked
+    return (
+        select(Reservation.id)
+        .where(Reservation.id.in_(ids))
+        .order_by(Reservation.id)
+        .with_for_update(key_share=True)
+    )
+
+
+def _recompute_stmt(ids: List[int]):
+    paid = func.coalesce(func.sum(PaymentModel.amount_twd), 0)
+    source = (
+        select(
+            Reservation.id,
+            func.count(PaymentModel.id),
+            paid,
+            func.greatest(Reservation.total_amount_twd - paid, 0),
+            case(
+                (paid == 0, _status_literal(ReservationStatus.UNPAID)),
+                (paid >= Reservation.total_amount_twd, _status_literal(ReservationStatus.PAID_ALL)),
+                else_=_status_literal(ReservationStatus.PAID_PARTIAL),
+            ),
+        )
+        .select_from(Reservation)
+        # reads only this reservation's PAID rows via ix_payments_reservation_status
+        .outerjoin(PaymentModel, and_(
+            PaymentModel.reservation_id == Reservation.id,
+            PaymentModel.status == PaymentStatus.PAID,
+        ))
+        .where(Reservation.id.in_(ids))
+        .group_by(Reservation.id)
+    )
+    cols = ["reservation_id", "paid_count", "paid_amount_twd", "outstanding_amount_twd", "status"]
+    stmt = pg_insert(Totals).from_select(cols, source)
+    return stmt.on_conflict_do_update(
+        index_elements=[Totals.reservation_id],
+        set_={**{c: stmt.excluded[c] for c in cols[1:]}, "updated_at": func.now()},
+    )
+
+
+def _sync_reservation_status_stmt(ids: List[int]):
+    # DraftReservationUseCase creates reservations as EDITING; a draft stays EDITING while
+    # nothing is paid and moves to PAID_PARTIAL / PAID_ALL once a payment settles against it
+    return (
+        update(Reservation)
+        .where(
+            Reservation.id == Totals.reservation_id,
+            Reservation.id.in_(ids),
+            or_(
+                Reservation.status.in_(_PAYMENT_DERIVED),
+                and_(Reservation.status == ReservationStatus.EDITING, Totals.status != ReservationStatus.UNPAID),
+            ),
+            Reservation.status != Totals.status,
+        )
+        .values(status=Totals.status)
+    )
+
+
+def refresh_reservation_totals_sync(db: Session, reservation_ids: Iterable[int]) -> None:
+    """Recompute the aggregates of `reservation_ids` inside the caller's transaction (no commit)."""
+    ids = sorted({int(i) for i in reservation_ids})
+    if not ids:
+        return
+    db.execute(_lock_stmt(ids))
+    db.execute(_recompute_stmt(ids))
+    db.execute(_sync_reservation_status_stmt(ids))
+
+
+async def refresh_reservation_totals(db: AsyncSession, reservation_ids: Iterable[int]) -> None:
+    ids = sorted({int(i) for i in reservation_ids})
+    if not ids:
+        return
+    await db.execute(_lock_stmt(ids))
+    await db.execute(_recompute_stmt(ids))
+    await db.execute(_sync_reservation_status_stmt(ids))
+
+
+def _to_dto(m: Totals) -> ReservationTotals:
+    return ReservationTotals(
+        reservation_id=m.reservation_id,
+        paid_count=m.paid_count,
+        paid_amount_twd=m.paid_amount_twd,
+        outstanding_amount_twd=m.outstanding_amount_twd,
+        status=m.status,
+    )
+
+
+@instrument_methods("repository")
+class ReservationTotalsRepository(IReservationTotalsRepository):
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def next_reservation_ids(self, after: int, limit: int) -> List[int]:
+        return list(await self.db.scalars(
+            select(Reservation.id).where(Reservation.id > after).order_by(Reservation.id).limit(limit)
+        ))
+
+    async def refresh(self, reservation_ids: List[int]) -> None:
+        await refresh_reservation_totals(self.db, reservation_ids)
+
+    async def list_between(
+        self, starts_from: datetime, starts_before: datetime, status: Optional[ReservationStatus] = None
+    ) -> List[ReservationTotals]:
+        stmt = (
+            select(Totals)
+            .join(Reservation, Reservation.id == Totals.reservation_id)
+            .where(Reservation.starts_at >= starts_from, Reservation.starts_at < starts_before)
+            .order_by(Reservation.starts_at, Reservation.id)
+        )
+        if status is not None:
+            stmt = stmt.where(Totals.status == status)
+        return [_to_dto(m) for m in await self.db.scalars(stmt)]
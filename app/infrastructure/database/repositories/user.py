@@ -1,9 +1,12 @@
 from __future__ import annotations
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.entities.user import AdminUser
-from domain.ports.user_repository import IAdminUserRepository
+from domain.ports.user_repository import IAdminUserRepository, IAsyncAdminUserRepository
 from infrastructure.database.models.user import UserModel
+from infrastructure.observability.metrics import instrument_methods
 
 
 def _to_domain(m: UserModel) -> AdminUser:
@@ -15,6 +18,7 @@ def _to_domain(m: UserModel) -> AdminUser:
     )
 
 
+@instrument_methods("repository")
 class AdminUserRepository(IAdminUserRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -29,9 +33,28 @@ class AdminUserRepository(IAdminUserRepository):
             return
         m.last_login_at = user.last_login_at
         self.db.add(m)
-        self.db.commit()
 
     def get_by_id(self, id: int) -> AdminUser | None:
         m = self.db.get(UserModel, id)
         return _to_domain(m) if m else None
 
+
+@instrument_methods("repository")
+class AsyncAdminUserRepository(IAsyncAdminUserRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_admin(self, username: str) -> AdminUser | None:
+        m = await self.db.scalar(select(UserModel).where(UserModel.username == username).limit(1))
+        return _to_domain(m) if m else None
+
+    async def save_admin(self, user: AdminUser) -> None:
+        m = await self.db.get(UserModel, user.id)
+        if not m:
+            return
+        m.last_login_at = user.last_login_at
+        m.password_hash = user.password_hash
+
+    async def get_by_id(self, id: int) -> AdminUser | None:
+        m = await self.db.get(UserModel, id)
+        return _to_domain(m) if m else None
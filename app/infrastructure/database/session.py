@@ -1,13 +1,64 @@
+from typing import AsyncIterator
+
 from sqlalchemy.orm import Session, sessionmaker
-from infrastructure.config.settings import get_settings
-from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from infrastructure.config.settings import DatabasePoolSettings, get_settings
+from infrastructure.database.pool_metrics import TimedAsyncQueuePool, TimedQueuePool, instrument_pool
+from infrastructure.database.query_profiler import install_query_profiler
+from infrastructure.database.unit_of_work import count_statement
+from sqlalchemy import create_engine, event
+
+
+def _pool_options(pool: DatabasePoolSettings) -> dict:
+    return {
+        "pool_size": pool.DB_POOL_SIZE,
+        "max_overflow": pool.DB_MAX_OVERFLOW,
+        "pool_timeout": pool.DB_POOL_TIMEOUT,
+        "pool_recycle": pool.DB_POOL_RECYCLE,
+        "pool_pre_ping": pool.DB_POOL_PRE_PING,
+    }
+
+
+def _async_database_url(url: str) -> str:
+    # DATABASE_URL is shared with alembic (psycopg2); the async engine needs the asyncpg driver
+    u = make_url(url)
+    if u.drivername in ("postgresql", "postgresql+psycopg2"):
+        u = u.set(drivername="postgresql+asyncpg")
+    return u.render_as_string(hide_password=False)
+
 
-engine = create_engine(get_settings().DATABASE_URL)  
+_settings = get_settings()
+
+engine = create_engine(
+    _settings.DATABASE_URL,
+    poolclass=TimedQueuePool,
+    **_pool_options(_settings.db_pool),
+)
+instrument_pool(engine, "sync")
+event.listen(engine, "before_cursor_execute", count_statement)
+install_query_profiler(engine, _settings.sql_profiling)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+async_engine = create_async_engine(
+    _async_database_url(_settings.DATABASE_URL),
+    poolclass=TimedAsyncQueuePool,
+    **_pool_options(_settings.db_pool),
+)
+instrument_pool(async_engine.sync_engine, "async")
+event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+install_query_profiler(async_engine.sync_engine, _settings.sql_profiling)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
 def get_db() -> Session:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
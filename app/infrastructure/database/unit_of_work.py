@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Optional
+
+from prometheus_client import Histogram
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from domain.ports.unit_of_work import IAsyncUnitOfWork, IUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+UOW_STATEMENTS = Histogram(
+    "uow_statements",
+    "SQL statements executed inside one unit of work",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64, 128),
+)
+UOW_COMMIT_SECONDS = Histogram(
+    "uow_commit_seconds",
+    "Time spent in COMMIT by one unit of work",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+
+@dataclass
+class UnitOfWorkStats:
+    statements: int = 0
+    commits: int = 0
+    commit_seconds: float = 0.0
+
+
+# the unit of work active in this task / thread; contextvars follow SQLAlchemy's greenlets
+# and Starlette's threadpool hand-off, so the engine listener below sees it
+_active_stats: ContextVar[Optional[UnitOfWorkStats]] = ContextVar("uow_stats", default=None)
+
+
+def current_uow_stats() -> Optional[UnitOfWorkStats]:
+    return _active_stats.get()
+
+
+def count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    """`before_cursor_execute` listener, registered on both engines in session.py."""
+    stats = _active_stats.get()
+    if stats is not None:
+        stats.statements += 1
+
+
+def _observe(stats: UnitOfWorkStats) -> None:
+    UOW_STATEMENTS.observe(stats.statements)
+    if stats.commits:
+        UOW_COMMIT_SECONDS.observe(stats.commit_seconds)
+    logger.debug(
+        "unit of work: %d statements, %d commits, %.2f ms in commit",
+        stats.statements, stats.commits, stats.commit_seconds * 1000,
+    )
+
+
+class SqlAlchemyUnitOfWork(IUnitOfWork):
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.stats = UnitOfWorkStats()
+        self._token: Optional[Token] = None
+
+    def __enter__(self) -> "SqlAlchemyUnitOfWork":
+        # a unit of work may be entered once per batch (reconciliation, rebuilds); stats are per block
+        self.stats = UnitOfWorkStats()
+        self._token = _active_stats.set(self.stats)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            # no-op after commit(); discards anything written since
+            self.session.rollback()
+        finally:
+            _active_stats.reset(self._token)
+            _observe(self.stats)
+
+    def commit(self) -> None:
+        started = time.perf_counter()
+        self.session.commit()
+        self.stats.commit_seconds += time.perf_counter() - started
+        self.stats.commits += 1
+
+    def rollback(self) -> None:
+        self.session.rollback()
+
+
+class AsyncSqlAlchemyUnitOfWork(IAsyncUnitOfWork):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.stats = UnitOfWorkStats()
+        self._token: Optional[Token] = None
+
+    async def __aenter__(self) -> "AsyncSqlAlchemyUnitOfWork":
+        self.stats = UnitOfWorkStats()
+        self._token = _active_stats.set(self.stats)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            await self.session.rollback()
+        finally:
+            _active_stats.reset(self._token)
+            _observe(self.stats)
+
+    async def commit(self) -> None:
+        started = time.perf_counter()
+        await self.session.commit()
+        self.stats.commit_seconds += time.perf_counter() - started
+        self.stats.commits += 1
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
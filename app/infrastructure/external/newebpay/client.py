@@ -1,28 +1,80 @@
 from __future__ import annotations
 
 import json
+import os
 import time
+import random
+import asyncio
 import httpx
 import hashlib
+import hmac
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
-from urllib.parse import unquote_plus
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from infrastructure.config.settings import get_settings
-from application.dtos.payment import MpgForm, MpgFormRequest
+from application.dtos.payment import MpgForm, MpgFormRequest, NewebpayNotify, NotifyBatchItem
 from domain.ports.payment_gateway import PaymentGateway
-from application.dtos.payment import MpgFormRequest, NewebpayNotify
 from infrastructure.external.newebpay.crypto import (
-    aes256_cbc_encrypt_hex,
-    aes256_cbc_decrypt_hex,
-    newebpay_trade_sha,
+    NewebpayCrypto,
     build_urlencoded_query,
-    parse_urlencoded_query,
 )
+from infrastructure.external.newebpay.trade_info import parse_trade_info
+from infrastructure.observability.metrics import instrument_methods
+from infrastructure.observability.structured_logging import bind_log_fields
 
 
+def _verify_and_parse(crypto: NewebpayCrypto, form: NewebpayNotify) -> NewebpayNotify:
+    # Newebpay notify/return returns: Status, MerchantID, Version, TradeInfo, TradeSha (4.2.2)
+    if not crypto.verify(form.trade_info_hex, form.trade_sha):
+        raise ValueError("Invalid TradeSha (SHA256 check failed)")
 
+    plain = crypto.decrypt_hex(form.trade_info_hex).decode("utf-8", errors="replace")
+
+    # RespondType=String: urlencoded query; RespondType=JSON: {"Status", "Message", "Result": {...}}
+    data = parse_trade_info(plain)
+
+    return NewebpayNotify(
+        status=form.status,
+        merchant_id=form.merchant_id,
+        version=form.version,
+        trade_info_hex=form.trade_info_hex,
+        trade_sha=form.trade_sha,
+        result=data,
+    )
+
+
+# ---------- batch workers (module level so they can be pickled into a process pool) ----------
+
+_worker_crypto: Optional[NewebpayCrypto] = None
+
+
+def _init_batch_worker(hash_key: str, hash_iv: str) -> None:
+    global _worker_crypto
+    _worker_crypto = NewebpayCrypto(hash_key, hash_iv)
+
+
+def _verify_chunk(chunk: List[Tuple[int, NewebpayNotify]]) -> List[NotifyBatchItem]:
+    items = []
+    for index, form in chunk:
+        try:
+            items.append(NotifyBatchItem(index=index, notify=_verify_and_parse(_worker_crypto, form)))
+        except Exception as e:
+            items.append(NotifyBatchItem(index=index, error=f"{type(e).__name__}: {e}"))
+    return items
+
+
+# form building / notify verification (crypto included) and every HTTP call to Newebpay
+@instrument_methods("newebpay", methods=(
+    "build_mpg_form",
+    "parse_and_verify_notify",
+    "query_trade_info",
+    "cancel_creditcard_auth",
+    "close_creditcard",
+    "ewallet_refund",
+))
 class NewebpayClient(PaymentGateway):
     """
     Implements Newebpay MPG (front-stage) + notify decrypt/verify + QueryTradeInfo + creditcard cancel/close + ewallet refund.
@@ -32,6 +84,59 @@ class NewebpayClient(PaymentGateway):
     def __init__(self, settings):
         self.secrets = settings.newebpay_secrets
         self.endpoints = settings.newebpay_endpoints
+        self.crypto = NewebpayCrypto(self.secrets.HASH_KEY, self.secrets.HASH_IV)
+        self.http_settings = settings.newebpay_http
+        self._http: Optional[httpx.AsyncClient] = None
+
+    # ---------- HTTP client lifecycle ----------
+
+    async def start(self) -> None:
+        """Open the pooled HTTP client. Called from the FastAPI lifespan; safe to call twice."""
+        if self._http is None:
+            hs = self.http_settings
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(hs.NEWEBPAY_HTTP_TIMEOUT, connect=hs.NEWEBPAY_HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=hs.NEWEBPAY_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=hs.NEWEBPAY_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=hs.NEWEBPAY_HTTP_KEEPALIVE_EXPIRY,
+                ),
+                http2=hs.NEWEBPAY_HTTP2,
+            )
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _client(self) -> httpx.AsyncClient:
+        # CLI / scripts may use the gateway without the app lifespan
+        if self._http is None:
+            await self.start()
+        return self._http
+
+    async def _post(self, url: str, data: Dict[str, str]) -> Dict[str, Any]:
+        client = await self._client()
+        r = await client.post(url, data=data)
+        r.raise_for_status()
+        # Newebpay returns JSON if RespondType=JSON, else string
+        try:
+            return r.json()
+        except Exception:
+            return {"raw": r.text}
+
+    async def _post_idempotent(self, url: str, data: Dict[str, str]) -> Dict[str, Any]:
+        """POST with exponential backoff + jitter on transport errors and 5xx. Only for read-only calls."""
+        retries = self.http_settings.NEWEBPAY_QUERY_RETRIES
+        backoff = self.http_settings.NEWEBPAY_QUERY_BACKOFF
+        for attempt in range(retries + 1):
+            try:
+                return await self._post(url, data)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = isinstance(e, httpx.TransportError) or e.response.status_code >= 500
+                if not retryable or attempt == retries:
+                    raise
+                await asyncio.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
 
     @property
     def mpg_url(self) -> str:
@@ -57,6 +162,7 @@ class NewebpayClient(PaymentGateway):
         self,
         mpg_form: MpgForm
     ) -> MpgFormRequest:
+        bind_log_fields(merchant_order_no=mpg_form.merchant_order_no)
         # TradeInfo inner params per 4.2.1 (MerchantID, RespondType, TimeStamp, Version, MerchantOrderNo, Amt, ItemDesc, ...)
         trade_info: Dict[str, Any] = {
             "MerchantID": self.secrets.MERCHANT_ID,
@@ -84,12 +190,8 @@ class NewebpayClient(PaymentGateway):
 
         qs = build_urlencoded_query(trade_info).encode("utf-8")
 
-        trade_info_hex = aes256_cbc_encrypt_hex(
-            plain=qs,
-            key=self.secrets.HASH_KEY.encode("utf-8"),
-            iv=self.secrets.HASH_IV.encode("utf-8"),
-        )
-        trade_sha = newebpay_trade_sha(self.secrets.HASH_KEY, self.secrets.HASH_IV, trade_info_hex)
+        trade_info_hex = self.crypto.encrypt_hex(qs)
+        trade_sha = self.crypto.sign(trade_info_hex)
 
         # outer form fields per 4.2.1: MerchantID, TradeInfo, TradeSha, Version
         fields = {
@@ -102,39 +204,57 @@ class NewebpayClient(PaymentGateway):
         return MpgFormRequest(action_url=self.mpg_url, fields=fields)
 
     def parse_and_verify_notify(self, form: NewebpayNotify) -> NewebpayNotify:
-        # Newebpay notify/return returns: Status, MerchantID, Version, TradeInfo, TradeSha (4.2.2)
-        status = form.status
-        merchant_id = form.merchant_id
-        version = form.version
-        trade_info_hex = form.trade_info_hex
-        trade_sha = form.trade_sha
-
-        expected = newebpay_trade_sha(self.secrets.HASH_KEY, self.secrets.HASH_IV, trade_info_hex)
-        if expected != trade_sha:
-            raise ValueError("Invalid TradeSha (SHA256 check failed)")
-
-        plain = aes256_cbc_decrypt_hex(
-            cipher_hex=trade_info_hex,
-            key=self.secrets.HASH_KEY.encode("utf-8"),
-            iv=self.secrets.HASH_IV.encode("utf-8"),
-        ).decode("utf-8", errors="replace")
-
-        # plain is urlencoded query string, values may contain + for space
-        # Example: "...&PayTime=2023-09-27+14%3A21%3A59&..."
-        decoded = unquote_plus(plain)
-        data = parse_urlencoded_query(decoded)
-
-        # RespondType=JSON case: Status/Message/Result may appear flattened or Result content in JSON.
-        # Many merchants just treat it as a flat query string; keep as dict.
-        return NewebpayNotify(
-            status=status,
-            merchant_id=merchant_id,
-            version=version,
-            trade_info_hex=trade_info_hex,
-            trade_sha=trade_sha,
-            result=data,
+        notify = _verify_and_parse(self.crypto, form)
+        # the first point where the callback's ids are known; later log lines of this request carry them
+        bind_log_fields(merchant_order_no=notify.result.merchant_order_no, trade_no=notify.result.trade_no)
+        return notify
+
+    def verify_notify_signature(self, form: NewebpayNotify) -> bool:
+        """TradeSha check only (one SHA256 and a constant-time compare), no decryption."""
+        return self.crypto.verify(form.trade_info_hex, form.trade_sha)
+
+    def parse_and_verify_notify_batch(
+        self,
+        forms: Iterable[NewebpayNotify],
+        chunk_size: int = 256,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[NotifyBatchItem]:
+        """
+        Verify and decrypt many archived callbacks (replay / backfill), yielding results in input order.
+        `forms` is consumed lazily and at most `max_in_flight` chunks (default: 2 per worker) are
+        submitted at a time, so memory stays flat for arbitrarily long streams. A bad item yields a
+        NotifyBatchItem with `error` set; the batch goes on. The process pool is created per call,
+        with each worker holding its own NewebpayCrypto.
+        """
+        workers = max_workers or os.cpu_count() or 1
+        if max_in_flight is None:
+            max_in_flight = 2 * workers
+        if chunk_size < 1 or max_in_flight < 1:
+            raise ValueError("chunk_size and max_in_flight must be >= 1")
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(self.secrets.HASH_KEY, self.secrets.HASH_IV),
         )
 
+        numbered = enumerate(forms)
+        pending: Deque[Future] = deque()
+        try:
+            while True:
+                while len(pending) < max_in_flight:
+                    chunk = list(islice(numbered, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_verify_chunk, chunk))
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
     # ---------- QueryTradeInfo (NPA-B02) ----------
 
     def build_query_payload(
@@ -149,7 +269,7 @@ class NewebpayClient(PaymentGateway):
         CheckValue rule per 4.1.6: SHA256("IV={iv}&{sorted(Amt,MerchantID,MerchantOrderNo)}&Key={key}") upper-case
         """
         ts = int(time.time())
-        check_value = self._check_value(merchant_order_no=merchant_order_no, amt=amount_twd)
+        check_value = self.create_check_value(merchant_order_no=merchant_order_no, amount_twd=amount_twd)
         return {
             "MerchantID": self.secrets.MERCHANT_ID,
             "Version": version,
@@ -172,16 +292,28 @@ class NewebpayClient(PaymentGateway):
         raw = f"IV={self.secrets.HASH_IV}&{data1}&Key={self.secrets.HASH_KEY}".encode("utf-8")
         return hashlib.sha256(raw).hexdigest().upper()
 
+    def create_check_code(self, result: Mapping[str, Any]) -> str:
+        """
+        CheckCode rule per 4.3.2: SHA256("HashIV={iv}&{sorted(Amt,MerchantID,MerchantOrderNo,TradeNo)}&HashKey={key}")
+        upper-case. MerchantID is ours, so a Result for another merchant fails the check too.
+        """
+        parts = {
+            "Amt": str(result.get("Amt", "")),
+            "MerchantID": self.secrets.MERCHANT_ID,
+            "MerchantOrderNo": str(result.get("MerchantOrderNo", "")),
+            "TradeNo": str(result.get("TradeNo", "")),
+        }
+        data1 = "&".join([f"{k}={parts[k]}" for k in sorted(parts.keys())])
+        raw = f"HashIV={self.secrets.HASH_IV}&{data1}&HashKey={self.secrets.HASH_KEY}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest().upper()
+
+    def verify_check_code(self, result: Mapping[str, Any]) -> bool:
+        check_code = str(result.get("CheckCode", ""))
+        return hmac.compare_digest(check_code.upper(), self.create_check_code(result))
+
     async def query_trade_info(self, merchant_order_no: str, amount_twd: int) -> Dict[str, Any]:
         payload = self.build_query_payload(merchant_order_no, amount_twd)
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.post(self.query_url, data=payload)
-            r.raise_for_status()
-            # Newebpay returns JSON if RespondType=JSON, else string
-            try:
-                return r.json()
-            except Exception:
-                return {"raw": r.text}
+        return await self._post_idempotent(self.query_url, payload)
 
     # ---------- CreditCard Cancel (NPA-B01) ----------
 
@@ -215,9 +347,13 @@ class NewebpayClient(PaymentGateway):
             raise ValueError("index_type must be 1 or 2")
 
         qs = build_urlencoded_query(inner).encode("utf-8")
-        postdata_hex = aes256_cbc_encrypt_hex(qs, self.secrets.HASH_KEY.encode(), self.secrets.HASH_IV.encode())
+        postdata_hex = self.crypto.encrypt_hex(qs)
         return {"MerchantID_": self.secrets.MERCHANT_ID, "PostData_": postdata_hex}
 
+    async def cancel_creditcard_auth(self, merchant_order_no: str, amount_twd: int, **kwargs: Any) -> Dict[str, Any]:
+        payload = self.build_creditcard_cancel_auth_payload(merchant_order_no, amount_twd, **kwargs)
+        return await self._post(self.cancel_url, payload)
+
     # ---------- CreditCard Close (B031~B034) ----------
 
     def build_creditcard_close_payload(
@@ -254,9 +390,15 @@ class NewebpayClient(PaymentGateway):
             inner["TradeNo"] = trade_no
 
         qs = build_urlencoded_query(inner).encode("utf-8")
-        postdata_hex = aes256_cbc_encrypt_hex(qs, self.secrets.HASH_KEY.encode(), self.secrets.HASH_IV.encode())
+        postdata_hex = self.crypto.encrypt_hex(qs)
         return {"MerchantID_": self.secrets.MERCHANT_ID, "PostData_": postdata_hex}
 
+    async def close_creditcard(
+        self, merchant_order_no: str, amount_twd: int, close_type: int, **kwargs: Any
+    ) -> Dict[str, Any]:
+        payload = self.build_creditcard_close_payload(merchant_order_no, amount_twd, close_type, **kwargs)
+        return await self._post(self.close_url, payload)
+
     # ---------- EWallet Refund (NPA-B06) ----------
 
     def build_ewallet_refund_payload(
@@ -278,13 +420,19 @@ class NewebpayClient(PaymentGateway):
             "PaymentType": payment_type,
         }
         json_str = json.dumps(inner, ensure_ascii=False, separators=(",", ":"))
-        encrypt_hex = _aes256_cbc_encrypt_hex(json_str.encode("utf-8"), self.secrets.hash_key.encode(), self.secrets.hash_iv.encode())
-        hash_data = newebpay_trade_sha(self.secrets.hash_key, self.secrets.hash_iv, encrypt_hex)
+        encrypt_hex = self.crypto.encrypt_hex(json_str.encode("utf-8"))
+        hash_data = self.crypto.sign(encrypt_hex)
 
         return {
-            "UID_": self.secrets.merchant_id,
+            "UID_": self.secrets.MERCHANT_ID,
             "Version_": version,
             "EncryptData_": encrypt_hex,
             "RespondType_": respond_type,
             "HashData_": hash_data,
         }
+
+    async def ewallet_refund(
+        self, merchant_order_no: str, amount_twd: int, payment_type: str, **kwargs: Any
+    ) -> Dict[str, Any]:
+        payload = self.build_ewallet_refund_payload(merchant_order_no, amount_twd, payment_type, **kwargs)
+        return await self._post(self.ewallet_refund_url, payload)
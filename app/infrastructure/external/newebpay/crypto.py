@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import hmac
 from dataclasses import dataclass
 from typing import Dict
 from urllib.parse import urlencode, parse_qsl
@@ -38,6 +39,49 @@ def newebpay_trade_sha(hash_key: str, hash_iv: str, trade_info_hex: str) -> str:
     return hashlib.sha256(raw).hexdigest().upper()
 
 
+class NewebpayCrypto:
+    """
+    AES-256-CBC (PKCS7, hex) and SHA256 TradeSha helpers bound to one merchant's HashKey/HashIV.
+    Key material is encoded once, the Cipher is reused (each call opens its own CBC context) and
+    the SHA256 state already holds the constant "HashKey=...&" prefix, so callers only hash the payload.
+    Instances are read-only after __init__ and safe to share between threads.
+    """
+
+    __slots__ = ("_cipher", "_sha_prefix", "_sha_suffix")
+
+    _BLOCK = 16
+
+    def __init__(self, hash_key: str, hash_iv: str):
+        key = hash_key.encode("utf-8")
+        iv = hash_iv.encode("utf-8")
+        self._cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+        self._sha_prefix = hashlib.sha256(b"HashKey=" + key + b"&")
+        self._sha_suffix = b"&HashIV=" + iv
+
+    def encrypt_hex(self, plain: bytes) -> str:
+        pad = self._BLOCK - len(plain) % self._BLOCK
+        enc = self._cipher.encryptor()
+        return (enc.update(plain + bytes((pad,)) * pad) + enc.finalize()).hex()
+
+    def decrypt_hex(self, cipher_hex: str) -> bytes:
+        dec = self._cipher.decryptor()
+        padded = dec.update(bytes.fromhex(cipher_hex)) + dec.finalize()
+        pad = padded[-1] if padded else 0
+        if not 1 <= pad <= self._BLOCK or padded[-pad:] != bytes((pad,)) * pad:
+            raise ValueError("Invalid padding bytes.")
+        return padded[:-pad]
+
+    def sign(self, trade_info_hex: str) -> str:
+        # SHA256("HashKey={key}&{TradeInfoHex}&HashIV={iv}") upper-case
+        h = self._sha_prefix.copy()
+        h.update(trade_info_hex.encode("utf-8"))
+        h.update(self._sha_suffix)
+        return h.hexdigest().upper()
+
+    def verify(self, trade_info_hex: str, trade_sha: str) -> bool:
+        return hmac.compare_digest(self.sign(trade_info_hex).encode(), trade_sha.encode("utf-8"))
+
+
 def build_urlencoded_query(data: Dict[str, str | int]) -> str:
     # Newebpay uses http_build_query-like encoding (URL-encoded)
     # Keep doseq False; values are scalar.
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import socket
+import threading
+import time
+from typing import Tuple
+
+from domain.ports.order_number import OrderNumberGenerator
+
+# Newebpay accepts letters, digits and "_" in MerchantOrderNo, at most 30 characters
+_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_BASE = len(_ALPHABET)
+
+# fixed-width fields, so string order is time order
+_TIME_WIDTH = 9        # milliseconds since EPOCH_MS; 36**9 ms is about 3,000 years
+_SEQ_WIDTH = 3         # ids per process per millisecond before borrowing the next one
+_NODE_WIDTH = 2        # 0 .. 1295, one per host / container
+_PID_WIDTH = 5         # covers Linux pid_max (2**22)
+
+MAX_SEQUENCE = _BASE ** _SEQ_WIDTH - 1
+MAX_NODE_ID = _BASE ** _NODE_WIDTH - 1
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+
+
+def _encode(value: int, width: int) -> str:
+    chars = []
+    for _ in range(width):
+        value, rem = divmod(value, _BASE)
+        chars.append(_ALPHABET[rem])
+    if value:
+        raise ValueError(f"value does not fit in {width} base-36 digits")
+    return "".join(reversed(chars))
+
+
+def default_node_id() -> int:
+    """
+    Hostname hash, for development only: 1296 slots collide easily across pods, and containers
+    usually all run as pid 1, so colliding pods would emit identical ids.
+    """
+    digest = hashlib.blake2b(socket.gethostname().encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % (MAX_NODE_ID + 1)
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000 - EPOCH_MS
+
+
+class _ProcessClock:
+    """
+    The (millisecond, sequence) pair handed out by this process. Module-level, so every
+    generator instance (e.g. an old and a new container during a settings reload) draws
+    from the same state and no pair is issued twice. Never goes backwards even if the wall
+    clock does; a child process after fork() notices its new pid and starts over.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset(os.getpid())
+
+    def _reset(self, pid: int) -> None:
+        self.pid = pid
+        self._last_ms = -1
+        self._seq = 0
+
+    def tick(self) -> Tuple[int, int, int]:
+        now_ms = _now_ms()
+        with self._lock:
+            pid = os.getpid()
+            if pid != self.pid:
+                self._reset(pid)
+            if now_ms > self._last_ms:
+                self._last_ms, self._seq = now_ms, 0
+            elif self._seq < MAX_SEQUENCE:
+                # same millisecond, or the clock stepped back: keep counting on the last one
+                self._seq += 1
+            else:
+                # sequence exhausted: borrow the next millisecond rather than block the caller
+                self._last_ms, self._seq = self._last_ms + 1, 0
+            return self._last_ms, self._seq, pid
+
+
+_clock = _ProcessClock()
+
+
+class SnowflakeOrderNumberGenerator(OrderNumberGenerator):
+    """
+    Snowflake-style MerchantOrderNo: prefix + time + sequence + node + pid, all base 36.
+
+    No database round trip: uniqueness across processes comes from (node, pid), within a
+    process from the process-wide (time, sequence) clock shared by all instances.
+    """
+
+    def __init__(self, node_id: int, prefix: str = "RES") -> None:
+        if not 0 <= node_id <= MAX_NODE_ID:
+            raise ValueError(f"node_id must be between 0 and {MAX_NODE_ID}")
+        if not prefix.isalnum() or not prefix.isascii():
+            raise ValueError("prefix must be ASCII letters and digits")
+        self.prefix = prefix.upper()
+        self.length = len(self.prefix) + _TIME_WIDTH + _SEQ_WIDTH + _NODE_WIDTH + _PID_WIDTH
+        if self.length > 30:
+            raise ValueError("prefix too long for a 30 character MerchantOrderNo")
+        self._node = _encode(node_id, _NODE_WIDTH)
+        # (pid, node+pid) and (ms, prefix+time): each a single tuple, so a thread never pairs
+        # one field's new value with the other's old one
+        self._worker = (-1, "")
+        self._stamp = (-1, "")
+
+    def next_order_no(self) -> str:
+        ms, seq, pid = _clock.tick()
+        worker = self._worker
+        if worker[0] != pid:
+            worker = self._worker = (pid, self._node + _encode(pid, _PID_WIDTH))
+        stamp = self._stamp
+        if stamp[0] != ms:
+            stamp = self._stamp = (ms, self.prefix + _encode(ms, _TIME_WIDTH))
+        return stamp[1] + _encode(seq, _SEQ_WIDTH) + worker[1]
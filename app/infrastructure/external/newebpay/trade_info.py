@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+from typing import Dict
+from urllib.parse import unquote_plus
+
+from application.dtos.payment import TradeResult
+
+
+def parse_query_once(qs: str) -> Dict[str, str]:
+    """
+    Split an x-www-form-urlencoded string and percent-decode each key/value exactly once.
+    Decoding after the split keeps an encoded "&" or "=" inside a value intact; values without
+    "%" or "+" (most of a Newebpay payload) are taken as-is without a decode pass.
+    Last value wins for duplicated keys.
+    """
+    out: Dict[str, str] = {}
+    for pair in qs.split("&"):
+        if not pair:
+            continue
+        key, _, value = pair.partition("=")
+        if "%" in key or "+" in key:
+            key = unquote_plus(key)
+        if "%" in value or "+" in value:
+            value = unquote_plus(value)
+        out[key] = value
+    return out
+
+
+def parse_trade_info(plain: str) -> TradeResult:
+    """
+    Parse decrypted TradeInfo for both RespondType values:
+      String -> "Status=SUCCESS&Message=...&MerchantOrderNo=...&PayTime=2023-09-27+14%3A21%3A59&..."
+      JSON   -> {"Status": "SUCCESS", "Message": "...", "Result": {...}}  (Result may itself be a JSON string)
+    """
+    text = plain.lstrip()
+    if text.startswith("{"):
+        doc = json.loads(text)
+        result = doc.get("Result") or {}
+        if isinstance(result, str):
+            result = json.loads(result) if result.strip() else {}
+        return TradeResult.from_mapping(result, status=doc.get("Status", ""), message=doc.get("Message", ""))
+    return TradeResult.from_mapping(parse_query_once(plain))
@@ -1,14 +1,27 @@
 from __future__ import annotations
 from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+import hashlib
+import secrets
+import uuid
 import jwt
 
+from domain.exceptions.auth import InvalidToken
 from domain.ports.token_service import TokenService
+from infrastructure.external.security.token_cache import VerifiedTokenCache
 
 
 class JwtTokenService(TokenService):
-    def __init__(self, secret_key: str, algorithm: str):
+    """
+    Built once per container and shared. With a `cache`, a token whose signature and expiry
+    were already checked is answered from memory until it expires (or the cache TTL passes).
+    """
+
+    def __init__(self, secret_key: str, algorithm: str, cache: Optional[VerifiedTokenCache] = None):
         self.secret_key = secret_key
         self.algorithm = algorithm
+        self.algorithms = [algorithm]
+        self.cache = cache
 
     def create_access_token(self, subject: str, id: int, expires_delta: timedelta) -> str:
         now = datetime.now(timezone.utc)
@@ -17,15 +30,28 @@ class JwtTokenService(TokenService):
             "id": id,
             "iat": int(now.timestamp()),
             "exp": int((now + expires_delta).timestamp()),
+            "jti": uuid.uuid4().hex,   # lets a single token be revoked (logout) via the denylist
         }
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
     
     def decode_access_token(self, token: str) -> dict:
-        return jwt.decode(token, self.secret_key, algorithms=self.algorithm)
-
-
-
-
-
-
+        if self.cache is not None:
+            claims = self.cache.get(token)
+            if claims is not None:
+                return claims
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=self.algorithms)
+        except jwt.InvalidTokenError as e:
+            raise InvalidToken(str(e)) from e
+        if self.cache is not None:
+            self.cache.put(token, claims)
+        return claims
+
+    def create_refresh_token(self) -> Tuple[str, str]:
+        token = secrets.token_urlsafe(32)
+        return token, self.hash_refresh_token(token)
+
+    def hash_refresh_token(self, token: str) -> str:
+        # 256 bits of randomness: a fast hash is enough, no bcrypt on the refresh path
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
@@ -1,5 +1,10 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
-from domain.ports.password_hasher import PasswordHasher
+from domain.exceptions.auth import PasswordHasherBusy
+from domain.ports.password_hasher import AsyncPasswordHasher, PasswordHasher
 
 _pwd_ctx = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
 
@@ -7,3 +12,31 @@ _pwd_ctx = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
 class BcryptPasswordHasher(PasswordHasher):
     def verify(self, plain_password: str, password_hash: str) -> bool:
         return _pwd_ctx.verify(plain_password, password_hash)
+
+
+class AsyncBcryptPasswordHasher(AsyncPasswordHasher):
+    """
+    Runs bcrypt on a dedicated, size-capped thread pool (bcrypt releases the GIL, so threads give
+    real parallelism without pickling a CryptContext into worker processes). At most `max_pending`
+    checks may be queued or running; beyond that calls fail fast instead of piling up behind a
+    credential-stuffing burst, and the default threadpool used by sync routes is never touched.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pwhash")
+        self._max_pending = max_pending
+        self._pending = 0  # only touched from the event loop thread
+
+    async def verify_and_update(self, plain_password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        if self._pending >= self._max_pending:
+            raise PasswordHasherBusy()
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # one bcrypt run; passlib re-hashes only when CryptContext.needs_update() says the scheme/rounds changed
+            return await loop.run_in_executor(self._executor, _pwd_ctx.verify_and_update, plain_password, password_hash)
+        finally:
+            self._pending -= 1
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of token -> verified claims. An entry lives until the token's own `exp`
+    or `max_ttl_seconds`, whichever comes first, so a cached token never outlives its signature
+    check and settings changes (secret rotation, revocation) take effect within `max_ttl_seconds`.
+    Thread-safe: sync dependencies run on the threadpool.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.max_ttl_seconds = max_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+        return dict(claims)  # callers may mutate their copy
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        now = time.time()
+        expires_at = now + self.max_ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._entries[token] = (expires_at, dict(claims))
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from domain.ports.token_denylist import ITokenDenylist
+
+
+class InMemoryTokenDenylist(ITokenDenylist):
+    """
+    jti -> expiry (unix seconds) of revoked access tokens: an O(1) dict lookup per request.
+    Filled from the revoked_tokens table by the sync task; local revocations are added directly so
+    they apply in this worker immediately, and in the others after their next sync.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.synced_until: Optional[datetime] = None   # highest revoked_at seen; next sync is incremental
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._entries
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._entries[jti] = expires_at.timestamp()
+
+    def merge(self, rows: Iterable[Tuple[str, datetime, datetime]]) -> int:
+        added = 0
+        with self._lock:
+            for jti, expires_at, revoked_at in rows:
+                if jti not in self._entries:
+                    added += 1
+                self._entries[jti] = expires_at.timestamp()
+                if self.synced_until is None or revoked_at > self.synced_until:
+                    self.synced_until = revoked_at
+        return added
+
+    def prune(self) -> int:
+        # an expired token is rejected by its exp claim anyway
+        now = time.time()
+        with self._lock:
+            expired = [jti for jti, exp in self._entries.items() if exp <= now]
+            for jti in expired:
+                del self._entries[jti]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,135 @@
+"""
+Process-local Prometheus aggregation shared by every layer.
+
+Single process: the default registry, as before. Several uvicorn / gunicorn workers: set
+PROMETHEUS_MULTIPROC_DIR (an empty, writable directory) in the environment before the app
+starts; every worker then writes its samples to mmap'ed files there and /metrics, served by
+any worker, merges them.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+OPERATION_SECONDS = Histogram(
+    "operation_duration_seconds",
+    "Duration of named operations: use cases, repository calls, gateway crypto and HTTP",
+    ["component", "operation"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+OPERATION_ERRORS = Counter(
+    "operation_errors_total",
+    "Named operations that raised",
+    ["component", "operation"],
+)
+
+# label lookups take a lock and hash the label tuple; resolve each (component, operation) once
+_children: Dict[Tuple[str, str], Tuple[object, object]] = {}
+
+
+def _child(component: str, operation: str):
+    key = (component, operation)
+    pair = _children.get(key)
+    if pair is None:
+        pair = _children.setdefault(key, (
+            OPERATION_SECONDS.labels(component, operation),
+            OPERATION_ERRORS.labels(component, operation),
+        ))
+    return pair
+
+
+class timer:
+    """`with timer("newebpay", "encrypt"):` records the block's duration, and a failure if it raises."""
+
+    __slots__ = ("_histogram", "_errors", "_started")
+
+    def __init__(self, component: str, operation: str) -> None:
+        self._histogram, self._errors = _child(component, operation)
+
+    def __enter__(self) -> "timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._histogram.observe(time.perf_counter() - self._started)
+        if exc_type is not None:
+            self._errors.inc()
+
+
+def timed(component: str, operation: Optional[str] = None) -> Callable:
+    """Decorator form of `timer`, for plain and async functions; operation defaults to the qualname."""
+
+    def decorate(fn: Callable) -> Callable:
+        histogram, errors = _child(component, operation or fn.__qualname__)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except BaseException:
+                    errors.inc()
+                    raise
+                finally:
+                    histogram.observe(time.perf_counter() - started)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                errors.inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - started)
+        return wrapper
+
+    return decorate
+
+
+def instrument_methods(component: str, methods: Optional[Iterable[str]] = None) -> Callable[[type], type]:
+    """
+    Class decorator: times the public methods the class itself defines (or just `methods`),
+    as "<Class>.<method>". Applying it twice to the same class is a no-op.
+    """
+
+    def decorate(cls: type) -> type:
+        if cls.__dict__.get("_instrumented"):
+            return cls
+        names = methods if methods is not None else [
+            n for n, v in cls.__dict__.items() if not n.startswith("_") and inspect.isfunction(v)
+        ]
+        for name in names:
+            setattr(cls, name, timed(component, f"{cls.__name__}.{name}")(cls.__dict__[name]))
+        cls._instrumented = True
+        return cls
+
+    return decorate
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    if multiprocess_enabled():
+        # fresh registry per scrape, as prometheus_client requires for multiprocess collection
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Called on worker shutdown so its live gauges stop being reported."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
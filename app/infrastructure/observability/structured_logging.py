@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+from prometheus_client import Counter
+
+from infrastructure.config.settings import LoggingSettings
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+)
+LOG_ERRORS_SUPPRESSED = Counter(
+    "log_errors_suppressed_total",
+    "Repeated error records dropped by sampling",
+)
+
+# ---------- request-scoped correlation fields ----------
+
+# one mutable dict per request (or inbox item): code deeper down adds ids to the dict, which
+# the middleware's scope shares with the threadpool and SQLAlchemy's greenlets
+_log_fields: ContextVar[Optional[Dict[str, Any]]] = ContextVar("log_fields", default=None)
+
+
+@contextmanager
+def log_scope(**fields: Any) -> Iterator[Dict[str, Any]]:
+    scope = {k: v for k, v in fields.items() if v}
+    token = _log_fields.set(scope)
+    try:
+        yield scope
+    finally:
+        _log_fields.reset(token)
+
+
+def bind_log_fields(**fields: Any) -> None:
+    """Add correlation ids to the current scope; a no-op outside one."""
+    scope = _log_fields.get()
+    if scope is not None:
+        scope.update((k, v) for k, v in fields.items() if v)
+
+
+# ---------- redaction ----------
+
+_REDACTED = "[redacted]"
+_SENSITIVE_KEYS = frozenset({
+    "tradeinfo", "trade_info", "trade_info_hex", "tradesha", "trade_sha",
+    "payer_name", "payer_email", "payer_phone", "email", "phone",
+    "card6no", "card4no", "cardno", "password", "authorization",
+    "token", "access_token", "refresh_token", "hash_key", "hash_iv",
+})
+_EMAIL = re.compile(r"\b([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9.-]+\.[A-Za-z]{2,})\b")
+_TW_PHONE = re.compile(r"(?:\+886[- ]?|\b0)9\d{2}[- ]?\d{3}[- ]?\d{3}\b")
+# TradeInfo (hundreds of chars) and TradeSha (64): long unbroken hex; request ids (32) stay readable
+_HEX_BLOB = re.compile(r"\b[0-9A-Fa-f]{48,}\b")
+
+
+def redact_text(text: str) -> str:
+    text = _HEX_BLOB.sub(lambda m: f"[hex:{len(m.group())}]", text)
+    text = _EMAIL.sub(r"\1***@\2", text)
+    return _TW_PHONE.sub("[phone]", text)
+
+
+def redact_value(key: str, value: Any) -> Any:
+    if key.lower() in _SENSITIVE_KEYS:
+        return _REDACTED
+    if isinstance(value, str):
+        return redact_text(value)
+    return value
+
+
+# ---------- error sampling ----------
+
+class ErrorSampler(logging.Filter):
+    """
+    Per (logger, message template, exception type) and window, pass the first `burst` ERROR+
+    records, then one in `sample_every`. The next record let through carries `suppressed`.
+    """
+
+    _MAX_KEYS = 1024
+
+    def __init__(self, burst: int, window_seconds: float, sample_every: int) -> None:
+        super().__init__()
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self.sample_every = max(1, sample_every)
+        self._lock = threading.Lock()
+        # key -> [window start, seen in window, suppressed since last emitted]
+        self._seen: Dict[Tuple[str, str, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.ERROR or self.burst <= 0:
+            return True
+        exc_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else ""
+        key = (record.name, str(record.msg), exc_type)
+        now = time.monotonic()
+        with self._lock:
+            state = self._seen.get(key)
+            if state is None or now - state[0] >= self.window_seconds:
+                if len(self._seen) >= self._MAX_KEYS:
+                    self._seen.clear()
+                suppressed = state[2] if state else 0
+                state = self._seen[key] = [now, 0, suppressed]
+            state[1] += 1
+            seen = state[1]
+            if seen > self.burst and (seen - self.burst) % self.sample_every:
+                state[2] += 1
+                LOG_ERRORS_SUPPRESSED.inc()
+                return False
+            if state[2]:
+                record.suppressed = state[2]
+                state[2] = 0
+        return True
+
+
+# ---------- queue handler / formatters ----------
+
+_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message", "asctime", "taskName", "log_fields", "suppressed",
+}
+_exception_formatter = logging.Formatter()
+
+
+def _extra_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {k: v for k, v in record.__dict__.items() if k not in _RECORD_ATTRS and not k.startswith("_")}
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    Runs on the logging thread and only does in-memory work: render and redact the message,
+    snapshot the correlation fields, put the record on a bounded queue. A full queue drops the
+    record (counted) rather than blocking the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        exc_text = record.exc_text
+        if record.exc_info:
+            exc_text = _exception_formatter.formatException(record.exc_info)
+        if record.stack_info:
+            exc_text = f"{exc_text}\n{record.stack_info}" if exc_text else record.stack_info
+
+        record = copy.copy(record)
+        record.msg = record.message = redact_text(record.getMessage())
+        record.args = None
+        record.exc_info = None
+        record.stack_info = None
+        record.exc_text = redact_text(exc_text) if exc_text else None
+        for key, value in _extra_fields(record).items():
+            setattr(record, key, redact_value(key, value))
+        scope = _log_fields.get()
+        record.log_fields = {k: redact_value(k, v) for k, v in scope.items()} if scope else {}
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "log_fields", None) or {})
+        entry.update(_extra_fields(record))
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = {**(getattr(record, "log_fields", None) or {}), **_extra_fields(record)}
+        if getattr(record, "suppressed", None):
+            fields["suppressed"] = record.suppressed
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+# ---------- setup ----------
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    settings: LoggingSettings,
+    stream: Optional[TextIO] = None,
+    capture: Tuple[str, ...] = ("uvicorn", "uvicorn.error", "uvicorn.access"),
+    quiet: Tuple[str, ...] = ("sqlalchemy", "httpx", "httpcore"),
+) -> None:
+    """
+    Route the root logger through a bounded queue to one writer thread. `capture` loggers drop
+    their own handlers and propagate to root, so their output is formatted the same way;
+    `quiet` libraries log per connection / request at INFO and are held at WARNING.
+    Calling it again replaces the previous pipeline.
+    """
+    global _listener
+    stop_logging()
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    handler = StructuredQueueHandler(log_queue)
+    handler.addFilter(ErrorSampler(
+        burst=settings.LOG_ERROR_BURST,
+        window_seconds=settings.LOG_ERROR_WINDOW_SECONDS,
+        sample_every=settings.LOG_ERROR_SAMPLE_EVERY,
+    ))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name in capture:
+        captured = logging.getLogger(name)
+        captured.handlers = []
+        captured.propagate = True
+    for name in quiet:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, writer)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush what is queued and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
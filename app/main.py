@@ -1,9 +1,104 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import signal
+from contextlib import asynccontextmanager, suppress
+from operator import attrgetter
+
+from fastapi import FastAPI, Response
+from infrastructure.config.container import aclose_container, get_container, reload_container
+from infrastructure.config.settings import get_settings
+from infrastructure.database.session import async_engine
+from infrastructure.observability.metrics import mark_process_dead, render_metrics
+from infrastructure.observability.structured_logging import configure_logging
+from presentation.instrumentation import instrument_use_cases
+from presentation.middleware.log_context import LogContextMiddleware
+from presentation.middleware.metrics import MetricsMiddleware
+from presentation.middleware.query_profile import QueryProfileMiddleware
 from presentation.routes.auth import router as auth_router
 from presentation.routes.payment import router as payment_router
-# from settings.config import get_settings
+from presentation.tasks.expiry import expiry_loop
+from presentation.tasks.notify_inbox import notify_inbox_workers
+from presentation.tasks.reconciliation import reconciliation_loop
+from presentation.tasks.token_denylist import token_denylist_loop
+
+
+logger = logging.getLogger(__name__)
+
+
+# Used once at startup, so a SIGHUP does not apply them: the engines, pools and query profiler
+# built at import, the background task schedules and inbox workers started in the lifespan,
+# and the order number node / prefix (carried over by reload_container). Everything read
+# through the container, and LOG_*, takes effect on reload.
+_RESTART_ONLY_SETTINGS = (
+    "DATABASE_URL",
+    "db_pool",
+    "sql_profiling",
+    "notify_inbox",
+    "order_numbers",
+    "reconciliation.RECONCILE_INTERVAL_SECONDS",
+    "expiry.EXPIRY_INTERVAL_SECONDS",
+    "jwt.JWT_DENYLIST_SYNC_SECONDS",
+)
+
+
+def _reload_settings() -> None:
+    old = get_container().settings
+    new = reload_container().settings
+    if new.logging != old.logging:
+        configure_logging(new.logging)
+    # against what the process started with, so every later reload still reports them
+    pending = [name for name in _RESTART_ONLY_SETTINGS if attrgetter(name)(new) != attrgetter(name)(_startup_settings)]
+    if pending:
+        logger.warning("settings reloaded on SIGHUP; restart the worker to apply %s", ", ".join(pending))
+    else:
+        logger.warning("settings reloaded on SIGHUP")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # build settings + gateway once per worker, before the first request
+    container = get_container()
+    await container.payment_gateway.start()
+    # `kill -HUP <worker pid>` re-reads settings after a secret rotation, without a restart
+    loop = asyncio.get_running_loop()
+    # not available on Windows, or when the loop runs off the main thread (TestClient)
+    with suppress(NotImplementedError, AttributeError, RuntimeError):
+        loop.add_signal_handler(signal.SIGHUP, _reload_settings)
+
+    tasks = []
+    if container.settings.reconciliation.RECONCILE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(
+            reconciliation_loop(container.settings.reconciliation.RECONCILE_INTERVAL_SECONDS)
+        ))
+    if container.settings.expiry.EXPIRY_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(expiry_loop(container.settings.expiry.EXPIRY_INTERVAL_SECONDS)))
+    if container.settings.jwt.JWT_DENYLIST_SYNC_SECONDS > 0:
+        tasks.append(asyncio.create_task(token_denylist_loop(container.settings.jwt.JWT_DENYLIST_SYNC_SECONDS)))
+    if container.settings.notify_inbox.NOTIFY_INGEST_MODE == "inbox":
+        notify_inbox_workers.start(container.settings.notify_inbox)
+    yield
+    with suppress(NotImplementedError, AttributeError, RuntimeError):
+        loop.remove_signal_handler(signal.SIGHUP)
+    await notify_inbox_workers.stop()
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await aclose_container()
+    await async_engine.dispose()
+    mark_process_dead()
+
+
+# the settings the engines were built from (infrastructure.database.session)
+_startup_settings = get_settings()
+# before the first logger is used: every record goes through the queue, off the event loop
+configure_logging(_startup_settings.logging)
+instrument_use_cases()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(QueryProfileMiddleware, debug_headers=get_settings().sql_profiling.SQL_DEBUG_HEADERS)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(LogContextMiddleware)
 app.include_router(auth_router)
 app.include_router(payment_router)
 
@@ -16,6 +111,12 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "my-clean-api"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # merged across workers when PROMETHEUS_MULTIPROC_DIR is set
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 # payment routes
 
 
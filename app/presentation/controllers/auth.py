@@ -1,8 +1,8 @@
 from fastapi import HTTPException, status
 
-from application.dtos.auth import LoginCommand, GetAdminQuery
-from application.use_cases.auth import LoginUseCase, GetAdminUseCase
-from domain.exceptions.auth import InvalidCredentials, AdminRequired
+from application.dtos.auth import LoginCommand, GetAdminQuery, RefreshTokenCommand, LogoutCommand
+from application.use_cases.auth import LoginUseCase, AsyncLoginUseCase, GetAdminUseCase, RefreshAccessTokenUseCase, LogoutUseCase
+from domain.exceptions.auth import InvalidCredentials, InvalidToken, AdminRequired, AdminNotFound, PasswordHasherBusy
 from presentation.schemas.auth import LoginRequest, TokenResponse, UserRead
 
 
@@ -20,11 +20,62 @@ def login_controller(cmd: LoginCommand, uc: LoginUseCase) -> TokenResponse:
         )
 
 
+async def async_login_controller(cmd: LoginCommand, uc: AsyncLoginUseCase) -> TokenResponse:
+    try:
+        result = await uc.execute(cmd)
+        return TokenResponse(
+            access_token=result.access_token, token_type=result.token_type, refresh_token=result.refresh_token,
+        )
+
+    except InvalidCredentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def refresh_token_controller(cmd: RefreshTokenCommand, uc: RefreshAccessTokenUseCase) -> TokenResponse:
+    try:
+        result = await uc.execute(cmd)
+        return TokenResponse(
+            access_token=result.access_token, token_type=result.token_type, refresh_token=result.refresh_token,
+        )
+
+    except InvalidToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def logout_controller(cmd: LogoutCommand, uc: LogoutUseCase) -> None:
+    await uc.execute(cmd)
+
+
 def get_admin_controller(cmd: GetAdminQuery, uc: GetAdminUseCase) -> UserRead:
     try:
         result = uc.execute(cmd)
         return UserRead(id=result.id, username=result.username)
 
+    except InvalidToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except AdminNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
     except AdminRequired:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
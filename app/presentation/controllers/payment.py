@@ -1,40 +1,111 @@
 from fastapi import HTTPException, status
-from fastapi.responses import HTMLResponse, PlainTextResponse
-from typing import Dict
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+import base64
+from datetime import datetime
+from typing import Dict, Optional
 
-from application.dtos.payment import CreatePaymentCommand, NewebpayNotify
-from application.use_cases.payment import CreatePaymentUseCase, HandleNewebpayNotifyUseCase
+from application.dtos.payment import CreatePaymentCommand, NewebpayNotify, PaymentCursor, PaymentListQuery
+from application.use_cases.payment import AsyncCreatePaymentUseCase, AsyncHandleNewebpayNotifyUseCase, ListPaymentsUseCase
+from presentation.renderers.mpg_form import render_mpg_form_html
+from presentation.schemas.payment import PaymentListOut, PaymentOut
+from application.use_cases.notify_inbox import EnqueueNewebpayNotifyUseCase
+from domain.exceptions.payment import NotifyInboxUnavailable
 
-import traceback
+import logging
 
+logger = logging.getLogger(__name__)
 
 
-def create_payment_controller(cmd: CreatePaymentCommand, uc: CreatePaymentUseCase,
-) -> str:
-    result = uc.execute(cmd)
+async def create_payment_controller(cmd: CreatePaymentCommand, uc: AsyncCreatePaymentUseCase,
+    as_json: bool = False,
+) -> HTMLResponse | JSONResponse:
+    result = await uc.execute(cmd)
+    form = result.mpg_form_request
+    if as_json:
+        # the SPA builds and submits the form itself; no HTML on our side.
+        # Shape of MpgFormOut, built as a plain dict: the values are ours, nothing to validate
+        return JSONResponse(content={
+            "action_url": form.action_url,
+            "fields": {k: str(v) for k, v in form.fields.items()},
+        })
     # Return auto-submit HTML form
-    inputs = "\n".join(
-        f'<input type="hidden" name="{k}" value="{v}"/>'
-        for k, v in result.mpg_form_request.fields.items()
-    )
-    html = f"""
-    <html><body>
-      <form id="newebpay" method="post" action="{result.mpg_form_request.action_url}">
-        {inputs}
-        <noscript><button type="submit">Continue to Pay</button></noscript>
-      </form>
-      <script>document.getElementById("newebpay").submit();</script>
-    </body></html>
-    """
-    return HTMLResponse(content=html)
-
-
-def handle_newebpay_notify_controller(cmd: NewebpayNotify, uc: HandleNewebpayNotifyUseCase) -> PlainTextResponse:
+    return HTMLResponse(content=render_mpg_form_html(form.action_url, form.fields))
+
+
+async def handle_newebpay_notify_controller(
+    cmd: NewebpayNotify, uc: AsyncHandleNewebpayNotifyUseCase | EnqueueNewebpayNotifyUseCase
+) -> PlainTextResponse:
     try:
-        uc.execute(cmd)
-    except Exception as e:
-        print(traceback.format_exc())
-        
+        await uc.execute(cmd)
+    except NotifyInboxUnavailable:
+        # inbox full or down: anything but 200 makes Newebpay retry the callback later
+        return PlainTextResponse(content="BUSY", status_code=503)
+    except Exception:
+        # still answer OK: the payment is reconciled later; merchant_order_no / trade_no come
+        # from the log scope when decryption got that far
+        logger.exception("newebpay notify handling failed")
 
     return PlainTextResponse(content="OK", status_code=200)
-        
\ No newline at end of file
+
+
+def encode_payment_cursor(cursor: Optional[PaymentCursor]) -> Optional[str]:
+    if cursor is None:
+        return None
+    raw = f"{cursor.created_at.isoformat()}|{cursor.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_payment_cursor(token: Optional[str]) -> Optional[PaymentCursor]:
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        created_at, payment_id = raw.split("|", 1)
+        return PaymentCursor(created_at=datetime.fromisoformat(created_at), id=payment_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _as_local_naive(dt: Optional[datetime]) -> Optional[datetime]:
+    # payments.created_at is stored as naive local time (see Payment entity)
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone().replace(tzinfo=None)
+
+
+async def list_payments_controller(query: PaymentListQuery, uc: ListPaymentsUseCase) -> PaymentListOut:
+    query = PaymentListQuery(
+        statuses=query.statuses,
+        reservation_id=query.reservation_id,
+        created_from=_as_local_naive(query.created_from),
+        created_before=_as_local_naive(query.created_before),
+        payer_email=query.payer_email,
+        after=query.after,
+        limit=query.limit,
+    )
+    try:
+        page = await uc.execute(query)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return PaymentListOut(
+        items=[
+            PaymentOut(
+                id=p.id,
+                reservation_id=str(p.reservation_info.id),
+                payer_name=p.payer_info.name,
+                payer_email=p.payer_info.email,
+                payer_phone=p.payer_info.phone,
+                amount_twd=p.amount_twd,
+                status=p.status.value,
+                merchant_order_no=p.merchant_order_no,
+                trade_no=p.trade_no,
+                payment_type=p.payment_type,
+                pay_time=p.pay_time,
+                created_at=p.created_at,
+                updated_at=p.updated_at,
+            )
+            for p in page.items
+        ],
+        next_cursor=encode_payment_cursor(page.next_cursor),
+    )
+
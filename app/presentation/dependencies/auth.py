@@ -1,59 +1,134 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import HTTPException, status
 
 from domain.exceptions.auth import InvalidToken
-from application.use_cases.auth import LoginUseCase, GetAdminUseCase
-from infrastructure.database.session import get_db
-from infrastructure.config.settings import Settings, get_settings
-from infrastructure.database.repositories.user import AdminUserRepository
+from application.use_cases.auth import (
+    LoginUseCase, AsyncLoginUseCase, GetAdminUseCase, GetAdminFromClaimsUseCase, RefreshAccessTokenUseCase, LogoutUseCase,
+)
+from infrastructure.database.session import get_db, get_async_db
+from infrastructure.config.container import get_container
+from infrastructure.database.repositories.user import AdminUserRepository, AsyncAdminUserRepository
+from infrastructure.database.repositories.auth_token import RefreshTokenRepository, RevokedTokenRepository
 from infrastructure.external.security.password_hasher import BcryptPasswordHasher
 from infrastructure.external.security.jwt_token import JwtTokenService
+from infrastructure.database.unit_of_work import AsyncSqlAlchemyUnitOfWork, SqlAlchemyUnitOfWork
+from presentation.dependencies.unit_of_work import get_async_uow, get_uow
+from presentation.tasks.token_denylist import token_denylist
+
+
+def get_token_service() -> JwtTokenService:
+    # shared per process: one instance, one verified-token cache
+    return get_container().token_service
 
 
 def get_login_use_case(
     db: Session = Depends(get_db),
-    settings: Settings = Depends(get_settings),
+    token_service: JwtTokenService = Depends(get_token_service),
+    uow: SqlAlchemyUnitOfWork = Depends(get_uow),
 ) -> LoginUseCase:
     repo = AdminUserRepository(db)
     hasher = BcryptPasswordHasher()
-    token_service = JwtTokenService(secret_key=settings.jwt.JWT_SECRET_KEY, algorithm=settings.jwt.JWT_ALGORITHM)
     return LoginUseCase(
         repo=repo,
         hasher=hasher,
         token_service=token_service,
+        uow=uow,
         access_token_ttl_minutes=30,
     )
 
 
+def get_async_login_use_case(
+    db: AsyncSession = Depends(get_async_db),
+    token_service: JwtTokenService = Depends(get_token_service),
+    uow: AsyncSqlAlchemyUnitOfWork = Depends(get_async_uow),
+) -> AsyncLoginUseCase:
+    jwt_settings = get_container().settings.jwt
+    return AsyncLoginUseCase(
+        repo=AsyncAdminUserRepository(db),
+        hasher=get_container().password_hasher,
+        token_service=token_service,
+        uow=uow,
+        access_token_ttl_minutes=jwt_settings.JWT_ACCESS_TOKEN_TTL_MINUTES,
+        refresh_tokens=RefreshTokenRepository(db),
+        refresh_token_ttl_days=jwt_settings.JWT_REFRESH_TOKEN_TTL_DAYS,
+    )
+
+
+def get_refresh_use_case(
+    db: AsyncSession = Depends(get_async_db),
+    token_service: JwtTokenService = Depends(get_token_service),
+    uow: AsyncSqlAlchemyUnitOfWork = Depends(get_async_uow),
+) -> RefreshAccessTokenUseCase:
+    jwt_settings = get_container().settings.jwt
+    return RefreshAccessTokenUseCase(
+        repo=AsyncAdminUserRepository(db),
+        refresh_tokens=RefreshTokenRepository(db),
+        token_service=token_service,
+        uow=uow,
+        access_token_ttl_minutes=jwt_settings.JWT_ACCESS_TOKEN_TTL_MINUTES,
+        refresh_token_ttl_days=jwt_settings.JWT_REFRESH_TOKEN_TTL_DAYS,
+    )
+
+
+def get_logout_use_case(
+    db: AsyncSession = Depends(get_async_db),
+    token_service: JwtTokenService = Depends(get_token_service),
+    uow: AsyncSqlAlchemyUnitOfWork = Depends(get_async_uow),
+) -> LogoutUseCase:
+    return LogoutUseCase(
+        revoked_tokens=RevokedTokenRepository(db),
+        denylist=token_denylist,
+        refresh_tokens=RefreshTokenRepository(db),
+        token_service=token_service,
+        uow=uow,
+    )
+
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-def get_current_admin_id(
+# async on purpose: verification is pure CPU (and usually a cache hit), so running it on the
+# event loop avoids a threadpool hop per protected request
+async def get_current_admin_claims(
     token: str = Depends(oauth2_scheme),
-    settings: Settings = Depends(get_settings),
-) -> int:
-    token_service = JwtTokenService(secret_key=settings.jwt.JWT_SECRET_KEY, algorithm=settings.jwt.JWT_ALGORITHM)
+    token_service: JwtTokenService = Depends(get_token_service),
+) -> dict:
     try:
         payload = token_service.decode_access_token(token)
-        admin_id: int = payload.get("id")
-        if admin_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return admin_id
     except InvalidToken:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if payload.get("id") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # in-memory set lookup; cached claims are re-checked here, so logout applies immediately
+    if token_denylist.is_revoked(payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+async def get_current_admin_id(
+    payload: dict = Depends(get_current_admin_claims),
+) -> int:
+    return payload["id"]
 
 def get_admin_use_case(
     db: Session = Depends(get_db),
 ) -> GetAdminUseCase:
+    # the Session is lazy: in claims mode it is never checked out of the pool
+    if get_container().settings.jwt.JWT_IDENTITY_FROM_CLAIMS:
+        return GetAdminFromClaimsUseCase()
     repo = AdminUserRepository(db)
     return GetAdminUseCase(repo=repo)
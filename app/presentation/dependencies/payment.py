@@ -3,29 +3,40 @@ from __future__ import annotations
 from functools import lru_cache
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from infrastructure.config.settings import Settings, get_settings
-from infrastructure.database.session import get_db
-from infrastructure.database.repositories.payment import PaymentRepository
+from infrastructure.config.container import get_container
+from infrastructure.database.session import get_db, get_async_db
+from infrastructure.database.repositories.payment import PaymentRepository, AsyncPaymentRepository
+from infrastructure.database.repositories.notify_inbox import NotifyInboxRepository
+from infrastructure.database.unit_of_work import AsyncSqlAlchemyUnitOfWork, SqlAlchemyUnitOfWork
 
 from infrastructure.external.newebpay.client import NewebpayClient
 
 from domain.ports.payment_repository import IPaymentRepository
 from domain.ports.payment_gateway import PaymentGateway
+from domain.ports.order_number import OrderNumberGenerator
 
 from application.use_cases.payment import CreatePaymentUseCase
 from application.use_cases.payment import HandleNewebpayNotifyUseCase
+from application.use_cases.payment import AsyncCreatePaymentUseCase, AsyncHandleNewebpayNotifyUseCase, ListPaymentsUseCase
+from application.use_cases.notify_inbox import EnqueueNewebpayNotifyUseCase
+from presentation.dependencies.unit_of_work import get_async_uow, get_uow
+from presentation.tasks.notify_inbox import notify_inbox_workers
 from application.dtos.payment import MpgForm
 
 
 
 
 
-def get_payment_gateway(settings: Settings = Depends(get_settings)) -> NewebpayClient:
-    # gateway is stateless -> singleton is fine
-    return NewebpayClient(
-        settings=settings,
-    )
+def get_payment_gateway() -> NewebpayClient:
+    # gateway is stateless -> process-wide singleton built at startup
+    return get_container().payment_gateway
+
+
+def get_order_numbers() -> OrderNumberGenerator:
+    # one generator per process: its sequence is what keeps same-millisecond ids apart
+    return get_container().order_numbers
 
 
 # ---- request-scoped ----
@@ -33,16 +44,56 @@ def get_payment_repo(db: Session = Depends(get_db)) -> PaymentRepository:
     return PaymentRepository(db)
 
 
+def get_async_payment_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncPaymentRepository:
+    return AsyncPaymentRepository(db)
+
+
 # ---- use cases ----
 def get_create_payment_uc(
     repo: PaymentRepository = Depends(get_payment_repo),
     gw: PaymentGateway = Depends(get_payment_gateway),
+    uow: SqlAlchemyUnitOfWork = Depends(get_uow),
+    order_numbers: OrderNumberGenerator = Depends(get_order_numbers),
 ) -> CreatePaymentUseCase:
-    return CreatePaymentUseCase(repo=repo, gateway=gw)
+    return CreatePaymentUseCase(repo=repo, gateway=gw, uow=uow, order_numbers=order_numbers)
 
 
 def get_notify_uc(
     repo: PaymentRepository = Depends(get_payment_repo),
     gw: PaymentGateway = Depends(get_payment_gateway),
+    uow: SqlAlchemyUnitOfWork = Depends(get_uow),
 ) -> HandleNewebpayNotifyUseCase:
-    return HandleNewebpayNotifyUseCase(repo=repo, gateway=gw)
+    return HandleNewebpayNotifyUseCase(repo=repo, gateway=gw, uow=uow)
+
+
+def get_async_create_payment_uc(
+    repo: AsyncPaymentRepository = Depends(get_async_payment_repo),
+    gw: PaymentGateway = Depends(get_payment_gateway),
+    uow: AsyncSqlAlchemyUnitOfWork = Depends(get_async_uow),
+    order_numbers: OrderNumberGenerator = Depends(get_order_numbers),
+) -> AsyncCreatePaymentUseCase:
+    return AsyncCreatePaymentUseCase(repo=repo, gateway=gw, uow=uow, order_numbers=order_numbers)
+
+
+def get_async_notify_uc(
+    db: AsyncSession = Depends(get_async_db),
+    gw: PaymentGateway = Depends(get_payment_gateway),
+    uow: AsyncSqlAlchemyUnitOfWork = Depends(get_async_uow),
+) -> AsyncHandleNewebpayNotifyUseCase | EnqueueNewebpayNotifyUseCase:
+    inbox_settings = get_container().settings.notify_inbox
+    if inbox_settings.NOTIFY_INGEST_MODE == "inbox":
+        return EnqueueNewebpayNotifyUseCase(
+            inbox=NotifyInboxRepository(db),
+            gateway=gw,
+            uow=uow,
+            max_depth=inbox_settings.NOTIFY_INBOX_MAX_DEPTH,
+            current_depth=lambda: notify_inbox_workers.depth,
+        )
+    return AsyncHandleNewebpayNotifyUseCase(repo=AsyncPaymentRepository(db), gateway=gw, uow=uow)
+
+
+def get_list_payments_uc(
+    repo: AsyncPaymentRepository = Depends(get_async_payment_repo),
+) -> ListPaymentsUseCase:
+    return ListPaymentsUseCase(repo)
+
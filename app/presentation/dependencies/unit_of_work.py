@@ -0,0 +1,16 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.session import get_db, get_async_db
+from infrastructure.database.unit_of_work import AsyncSqlAlchemyUnitOfWork, SqlAlchemyUnitOfWork
+
+
+# FastAPI caches get_db / get_async_db per request, so the unit of work and every repository
+# built for the same request wrap one session
+def get_uow(db: Session = Depends(get_db)) -> SqlAlchemyUnitOfWork:
+    return SqlAlchemyUnitOfWork(db)
+
+
+def get_async_uow(db: AsyncSession = Depends(get_async_db)) -> AsyncSqlAlchemyUnitOfWork:
+    return AsyncSqlAlchemyUnitOfWork(db)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import inspect
+from types import ModuleType
+from typing import Iterable
+
+from application.use_cases import auth, expiry, notify_inbox, payment, reconciliation, reservation
+from infrastructure.observability.metrics import instrument_methods
+
+_USE_CASE_MODULES = (auth, expiry, notify_inbox, payment, reconciliation, reservation)
+
+
+def _use_cases(modules: Iterable[ModuleType]):
+    for module in modules:
+        for name, cls in vars(module).items():
+            if (
+                inspect.isclass(cls)
+                and cls.__module__ == module.__name__
+                and name.endswith("UseCase")
+                and "execute" in cls.__dict__
+            ):
+                yield cls
+
+
+def instrument_use_cases() -> None:
+    """
+    Time every use case's execute() as operation "<UseCase>.execute". Applied from main.py
+    rather than inside application/, which stays free of metrics code; idempotent.
+    """
+    for cls in _use_cases(_USE_CASE_MODULES):
+        instrument_methods("use_case", methods=("execute",))(cls)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import re
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.observability.structured_logging import log_scope
+
+_REQUEST_ID_HEADER = b"x-request-id"
+# accept the caller's id only if it is short and plain, so it is safe to log and echo
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _request_id(scope: Scope) -> str:
+    for name, value in scope.get("headers", ()):
+        if name == _REQUEST_ID_HEADER:
+            candidate = value.decode("latin-1")
+            if _VALID_REQUEST_ID.match(candidate):
+                return candidate
+            break
+    return uuid.uuid4().hex
+
+
+class LogContextMiddleware:
+    """
+    Pure ASGI. Opens a log scope per request carrying `request_id` (taken from X-Request-ID or
+    generated, and echoed back); handlers add MerchantOrderNo / TradeNo to the same scope.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        with log_scope(request_id=request_id):
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the response body was sent",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Responses by route and status code",
+    ["method", "route", "status"],
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests being handled",
+    multiprocess_mode="livesum",
+)
+
+_UNMATCHED = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI (no BaseHTTPMiddleware task/queue per request). Routes are labelled by their
+    template ("/admin/payments", not the concrete path), so label cardinality stays fixed;
+    requests no route matched share one label.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: Tuple[str, ...] = ("/metrics",)) -> None:
+        self.app = app
+        self.skip_paths = skip_paths
+        self._histograms: Dict[Tuple[str, str], object] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_PROGRESS.dec()
+            # the router stores the matched route in this same scope dict
+            route = scope.get("route")
+            key = (scope["method"], getattr(route, "path", _UNMATCHED))
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms.setdefault(key, HTTP_REQUEST_SECONDS.labels(*key))
+            histogram.observe(elapsed)
+            HTTP_REQUESTS.labels(key[0], key[1], str(status)).inc()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+from typing import Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.database.query_profiler import (
+    MAX_LOGGED_STATEMENT,
+    QueryProfile,
+    current_profile,
+    finish_profile,
+    start_profile,
+)
+
+logger = logging.getLogger(__name__)
+
+_UNMATCHED = "<unmatched>"
+
+
+def _debug_headers(profile: QueryProfile) -> dict:
+    headers = {
+        "X-DB-Statements": str(profile.statements),
+        "X-DB-Time-Ms": f"{profile.db_seconds * 1000:.2f}",
+    }
+    if profile.repeated:
+        headers["X-DB-Repeated-Statements"] = str(len(profile.repeated))
+    return headers
+
+
+class QueryProfileMiddleware:
+    """
+    Opens a QueryProfile per request for the engine listeners in
+    infrastructure/database/query_profiler.py. With `debug_headers` the statement count and
+    DB time go out as X-DB-* headers; they only cover work done before the response started.
+    """
+
+    def __init__(
+        self, app: ASGIApp, debug_headers: bool = False, skip_paths: Tuple[str, ...] = ("/metrics",)
+    ) -> None:
+        self.app = app
+        self.debug_headers = debug_headers
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        token = start_profile()
+        profile = current_profile()
+
+        async def send_wrapper(message: Message) -> None:
+            if self.debug_headers and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in _debug_headers(profile).items():
+                    headers.append(name, value)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish_profile(token)
+            route = getattr(scope.get("route"), "path", _UNMATCHED)
+            for shape in profile.repeated:
+                logger.warning(
+                    "possible N+1 in %s %s: statement executed %d times: %s",
+                    scope["method"], route, profile.shapes[shape], shape[:MAX_LOGGED_STATEMENT],
+                )
+            logger.debug(
+                "%s %s: %d statements, %.2f ms in the database",
+                scope["method"], route, profile.statements, profile.db_seconds * 1000,
+            )
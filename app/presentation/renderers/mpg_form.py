@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from html import escape
+from typing import Mapping
+
+# Static skeleton of the auto-submit page, split once at import around the two dynamic parts
+# (form action and hidden inputs); a render is then a handful of concatenations plus escaping.
+_SKELETON = (
+    "<!DOCTYPE html>\n"
+    "<html><body>\n"
+    '<form id="newebpay" method="post" action="{action}">\n'
+    "{inputs}"
+    '<noscript><button type="submit">Continue to Pay</button></noscript>\n'
+    "</form>\n"
+    '<script>document.getElementById("newebpay").submit();</script>\n'
+    "</body></html>\n"
+)
+_HEAD, _rest = _SKELETON.split("{action}")
+_AFTER_ACTION, _TAIL = _rest.split("{inputs}")
+_INPUT_OPEN = '<input type="hidden" name="'
+_INPUT_VALUE = '" value="'
+_INPUT_CLOSE = '"/>\n'
+
+
+def render_mpg_form_html(action_url: str, fields: Mapping[str, object]) -> str:
+    """Auto-submitting MPG form; the action and every field name and value are attribute-escaped."""
+    parts = [_HEAD, escape(action_url, quote=True), _AFTER_ACTION]
+    for name, value in fields.items():
+        parts += (
+            _INPUT_OPEN, escape(str(name), quote=True),
+            _INPUT_VALUE, escape("" if value is None else str(value), quote=True),
+            _INPUT_CLOSE,
+        )
+    parts.append(_TAIL)
+    return "".join(parts)
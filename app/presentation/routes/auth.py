@@ -1,29 +1,54 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from application.dtos.auth import GetAdminQuery, LoginCommand
-from application.use_cases.auth import LoginUseCase, GetAdminUseCase
-from presentation.controllers.auth import login_controller, get_admin_controller
-from presentation.schemas.auth import LoginRequest, TokenResponse, UserRead
-from presentation.dependencies.auth import get_login_use_case, get_current_admin_id, get_admin_use_case
+from application.dtos.auth import GetAdminQuery, LoginCommand, LogoutCommand, RefreshTokenCommand
+from application.use_cases.auth import AsyncLoginUseCase, GetAdminUseCase, LogoutUseCase, RefreshAccessTokenUseCase
+from presentation.controllers.auth import async_login_controller, get_admin_controller, logout_controller, refresh_token_controller
+from presentation.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, TokenResponse, UserRead
+from presentation.dependencies.auth import (
+    get_async_login_use_case, get_current_admin_claims, get_admin_use_case, get_logout_use_case, get_refresh_use_case,
+)
 
 
 router = APIRouter(tags=["auth"])
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     form: OAuth2PasswordRequestForm = Depends(),
-    uc: LoginUseCase = Depends(get_login_use_case),
+    uc: AsyncLoginUseCase = Depends(get_async_login_use_case),
 ) -> TokenResponse:
+    # bcrypt runs on the container's bounded hasher pool, not on the event loop or the sync threadpool
     cmd = LoginCommand(username=form.username, password=form.password)
-    return login_controller(cmd, uc)
+    return await async_login_controller(cmd, uc)
+
+@router.post("/token/refresh", response_model=TokenResponse)
+async def refresh_token(
+    body: RefreshRequest,
+    uc: RefreshAccessTokenUseCase = Depends(get_refresh_use_case),
+) -> TokenResponse:
+    # rotates the refresh token; long admin sessions never repeat the bcrypt login
+    cmd = RefreshTokenCommand(refresh_token=body.refresh_token)
+    return await refresh_token_controller(cmd, uc)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: LogoutRequest | None = None,
+    payload: dict = Depends(get_current_admin_claims),
+    uc: LogoutUseCase = Depends(get_logout_use_case),
+) -> None:
+    cmd = LogoutCommand(
+        access_jti=payload.get("jti"),
+        access_expires_at=payload.get("exp"),
+        refresh_token=body.refresh_token if body else None,
+    )
+    await logout_controller(cmd, uc)
 
 @router.get("/me", response_model=UserRead)
 def read_current_user(
-    payload: int = Depends(get_current_admin_id),
+    payload: dict = Depends(get_current_admin_claims),
     uc: GetAdminUseCase = Depends(get_admin_use_case),
 ) -> UserRead:
-    cmd = GetAdminQuery(id=payload)
+    cmd = GetAdminQuery(id=payload["id"], username=payload.get("sub"))
     return get_admin_controller(cmd, uc)
 
@@ -1,33 +1,56 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Request
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse, PlainTextResponse, JSONResponse
 
 from presentation.schemas.payment import PayerInfo as PayerInfoSchema
 from domain.value_objects.payer_info import PayerInfo as PayerInfoEntity
 from domain.value_objects.reservation_info import ReservationInfo as ReservationInfoEntity
 from presentation.schemas.payment import ReservationInfo as ReservationInfoSchema
-from application.use_cases.payment import CreatePaymentCommand, CreatePaymentUseCase
-from application.use_cases.payment import HandleNewebpayNotifyUseCase
-from presentation.schemas.payment import CreatePaymentIn, NewebpayNotify
+from application.use_cases.payment import CreatePaymentCommand
+from application.use_cases.payment import AsyncCreatePaymentUseCase, AsyncHandleNewebpayNotifyUseCase, ListPaymentsUseCase
+from application.dtos.payment import PaymentListQuery
+from domain.enums.payment import PaymentStatus
+from application.use_cases.notify_inbox import EnqueueNewebpayNotifyUseCase
+from presentation.schemas.payment import CreatePaymentIn, MpgFormOut, NewebpayNotify, PaymentListOut
 from presentation.controllers.payment import (
     create_payment_controller,
+    decode_payment_cursor,
     handle_newebpay_notify_controller,
+    list_payments_controller,
 )
 
+from presentation.dependencies.auth import get_current_admin_id
 from presentation.dependencies.payment import (
-    get_create_payment_uc,
-    get_notify_uc,
+    get_async_create_payment_uc,
+    get_async_notify_uc,
+    get_list_payments_uc,
 )
 
 router = APIRouter(tags=["payments"])
+logger = logging.getLogger(__name__)
+
+
 
+def _wants_json(request: Request) -> bool:
+    # browsers posting the checkout form send text/html first; the SPA asks for application/json
+    accept = request.headers.get("accept", "")
+    return "application/json" in accept and "text/html" not in accept
 
 
-@router.post("/payment/checkout", response_class=HTMLResponse)
-def create_mpg_payment(
+@router.post(
+    "/payment/checkout",
+    response_class=HTMLResponse,
+    responses={200: {"model": MpgFormOut, "description": "auto-submit HTML, or the form as JSON with Accept: application/json"}},
+)
+async def create_mpg_payment(
     payload: CreatePaymentIn,
-    uc: CreatePaymentUseCase = Depends(get_create_payment_uc)) -> HTMLResponse:
+    request: Request,
+    uc: AsyncCreatePaymentUseCase = Depends(get_async_create_payment_uc)) -> HTMLResponse:
     cmd = CreatePaymentCommand(
             reservation_info=ReservationInfoEntity(id=payload.reservation_info.id, players=payload.reservation_info.players),
             payer_info=PayerInfoEntity(name=payload.payer_info.name, email=payload.payer_info.email, phone=payload.payer_info.phone),
@@ -39,7 +62,7 @@ def create_mpg_payment(
             client_back_url=payload.client_back_url,
             enable_payments=payload.enable_payments,
         )
-    return create_payment_controller(cmd, uc)
+    return await create_payment_controller(cmd, uc, as_json=_wants_json(request))
     
 
 
@@ -47,10 +70,14 @@ def create_mpg_payment(
 @router.post("/newebpay/notify", response_class=PlainTextResponse)
 async def newebpay_notify(
     request: Request,
-    uc: HandleNewebpayNotifyUseCase = Depends(get_notify_uc)) -> PlainTextResponse:
+    uc: AsyncHandleNewebpayNotifyUseCase | EnqueueNewebpayNotifyUseCase = Depends(get_async_notify_uc)) -> PlainTextResponse:
     # Newebpay posts form-data
     notify = await request.form()
-    print("Received newebpay notify:", notify)
+    # TradeInfo / TradeSha stay out of the log; the ids are bound once TradeInfo is decrypted
+    logger.info(
+        "newebpay notify received",
+        extra={"notify_status": notify.get("Status", ""), "merchant_id": notify.get("MerchantID", "")},
+    )
     cmd = NewebpayNotify(
         status=notify.get("Status", ""),
         merchant_id=notify.get("MerchantID", ""),
@@ -58,7 +85,32 @@ async def newebpay_notify(
         trade_info_hex=notify.get("TradeInfo", ""),
         trade_sha=notify.get("TradeSha", ""),
     )
-    return handle_newebpay_notify_controller(cmd, uc)    
+    return await handle_newebpay_notify_controller(cmd, uc)    
+
+
+
+@router.get("/admin/payments", response_model=PaymentListOut)
+async def list_payments(
+    status: Optional[List[PaymentStatus]] = Query(default=None),
+    reservation_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    payer_email: Optional[str] = Query(default=None, max_length=100),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=ListPaymentsUseCase.MAX_LIMIT),
+    admin_id: int = Depends(get_current_admin_id),
+    uc: ListPaymentsUseCase = Depends(get_list_payments_uc),
+) -> PaymentListOut:
+    query = PaymentListQuery(
+        statuses=status,
+        reservation_id=reservation_id,
+        created_from=created_from,
+        created_before=created_before,
+        payer_email=payer_email,
+        after=decode_payment_cursor(cursor),
+        limit=limit,
+    )
+    return await list_payments_controller(query, uc)
 
 
 
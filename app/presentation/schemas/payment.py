@@ -1,12 +1,13 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Optional, Any
+from datetime import datetime
+from typing import Dict, List, Optional, Any
 from domain.value_objects.payer_info import PayerInfo
 from domain.value_objects.reservation_info import ReservationInfo
 
 
 
 class ReservationInfo(BaseModel):
-    id: str
+    id: int
     players: list[str]
 
 class PayerInfo(BaseModel):
@@ -27,6 +28,11 @@ class CreatePaymentIn(BaseModel):
     client_back_url: Optional[str] = None
     enable_payments: Optional[Dict[str, int]] = None
 
+class MpgFormOut(BaseModel):
+    """JSON checkout response: the client posts `fields` to `action_url` as a form itself."""
+    action_url: str
+    fields: Dict[str, str]
+
 class NewebpayNotify(BaseModel):
     status: str
     merchant_id: str
@@ -39,4 +45,25 @@ class NewebpayNotify(BaseModel):
 class HandleNotifyResult(BaseModel):
     ok: bool
     merchant_order_no: Optional[str] = None
-    new_status: Optional[str] = None
\ No newline at end of file
+    new_status: Optional[str] = None
+
+
+class PaymentOut(BaseModel):
+    id: str
+    reservation_id: str
+    payer_name: str
+    payer_email: str
+    payer_phone: str
+    amount_twd: int
+    status: str
+    merchant_order_no: Optional[str] = None
+    trade_no: Optional[str] = None
+    payment_type: Optional[str] = None
+    pay_time: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+class PaymentListOut(BaseModel):
+    items: List[PaymentOut]
+    next_cursor: Optional[str] = None   # pass back as ?cursor= for the next page
+
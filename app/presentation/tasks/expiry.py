@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from prometheus_client import Counter, Histogram
+
+from application.dtos.expiry import ExpireCommand, ExpireResult
+from application.use_cases.expiry import ExpireStaleRecordsUseCase
+from infrastructure.config.container import get_container
+from infrastructure.database.repositories.expiry import ExpiryRepository
+from infrastructure.database.session import AsyncSessionLocal
+from infrastructure.database.unit_of_work import AsyncSqlAlchemyUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_ROWS = Counter("expiry_rows_total", "Rows moved to a terminal status by the expiry sweep", ["kind"])
+EXPIRY_DURATION = Histogram(
+    "expiry_run_seconds",
+    "Duration of one expiry sweep",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+
+async def run_expiry(
+    pending_older_than: Optional[timedelta] = None,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> ExpireResult:
+    """
+    One sweep. No advisory lock needed: every batch skips rows another worker has locked,
+    so concurrent sweeps on several workers split the work instead of blocking each other.
+    """
+    es = get_container().settings.expiry
+    cmd = ExpireCommand(
+        pending_older_than=pending_older_than or timedelta(minutes=es.EXPIRY_PENDING_PAYMENT_MINUTES),
+        batch_size=batch_size or es.EXPIRY_BATCH_SIZE,
+        max_batches=max_batches if max_batches is not None else es.EXPIRY_MAX_BATCHES,
+    )
+    async with AsyncSessionLocal() as db:
+        result = await ExpireStaleRecordsUseCase(ExpiryRepository(db), AsyncSqlAlchemyUnitOfWork(db)).execute(cmd)
+
+    EXPIRY_ROWS.labels("payment").inc(result.payments_canceled)
+    EXPIRY_ROWS.labels("reservation").inc(result.reservations_expired)
+    EXPIRY_DURATION.observe(result.elapsed_seconds)
+    return result
+
+
+async def expiry_loop(interval_seconds: int) -> None:
+    """Background task started from the app lifespan when EXPIRY_INTERVAL_SECONDS > 0."""
+    while True:
+        try:
+            result = await run_expiry()
+            if result.payments_canceled or result.reservations_expired:
+                logger.info(
+                    "expiry payments_canceled=%d reservations_expired=%d elapsed=%.3fs",
+                    result.payments_canceled, result.reservations_expired, result.elapsed_seconds,
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("expiry sweep failed")
+        await asyncio.sleep(interval_seconds)
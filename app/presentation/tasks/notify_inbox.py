@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+from typing import List
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from application.dtos.payment import HandleNotifyResult, NewebpayNotify
+from application.use_cases.notify_inbox import DrainNotifyInboxUseCase
+from application.use_cases.payment import AsyncHandleNewebpayNotifyUseCase
+from infrastructure.config.container import get_container
+from infrastructure.config.settings import NotifyInboxSettings
+from infrastructure.database.repositories.notify_inbox import NotifyInboxRepository
+from infrastructure.database.repositories.payment import AsyncPaymentRepository
+from infrastructure.database.session import AsyncSessionLocal
+from infrastructure.database.unit_of_work import AsyncSqlAlchemyUnitOfWork
+from infrastructure.observability.structured_logging import log_scope
+
+logger = logging.getLogger(__name__)
+
+INBOX_DEPTH = Gauge("notify_inbox_depth", "Unprocessed callbacks in the notify inbox", multiprocess_mode="livemax")
+INBOX_PROCESSED = Counter("notify_inbox_processed_total", "Inbox callbacks processed", ["outcome"])
+INBOX_LAG = Histogram(
+    "notify_inbox_lag_seconds",
+    "Time from receiving a callback to finishing its processing",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900),
+)
+
+
+class _ScopedNotifyHandler:
+    """One log scope per inbox item, the worker-side equivalent of a callback request."""
+
+    def __init__(self, inner: AsyncHandleNewebpayNotifyUseCase) -> None:
+        self.inner = inner
+
+    async def execute(self, cmd: NewebpayNotify) -> HandleNotifyResult:
+        with log_scope(source="notify_inbox"):
+            return await self.inner.execute(cmd)
+
+
+class NotifyInboxWorkers:
+    """Per-process pool of asyncio tasks draining the notify inbox; started from the app lifespan."""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, settings: NotifyInboxSettings) -> None:
+        self._tasks.append(asyncio.create_task(self._track_depth(settings)))
+        for _ in range(settings.NOTIFY_INBOX_WORKERS):
+            self._tasks.append(asyncio.create_task(self._drain(settings)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+
+    async def _track_depth(self, settings: NotifyInboxSettings) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    self.depth = await NotifyInboxRepository(db).depth()
+                INBOX_DEPTH.set(self.depth)
+            except Exception:
+                logger.exception("notify inbox depth check failed")
+            await asyncio.sleep(settings.NOTIFY_INBOX_POLL_SECONDS)
+
+    async def _drain(self, settings: NotifyInboxSettings) -> None:
+        while True:
+            processed = 0
+            try:
+                async with AsyncSessionLocal() as db:
+                    uc = DrainNotifyInboxUseCase(
+                        inbox=NotifyInboxRepository(db),
+                        handler=_ScopedNotifyHandler(AsyncHandleNewebpayNotifyUseCase(
+                            repo=AsyncPaymentRepository(db),
+                            gateway=get_container().payment_gateway,
+                            uow=AsyncSqlAlchemyUnitOfWork(db),
+                        )),
+                        uow=AsyncSqlAlchemyUnitOfWork(db),
+                        lease_seconds=settings.NOTIFY_INBOX_LEASE_SECONDS,
+                        max_attempts=settings.NOTIFY_INBOX_MAX_ATTEMPTS,
+                    )
+                    result = await uc.execute(settings.NOTIFY_INBOX_BATCH_SIZE)
+                processed = result.processed + result.failed
+                INBOX_PROCESSED.labels("ok").inc(result.processed)
+                INBOX_PROCESSED.labels("error").inc(result.failed)
+                for lag in result.lags_seconds:
+                    INBOX_LAG.observe(lag)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("notify inbox drain failed")
+            if not processed:
+                await asyncio.sleep(settings.NOTIFY_INBOX_POLL_SECONDS)
+
+
+notify_inbox_workers = NotifyInboxWorkers()
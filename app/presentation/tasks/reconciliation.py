@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import text
+
+from application.dtos.reconciliation import ReconcileCommand, ReconcileResult
+from application.use_cases.reconciliation import ReconcilePendingPaymentsUseCase
+from infrastructure.config.container import get_container
+from infrastructure.database.repositories.payment import AsyncPaymentRepository
+from infrastructure.database.session import AsyncSessionLocal, async_engine
+from infrastructure.database.unit_of_work import AsyncSqlAlchemyUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+# one reconciliation run at a time across all workers / hosts sharing the database
+_ADVISORY_LOCK_KEY = 0x4C494C01
+
+RECONCILE_CHECKED = Counter("reconcile_payments_checked_total", "Payments re-checked with QueryTradeInfo")
+RECONCILE_UPDATED = Counter("reconcile_payments_updated_total", "Payments whose status changed after re-checking")
+RECONCILE_ERRORS = Counter(
+    "reconcile_query_errors_total", "QueryTradeInfo calls that failed or returned an answer that did not verify",
+)
+RECONCILE_THROUGHPUT = Gauge(
+    "reconcile_orders_per_second", "Throughput of the last reconciliation run", multiprocess_mode="mostrecent",
+)
+RECONCILE_LAG = Histogram(
+    "reconcile_payment_lag_seconds",
+    "Age of a PENDING payment when reconciliation queried it",
+    buckets=(60, 300, 900, 1800, 3600, 3 * 3600, 6 * 3600, 12 * 3600, 86400, 3 * 86400, 7 * 86400),
+)
+
+
+async def run_reconciliation(
+    older_than: Optional[timedelta] = None,
+    max_payments: Optional[int] = None,
+) -> Optional[ReconcileResult]:
+    """One reconciliation pass. Returns None if another process is already running one."""
+    container = get_container()
+    rs = container.settings.reconciliation
+    if older_than is None:
+        older_than = timedelta(minutes=rs.RECONCILE_MIN_AGE_MINUTES)
+
+    # session-level lock on its own AUTOCOMMIT connection: held across the run without leaving
+    # the connection idle in a transaction
+    async with async_engine.connect() as conn:
+        lock_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        locked = await lock_conn.scalar(text("SELECT pg_try_advisory_lock(:k)"), {"k": _ADVISORY_LOCK_KEY})
+        if not locked:
+            return None
+        try:
+            async with AsyncSessionLocal() as db:
+                uc = ReconcilePendingPaymentsUseCase(
+                    repo=AsyncPaymentRepository(db),
+                    gateway=container.payment_gateway,
+                    uow=AsyncSqlAlchemyUnitOfWork(db),
+                    concurrency=rs.RECONCILE_CONCURRENCY,
+                    rate_per_second=rs.RECONCILE_RATE_PER_SECOND,
+                )
+                result = await uc.execute(ReconcileCommand(
+                    older_than=older_than,
+                    batch_size=rs.RECONCILE_BATCH_SIZE,
+                    max_payments=max_payments,
+                ))
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _ADVISORY_LOCK_KEY})
+
+    RECONCILE_CHECKED.inc(result.checked)
+    RECONCILE_UPDATED.inc(result.updated)
+    RECONCILE_ERRORS.inc(result.errors)
+    RECONCILE_THROUGHPUT.set(result.orders_per_second)
+    for lag in result.lags_seconds:
+        RECONCILE_LAG.observe(lag)
+    return result
+
+
+async def reconciliation_loop(interval_seconds: int) -> None:
+    """Background task started from the app lifespan when RECONCILE_INTERVAL_SECONDS > 0."""
+    while True:
+        try:
+            result = await run_reconciliation()
+            if result is not None and result.checked:
+                logger.info(
+                    "reconciliation checked=%d updated=%d errors=%d rate=%.1f/s lag_p95=%.0fs",
+                    result.checked, result.updated, result.errors,
+                    result.orders_per_second, result.lag_p95_seconds or 0,
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("reconciliation run failed")
+        await asyncio.sleep(interval_seconds)
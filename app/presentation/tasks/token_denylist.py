@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from prometheus_client import Gauge
+
+from infrastructure.database.repositories.auth_token import RevokedTokenRepository
+from infrastructure.database.session import AsyncSessionLocal
+from infrastructure.database.unit_of_work import AsyncSqlAlchemyUnitOfWork
+from infrastructure.external.security.token_denylist import InMemoryTokenDenylist
+
+logger = logging.getLogger(__name__)
+
+# revoked_at is the inserting transaction's now(); re-read a window so late commits are not missed
+_SYNC_OVERLAP = timedelta(seconds=60)
+
+DENYLIST_SIZE = Gauge(
+    "token_denylist_size", "Revoked, unexpired access tokens held in memory", multiprocess_mode="livemax",
+)
+
+# per process, outlives container reloads: requests check it without touching the database
+token_denylist = InMemoryTokenDenylist()
+
+
+async def sync_token_denylist() -> int:
+    since = token_denylist.synced_until
+    async with AsyncSessionLocal() as db:
+        rows = await RevokedTokenRepository(db).list_revoked_since(since - _SYNC_OVERLAP if since else None)
+    added = token_denylist.merge(rows)
+    token_denylist.prune()
+    DENYLIST_SIZE.set(len(token_denylist))
+    return added
+
+
+async def prune_revoked_tokens() -> int:
+    async with AsyncSessionLocal() as db, AsyncSqlAlchemyUnitOfWork(db) as uow:
+        pruned = await RevokedTokenRepository(db).prune(datetime.now(timezone.utc))
+        await uow.commit()
+    return pruned
+
+
+async def token_denylist_loop(interval_seconds: float) -> None:
+    """First pass loads the full list; later passes only fetch newly revoked jtis."""
+    ticks = 0
+    while True:
+        try:
+            await sync_token_denylist()
+            ticks += 1
+            if ticks % 120 == 0:
+                await prune_revoked_tokens()
+        except Exception:
+            logger.exception("token denylist sync failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# modules import each other as top-level packages (domain, application, infrastructure, ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
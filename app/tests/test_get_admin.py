@@ -0,0 +1,28 @@
+import pytest
+from fastapi import HTTPException
+
+from application.dtos.auth import GetAdminQuery
+from application.use_cases.auth import GetAdminFromClaimsUseCase, GetAdminUseCase
+from presentation.controllers.auth import get_admin_controller
+
+
+class EmptyAdminRepo:
+    def get_by_id(self, user_id):
+        return None
+
+
+def test_claims_without_sub_are_unauthorized():
+    with pytest.raises(HTTPException) as exc:
+        get_admin_controller(GetAdminQuery(id=1), GetAdminFromClaimsUseCase())
+    assert exc.value.status_code == 401
+
+
+def test_deleted_admin_is_not_found():
+    with pytest.raises(HTTPException) as exc:
+        get_admin_controller(GetAdminQuery(id=1, username="admin"), GetAdminUseCase(repo=EmptyAdminRepo()))
+    assert exc.value.status_code == 404
+
+
+def test_claims_identity_is_returned():
+    user = get_admin_controller(GetAdminQuery(id=1, username="admin"), GetAdminFromClaimsUseCase())
+    assert (user.id, user.username) == (1, "admin")
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+from application.dtos.payment import NewebpayNotify
+from infrastructure.external.newebpay.client import NewebpayClient
+
+SETTINGS = SimpleNamespace(
+    newebpay_secrets=SimpleNamespace(MERCHANT_ID="MS123", HASH_KEY="k" * 32, HASH_IV="i" * 16),
+    newebpay_endpoints=None,
+    newebpay_http=None,
+)
+
+
+def _notify(client, order_no, tampered=False):
+    trade_info_hex = client.crypto.encrypt_hex(
+        f"Status=SUCCESS&MerchantID=MS123&Amt=100&TradeNo=T{order_no}&MerchantOrderNo={order_no}".encode()
+    )
+    trade_sha = "0" * 64 if tampered else client.crypto.sign(trade_info_hex)
+    return NewebpayNotify(
+        status="SUCCESS", merchant_id="MS123", version="2.3",
+        trade_info_hex=trade_info_hex, trade_sha=trade_sha, result=None,
+    )
+
+
+def test_batch_keeps_order_and_reports_bad_items():
+    client = NewebpayClient(SETTINGS)
+    forms = [_notify(client, f"ORD{i}", tampered=(i == 3)) for i in range(10)]
+    items = list(client.parse_and_verify_notify_batch(forms, chunk_size=3, max_workers=2))
+    assert [item.index for item in items] == list(range(10))
+    assert items[3].notify is None and "TradeSha" in items[3].error
+    assert [item.notify.result.merchant_order_no for item in items if item.notify] == [
+        f"ORD{i}" for i in range(10) if i != 3
+    ]
+
+
+def test_batch_reads_input_lazily():
+    client = NewebpayClient(SETTINGS)
+    pulled = []
+
+    def forms():
+        for i in range(1_000):
+            pulled.append(i)
+            yield _notify(client, f"ORD{i}")
+
+    batch = client.parse_and_verify_notify_batch(forms(), chunk_size=4, max_workers=1, max_in_flight=2)
+    next(batch)
+    assert len(pulled) <= 4 * 2
+    batch.close()
+
+
+def test_batch_rejects_empty_window():
+    client = NewebpayClient(SETTINGS)
+    with pytest.raises(ValueError):
+        next(client.parse_and_verify_notify_batch([], max_in_flight=0))
@@ -0,0 +1,78 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from application.dtos.payment import NewebpayNotify
+from application.use_cases.notify_inbox import EnqueueNewebpayNotifyUseCase
+from domain.exceptions.payment import NotifyInboxFull
+from infrastructure.external.newebpay.client import NewebpayClient
+from presentation.controllers.payment import handle_newebpay_notify_controller
+
+SETTINGS = SimpleNamespace(
+    newebpay_secrets=SimpleNamespace(MERCHANT_ID="MS123", HASH_KEY="k" * 32, HASH_IV="i" * 16),
+    newebpay_endpoints=None,
+    newebpay_http=None,
+)
+
+
+class MemoryInbox:
+    def __init__(self):
+        self.items = []
+
+    async def enqueue(self, notify):
+        self.items.append(notify)
+
+
+class NullUnitOfWork:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+    async def commit(self):
+        pass
+
+
+def _callback(client, forged=False):
+    trade_info_hex = client.crypto.encrypt_hex(b"Status=SUCCESS&MerchantID=MS123&Amt=100&MerchantOrderNo=ORD1")
+    return NewebpayNotify(
+        status="SUCCESS", merchant_id="MS123", version="2.3", trade_info_hex=trade_info_hex,
+        trade_sha="0" * 64 if forged else client.crypto.sign(trade_info_hex), result=None,
+    )
+
+
+def _use_case(inbox, max_depth=10):
+    return EnqueueNewebpayNotifyUseCase(
+        inbox=inbox, gateway=NewebpayClient(SETTINGS), uow=NullUnitOfWork(),
+        max_depth=max_depth, current_depth=lambda: len(inbox.items),
+    )
+
+
+def test_signed_callback_is_enqueued():
+    inbox = MemoryInbox()
+    callback = _callback(NewebpayClient(SETTINGS))
+    asyncio.run(_use_case(inbox).execute(callback))
+    assert inbox.items == [callback]
+
+
+def test_forged_callback_is_not_enqueued():
+    inbox = MemoryInbox()
+    forged = _callback(NewebpayClient(SETTINGS), forged=True)
+    response = asyncio.run(handle_newebpay_notify_controller(forged, _use_case(inbox)))
+    # answered like the inline path does for a bad TradeSha, and never stored
+    assert (response.status_code, response.body) == (200, b"OK")
+    assert inbox.items == []
+
+
+def test_forged_callbacks_do_not_fill_the_inbox():
+    inbox = MemoryInbox()
+    client = NewebpayClient(SETTINGS)
+    use_case = _use_case(inbox, max_depth=1)
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            asyncio.run(use_case.execute(_callback(client, forged=True)))
+    asyncio.run(use_case.execute(_callback(client)))
+    with pytest.raises(NotifyInboxFull):
+        asyncio.run(use_case.execute(_callback(client)))
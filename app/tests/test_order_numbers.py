@@ -0,0 +1,70 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from infrastructure.external.newebpay import order_number
+from infrastructure.external.newebpay.order_number import MAX_SEQUENCE, SnowflakeOrderNumberGenerator
+
+
+class SteppingClock:
+    """Wall clock in ms that mostly moves forward but jumps back now and then (NTP steps)."""
+
+    def __init__(self, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.now = 10_000_000
+
+    def __call__(self) -> int:
+        r = self.rng.random()
+        if r < 0.05:
+            self.now -= self.rng.randint(1, 2_000)
+        elif r < 0.5:
+            self.now += self.rng.randint(0, 3)
+        return self.now
+
+
+@pytest.fixture
+def fresh_clock(monkeypatch):
+    clock = order_number._ProcessClock()
+    monkeypatch.setattr(order_number, "_clock", clock)
+    return clock
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_instances_share_one_sequence_across_clock_steps(monkeypatch, fresh_clock, seed):
+    monkeypatch.setattr(order_number, "_now_ms", SteppingClock(seed))
+    # same node and pid, as an old and a reloaded container would have
+    a = SnowflakeOrderNumberGenerator(node_id=5)
+    b = SnowflakeOrderNumberGenerator(node_id=5)
+    ids = [(a if i % 3 else b).next_order_no() for i in range(50_000)]
+    assert len(set(ids)) == len(ids)
+    # time + sequence never goes backwards, so string order is issue order
+    assert ids == sorted(ids)
+    assert all(len(i) == a.length for i in ids)
+
+
+def test_frozen_clock_borrows_next_millisecond(monkeypatch, fresh_clock):
+    monkeypatch.setattr(order_number, "_now_ms", lambda: 42)
+    gen = SnowflakeOrderNumberGenerator(node_id=1)
+    ids = [gen.next_order_no() for _ in range(3 * (MAX_SEQUENCE + 1))]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+
+def _generate(n: int) -> list:
+    gen = SnowflakeOrderNumberGenerator(node_id=7)
+    return [gen.next_order_no() for _ in range(n)]
+
+
+def test_processes_on_one_node_do_not_collide():
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        batches = list(pool.map(_generate, [20_000] * 3))
+    ids = [i for batch in batches for i in batch]
+    assert len(set(ids)) == len(ids)
+
+
+def test_rejects_out_of_range_node_and_long_prefix():
+    with pytest.raises(ValueError):
+        SnowflakeOrderNumberGenerator(node_id=order_number.MAX_NODE_ID + 1)
+    with pytest.raises(ValueError):
+        SnowflakeOrderNumberGenerator(node_id=0, prefix="X" * 12)
@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from application.dtos.payment import TransitionOutcome
+from application.dtos.reconciliation import ReconcileCommand
+from application.use_cases.reconciliation import ReconcilePendingPaymentsUseCase
+from domain.entities.payment import Payment
+from domain.enums.payment import PaymentMethod, PaymentProvider, PaymentStatus
+from domain.value_objects.payer_info import PayerInfo
+from domain.value_objects.reservation_info import ReservationInfo
+from infrastructure.external.newebpay.client import NewebpayClient
+
+SETTINGS = SimpleNamespace(
+    newebpay_secrets=SimpleNamespace(MERCHANT_ID="MS123", HASH_KEY="k" * 32, HASH_IV="i" * 16),
+    newebpay_endpoints=None,
+    newebpay_http=None,
+)
+
+
+class CannedGateway(NewebpayClient):
+    def __init__(self, result):
+        super().__init__(SETTINGS)
+        self.result = result
+
+    async def query_trade_info(self, merchant_order_no, amount_twd):
+        return {"Status": "SUCCESS", "Message": "", "Result": dict(self.result)}
+
+
+class MemoryRepo:
+    def __init__(self, payments):
+        self.payments = payments
+        self.transitions = []
+
+    async def list_pending_before(self, cutoff, after_id, limit):
+        return [] if after_id else self.payments[:limit]
+
+    async def apply_transition(self, t):
+        self.transitions.append(t)
+        return TransitionOutcome(found=True, applied=True, status=t.to_status)
+
+
+class NullUnitOfWork:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+    async def commit(self):
+        pass
+
+
+def _pending_payment():
+    return Payment(
+        id="ORD1",
+        reservation_info=ReservationInfo(id=1, players=[]),
+        payer_info=PayerInfo(name="", email="", phone=""),
+        amount_twd=500,
+        status=PaymentStatus.PENDING,
+        payment_provider=PaymentProvider.NEWEBPAY,
+        merchant_order_no="ORD1",
+        trade_no="",
+        payment_type=PaymentMethod.CREDIT_CARD,
+        pay_time=None,
+        created_at=datetime.now() - timedelta(hours=1),
+    )
+
+
+def _paid_result(**overrides):
+    result = {
+        "MerchantID": "MS123", "Amt": 500, "TradeNo": "T1", "MerchantOrderNo": "ORD1",
+        "TradeStatus": "1", "PaymentType": "CREDIT", "PayTime": "2026-01-01 00:00:00",
+    }
+    result.update(overrides)
+    # signed after the overrides: a genuine Newebpay answer, just not about this payment
+    result.setdefault("CheckCode", NewebpayClient(SETTINGS).create_check_code(result))
+    return result
+
+
+def _reconcile(result):
+    payment = _pending_payment()
+    repo = MemoryRepo([payment])
+    use_case = ReconcilePendingPaymentsUseCase(repo, CannedGateway(result), NullUnitOfWork(), rate_per_second=0)
+    outcome = asyncio.run(use_case.execute(ReconcileCommand(older_than=timedelta(minutes=5))))
+    return payment, repo, outcome
+
+
+def test_verified_result_marks_payment_paid():
+    _, repo, outcome = _reconcile(_paid_result())
+    [transition] = repo.transitions
+    assert (transition.payment_id, transition.to_status, transition.trade_no) == ("ORD1", PaymentStatus.PAID, "T1")
+    assert PaymentStatus.FAILED in transition.from_statuses
+    assert (outcome.updated, outcome.errors) == (1, 0)
+
+
+@pytest.mark.parametrize("trade_status, to_status", [
+    ("2", PaymentStatus.FAILED),
+    ("3", PaymentStatus.CANCELED),
+])
+def test_unpaid_outcomes_never_overwrite_paid(trade_status, to_status):
+    _, repo, _ = _reconcile(_paid_result(TradeStatus=trade_status))
+    [transition] = repo.transitions
+    assert transition.to_status == to_status
+    assert PaymentStatus.PAID not in transition.from_statuses
+
+
+def test_ledger_key_differs_per_trade_status():
+    # CheckCode does not cover TradeStatus: a FAILED answer must not claim the key a later PAID one needs
+    keys = {_reconcile(_paid_result(TradeStatus=s))[1].transitions[0].notify_key for s in ("1", "2", "3")}
+    assert len(keys) == 3 and all(len(k) == 64 for k in keys)
+
+
+def test_query_failure_is_logged_and_counted(caplog):
+    class FailingGateway(CannedGateway):
+        async def query_trade_info(self, merchant_order_no, amount_twd):
+            raise TimeoutError("gateway timed out")
+
+    repo = MemoryRepo([_pending_payment()])
+    use_case = ReconcilePendingPaymentsUseCase(repo, FailingGateway({}), NullUnitOfWork(), rate_per_second=0)
+    outcome = asyncio.run(use_case.execute(ReconcileCommand(older_than=timedelta(minutes=5))))
+    assert (outcome.updated, outcome.errors, repo.transitions) == (0, 1, [])
+    assert "MerchantOrderNo=ORD1" in caplog.text and "gateway timed out" in caplog.text
+
+
+def _other_merchant_result():
+    # correctly signed by another merchant for an order with the same number
+    other = SimpleNamespace(**{**vars(SETTINGS), "newebpay_secrets": SimpleNamespace(
+        MERCHANT_ID="MS999", HASH_KEY="k" * 32, HASH_IV="i" * 16,
+    )})
+    result = _paid_result(MerchantID="MS999")
+    result["CheckCode"] = NewebpayClient(other).create_check_code(result)
+    return result
+
+
+@pytest.mark.parametrize("result", [
+    _paid_result(CheckCode="0" * 64),
+    _paid_result(CheckCode=""),
+    _paid_result(Amt=1),
+    _paid_result(MerchantOrderNo="ORD2"),
+    _other_merchant_result(),
+], ids=["bad-check-code", "no-check-code", "amount", "order-no", "other-merchant"])
+def test_unverified_or_mismatched_result_is_not_applied(caplog, result):
+    _, repo, outcome = _reconcile(result)
+    assert repo.transitions == []
+    assert (outcome.updated, outcome.errors) == (0, 1)
+    assert "QueryTradeInfo result rejected" in caplog.text
@@ -0,0 +1,76 @@
+"""
+Checkout response building: the old per-request f-string page (unescaped) vs. the
+pre-split, escaping renderer vs. the JSON mode, each including the Starlette response
+object the route returns. Fields are shaped like a real MPG request (TradeInfo is ~600 hex
+chars). Prints the per-call cost and what share of one core it takes at a given checkout rate.
+
+    python benchmarks/bench_checkout_render.py [--n 200000] [--rate 200]
+"""
+import argparse
+import os
+import secrets
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from starlette.responses import HTMLResponse, JSONResponse  # noqa: E402
+
+from presentation.renderers.mpg_form import render_mpg_form_html  # noqa: E402
+
+ACTION_URL = "https://ccore.newebpay.com/MPG/mpg_gateway"
+FIELDS = {
+    "MerchantID": "MS1234567",
+    "TradeInfo": secrets.token_hex(304),
+    "TradeSha": secrets.token_hex(32).upper(),
+    "Version": "2.3",
+}
+
+
+def old_fstring() -> HTMLResponse:
+    inputs = "\n".join(f'<input type="hidden" name="{k}" value="{v}"/>' for k, v in FIELDS.items())
+    html = f"""
+    <html><body>
+      <form id="newebpay" method="post" action="{ACTION_URL}">
+        {inputs}
+        <noscript><button type="submit">Continue to Pay</button></noscript>
+      </form>
+      <script>document.getElementById("newebpay").submit();</script>
+    </body></html>
+    """
+    return HTMLResponse(content=html)
+
+
+def renderer() -> HTMLResponse:
+    return HTMLResponse(content=render_mpg_form_html(ACTION_URL, FIELDS))
+
+
+def json_mode() -> JSONResponse:
+    return JSONResponse(content={"action_url": ACTION_URL, "fields": {k: str(v) for k, v in FIELDS.items()}})
+
+
+def bench(fn, n: int) -> float:
+    for _ in range(1000):
+        fn()
+    started = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - started) / n
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--rate", type=float, default=200.0, help="checkouts per second to size against")
+    args = parser.parse_args()
+
+    print(f"{'variant':<14}{'us/call':>10}{'bytes':>8}{'core % @ rate':>16}")
+    for name, fn in (("f-string", old_fstring), ("renderer", renderer), ("json", json_mode)):
+        per_call = bench(fn, args.n)
+        size = len(fn().body)
+        print(f"{name:<14}{per_call * 1e6:>10.2f}{size:>8}{per_call * args.rate * 100:>15.3f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+"""
+Per-operation cost of the Newebpay crypto on the checkout and notify paths:
+free functions (re-encode key material, rebuild Cipher/padder, rebuild the SHA prefix per call)
+vs. a NewebpayCrypto bound once to the merchant keys.
+
+    python benchmarks/bench_newebpay_crypto.py [--number 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from infrastructure.external.newebpay.crypto import (  # noqa: E402
+    NewebpayCrypto,
+    aes256_cbc_decrypt_hex,
+    aes256_cbc_encrypt_hex,
+    build_urlencoded_query,
+    newebpay_trade_sha,
+)
+
+HASH_KEY = "12345678901234567890123456789012"
+HASH_IV = "1234567890123456"
+
+CHECKOUT_QS = build_urlencoded_query({
+    "MerchantID": "MS12345678", "RespondType": "JSON", "TimeStamp": 1700000000, "Version": "2.3",
+    "MerchantOrderNo": "RES1231700000000", "Amt": 400, "ItemDesc": "Court A 2026-01-01 20:00",
+    "NotifyURL": "https://example.com/newebpay/notify", "ReturnURL": "https://example.com/return",
+    "LangType": "zh-tw", "CREDIT": 1,
+}).encode("utf-8")
+NOTIFY_QS = build_urlencoded_query({
+    "Status": "SUCCESS", "Message": "授權成功", "MerchantID": "MS12345678", "Amt": 400,
+    "TradeNo": "23092714215835071", "MerchantOrderNo": "RES1231700000000", "PaymentType": "CREDIT",
+    "RespondType": "String", "PayTime": "2026-01-01 20:00:00", "IP": "127.0.0.1", "EscrowBank": "HNCB",
+    "AuthBank": "KGI", "RespondCode": "00", "Auth": "115468", "Card6No": "400022", "Card4No": "1111",
+}).encode("utf-8")
+
+
+def legacy_checkout():
+    hex_ = aes256_cbc_encrypt_hex(CHECKOUT_QS, HASH_KEY.encode("utf-8"), HASH_IV.encode("utf-8"))
+    return newebpay_trade_sha(HASH_KEY, HASH_IV, hex_)
+
+
+def legacy_notify(hex_, sha):
+    if newebpay_trade_sha(HASH_KEY, HASH_IV, hex_) != sha:
+        raise ValueError
+    return aes256_cbc_decrypt_hex(hex_, HASH_KEY.encode("utf-8"), HASH_IV.encode("utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    crypto = NewebpayCrypto(HASH_KEY, HASH_IV)
+    notify_hex = crypto.encrypt_hex(NOTIFY_QS)
+    notify_sha = crypto.sign(notify_hex)
+    assert crypto.sign(crypto.encrypt_hex(CHECKOUT_QS)) == legacy_checkout()
+    assert crypto.decrypt_hex(notify_hex) == legacy_notify(notify_hex, notify_sha) == NOTIFY_QS
+
+    def bound_checkout():
+        return crypto.sign(crypto.encrypt_hex(CHECKOUT_QS))
+
+    def bound_notify():
+        if not crypto.verify(notify_hex, notify_sha):
+            raise ValueError
+        return crypto.decrypt_hex(notify_hex)
+
+    cases = [
+        ("checkout form (encrypt + TradeSha)", legacy_checkout, bound_checkout),
+        ("notify verify (TradeSha + decrypt)", lambda: legacy_notify(notify_hex, notify_sha), bound_notify),
+    ]
+    print(f"{'operation':<38}{'legacy us/op':>14}{'bound us/op':>14}{'speedup':>10}")
+    for name, legacy, bound in cases:
+        t_legacy = min(timeit.repeat(legacy, number=args.number, repeat=5)) / args.number * 1e6
+        t_bound = min(timeit.repeat(bound, number=args.number, repeat=5)) / args.number * 1e6
+        print(f"{name:<38}{t_legacy:>14.2f}{t_bound:>14.2f}{t_legacy / t_bound:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
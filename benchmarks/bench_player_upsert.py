@@ -0,0 +1,89 @@
+"""
+Resolving a reservation roster to player ids, for roster sizes 1..100 (half the names
+already exist): the per-name get_by_name + create-and-commit path vs. PlayerRepository.upsert_many
+(one INSERT ... ON CONFLICT ... RETURNING statement).
+
+Needs a migrated database from the app's settings. Everything runs inside one transaction
+that is rolled back at the end; per-player commits become savepoint releases, so the old
+path's numbers are a lower bound of what it costs against real commits.
+
+    python benchmarks/bench_player_upsert.py [--sizes 1 5 12 25 50 100] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from infrastructure.database.models.player import Player as PlayerModel  # noqa: E402
+from infrastructure.database.repositories.player import PlayerRepository  # noqa: E402
+from infrastructure.database.session import engine  # noqa: E402
+
+
+def one_by_one(db: Session, names) -> dict:
+    repo = PlayerRepository(db)
+    ids = {}
+    for name in names:
+        player = repo.get_by_name(name)
+        if player is None:
+            m = PlayerModel(name=name)
+            db.add(m)
+            db.commit()
+            ids[name] = m.id
+        else:
+            ids[name] = player.id
+    return ids
+
+
+def batched(db: Session, names) -> dict:
+    return PlayerRepository(db).upsert_many(names)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 12, 25, 50, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    statements = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*_):
+        statements[0] += 1
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            db = Session(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+            print(f"{'roster':>6}  {'1-by-1 stmts':>12}  {'1-by-1 ms':>9}  {'upsert stmts':>12}  {'upsert ms':>9}")
+            for size in args.sizes:
+                results = {}
+                for label, fn in (("old", one_by_one), ("new", batched)):
+                    best, count = float("inf"), 0
+                    for _ in range(args.repeat):
+                        run = uuid.uuid4().hex[:8]
+                        existing = [f"bench-{run}-{i}" for i in range(size // 2)]
+                        batched(db, existing)
+                        roster = existing + [f"bench-{run}-{i}" for i in range(size // 2, size)]
+                        db.expunge_all()
+                        statements[0] = 0
+                        t0 = time.perf_counter()
+                        ids = fn(db, roster)
+                        best = min(best, time.perf_counter() - t0)
+                        count = statements[0]
+                        assert len(ids) == size
+                    results[label] = (count, best * 1000)
+                (os_, ot), (ns, nt) = results["old"], results["new"]
+                print(f"{size:>6}  {os_:>12}  {ot:>9.2f}  {ns:>12}  {nt:>9.2f}")
+            db.close()
+        finally:
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
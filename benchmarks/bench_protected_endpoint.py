@@ -0,0 +1,80 @@
+"""
+Latency of a protected endpoint (get_current_admin_claims dependency) per request:
+a token service without the verified-token cache (full JWT decode every time)
+vs. the shared service with the cache. Runs in-process over ASGI; no database round trips,
+but the app's settings (.env / environment) must be present because importing the
+dependencies builds the engines.
+
+    python benchmarks/bench_protected_endpoint.py [--requests 5000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import timeit
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from infrastructure.external.security.jwt_token import JwtTokenService  # noqa: E402
+from infrastructure.external.security.token_cache import VerifiedTokenCache  # noqa: E402
+from presentation.dependencies.auth import get_current_admin_claims, get_token_service  # noqa: E402
+
+SECRET = "bench-secret-bench-secret-bench-secret"
+
+
+def build_app(service: JwtTokenService) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(claims: dict = Depends(get_current_admin_claims)) -> dict:
+        return {"id": claims["id"], "username": claims["sub"]}
+
+    app.dependency_overrides[get_token_service] = lambda: service
+    return app
+
+
+async def drive(app: FastAPI, token: str, n: int) -> list:
+    headers = {"Authorization": f"Bearer {token}"}
+    lat = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as c:
+        for _ in range(50):
+            await c.get("/whoami", headers=headers)
+        for _ in range(n):
+            t0 = time.perf_counter()
+            r = await c.get("/whoami", headers=headers)
+            lat.append(time.perf_counter() - t0)
+            assert r.status_code == 200, r.text
+    return lat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--algorithm", default="HS256")
+    args = parser.parse_args()
+
+    uncached = JwtTokenService(SECRET, args.algorithm)
+    cached = JwtTokenService(SECRET, args.algorithm, cache=VerifiedTokenCache(maxsize=1024))
+    token = uncached.create_access_token(subject="admin", id=1, expires_delta=timedelta(minutes=30))
+
+    number = 20000
+    for name, svc in (("decode, no cache", uncached), ("decode, cached", cached)):
+        t = min(timeit.repeat(lambda: svc.decode_access_token(token), number=number, repeat=5)) / number * 1e6
+        print(f"{name:<28}{t:>8.2f} us/op")
+    print()
+
+    for name, svc in (("endpoint, no cache", uncached), ("endpoint, cached", cached)):
+        lat = sorted(asyncio.run(drive(build_app(svc), token, args.requests)))
+        p50 = statistics.median(lat) * 1e6
+        p95 = lat[int(len(lat) * 0.95) - 1] * 1e6
+        print(f"{name:<28}p50 {p50:>8.1f} us   p95 {p95:>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
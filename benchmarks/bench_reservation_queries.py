@@ -0,0 +1,107 @@
+"""
+SQL statements and wall time to list N reservations with their players and payments:
+plain select + lazy relationship access (one query per reservation per relationship)
+vs. ReservationRepository.list_page (selectinload/joinedload, constant query count).
+
+Needs a migrated database from the app's settings. Everything is written inside one
+transaction that is rolled back at the end, so no data is left behind.
+
+    python benchmarks/bench_reservation_queries.py [--sizes 10 50 200]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from sqlalchemy import event, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from application.dtos.reservation import ReservationListQuery  # noqa: E402
+from domain.enums.payment import PaymentStatus  # noqa: E402
+from domain.enums.reservation import ReservationStatus  # noqa: E402
+from infrastructure.database.models import PaymentModel, Player, Reservation, ReservationParticipant  # noqa: E402
+from infrastructure.database.repositories.reservation import ReservationRepository  # noqa: E402
+from infrastructure.database.session import engine  # noqa: E402
+
+PLAYERS_PER_RESERVATION = 4
+PAYMENTS_PER_RESERVATION = 2
+
+
+def seed(db: Session, n: int, day: datetime, tag: int) -> None:
+    players = [Player(name=f"bench-player-{i}") for i in range(PLAYERS_PER_RESERVATION)]
+    db.add_all(players)
+    db.flush()
+    for i in range(n):
+        r = Reservation(
+            status=ReservationStatus.UNPAID, court_name=f"bench-{i % 6}", starts_at=day + timedelta(minutes=i),
+            fee_per_person=100, total_amount_twd=100 * PLAYERS_PER_RESERVATION,
+            players=[ReservationParticipant(player_id=p.id) for p in players],
+        )
+        r.payments = [
+            PaymentModel(
+                id=f"BENCH{tag:03d}{i:06d}{k}", payer_name="n", payer_email="e", payer_phone="p",
+                amount_twd=200, status=PaymentStatus.PAID if k == 0 else PaymentStatus.PENDING,
+            )
+            for k in range(PAYMENTS_PER_RESERVATION)
+        ]
+        db.add(r)
+    db.flush()
+
+
+def naive(db: Session, start: datetime, end: datetime) -> int:
+    rows = db.scalars(
+        select(Reservation).where(Reservation.starts_at >= start, Reservation.starts_at < end)
+        .order_by(Reservation.starts_at, Reservation.id)
+    ).all()
+    touched = 0
+    for r in rows:
+        touched += sum(1 for p in r.players if p.player.name) + len(r.payments)
+    return len(rows)
+
+
+def repository(db: Session, start: datetime, end: datetime, n: int) -> int:
+    page = ReservationRepository(db).list_page(ReservationListQuery(starts_from=start, starts_before=end, limit=n))
+    return len(page.items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    args = parser.parse_args()
+
+    statements = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*_):
+        statements[0] += 1
+
+    # far in the future so existing rows never fall into the window
+    base = datetime(2199, 1, 1, tzinfo=timezone.utc)
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            db = Session(bind=conn, join_transaction_mode="create_savepoint")
+            print(f"{'reservations':>12}  {'lazy stmts':>10}  {'lazy ms':>8}  {'repo stmts':>10}  {'repo ms':>8}")
+            for i, n in enumerate(args.sizes):
+                day = base + timedelta(days=i)
+                seed(db, n, day, i)
+                end = day + timedelta(days=1)
+                results = []
+                for fn in (lambda: naive(db, day, end), lambda: repository(db, day, end, n)):
+                    db.expunge_all()  # cold identity map, like a fresh request
+                    statements[0] = 0
+                    t0 = time.perf_counter()
+                    assert fn() == n
+                    results.append((statements[0], (time.perf_counter() - t0) * 1000))
+                (ls, lt), (rs, rt) = results
+                print(f"{n:>12}  {ls:>10}  {lt:>8.1f}  {rs:>10}  {rt:>8.1f}")
+            db.close()
+        finally:
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
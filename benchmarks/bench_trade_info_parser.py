@@ -0,0 +1,58 @@
+"""
+Decrypted TradeInfo parsing: the previous unquote_plus(whole string) + parse_qsl path
+vs. the single-pass parse_trade_info that also builds the typed TradeResult.
+
+    python benchmarks/bench_trade_info_parser.py [--number 50000]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from urllib.parse import unquote_plus
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from infrastructure.external.newebpay.crypto import build_urlencoded_query, parse_urlencoded_query  # noqa: E402
+from infrastructure.external.newebpay.trade_info import parse_trade_info  # noqa: E402
+
+FIELDS = {
+    "Status": "SUCCESS", "Message": "授權成功", "MerchantID": "MS12345678", "Amt": 400,
+    "TradeNo": "23092714215835071", "MerchantOrderNo": "RES1231700000000", "PaymentType": "CREDIT",
+    "RespondType": "String", "PayTime": "2026-01-01 20:00:00", "IP": "127.0.0.1", "EscrowBank": "HNCB",
+    "AuthBank": "KGI", "RespondCode": "00", "Auth": "115468", "Card6No": "400022", "Card4No": "1111",
+    "ItemDesc": "Court A & B = doubles",
+}
+STRING_PAYLOAD = build_urlencoded_query(FIELDS)
+JSON_PAYLOAD = json.dumps({
+    "Status": "SUCCESS", "Message": "授權成功",
+    "Result": {**FIELDS, "RespondType": "JSON"},
+}, ensure_ascii=False)
+
+
+def legacy(plain: str):
+    return parse_urlencoded_query(unquote_plus(plain))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=50000)
+    args = parser.parse_args()
+
+    old = legacy(STRING_PAYLOAD)
+    new = parse_trade_info(STRING_PAYLOAD)
+    print(f"ItemDesc legacy: {old.get('ItemDesc')!r}   single-pass: {new.extra['ItemDesc']!r}")
+    print(f"JSON mode merchant_order_no: {parse_trade_info(JSON_PAYLOAD).merchant_order_no!r}\n")
+
+    cases = [
+        ("String: unquote_plus + parse_qsl", lambda: legacy(STRING_PAYLOAD)),
+        ("String: parse_trade_info", lambda: parse_trade_info(STRING_PAYLOAD)),
+        ("JSON:   parse_trade_info", lambda: parse_trade_info(JSON_PAYLOAD)),
+    ]
+    for name, fn in cases:
+        t = min(timeit.repeat(fn, number=args.number, repeat=5)) / args.number * 1e6
+        print(f"{name:<36}{t:>8.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Property check for SnowflakeOrderNumberGenerator: millions of MerchantOrderNos from several
+processes at once (same node id, as uvicorn workers on one host get), half of them on a
+randomly jittering clock that also steps backwards. Checks that every id is
+
+  - unique across all processes,
+  - at most 30 characters from Newebpay's alphabet,
+  - strictly increasing within its process,
+
+and reports generation throughput. Needs no database or app settings.
+
+    python benchmarks/check_order_numbers.py [--processes 4] [--per-process 500000] [--seed 1]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from infrastructure.external.newebpay import order_number  # noqa: E402
+from infrastructure.external.newebpay.order_number import SnowflakeOrderNumberGenerator  # noqa: E402
+
+_NEWEBPAY_SAFE = re.compile(r"^[A-Za-z0-9_]{1,30}$")
+_NODE_ID = 7
+
+
+def _jittery_clock(seed: int):
+    rng = random.Random(seed)
+    real = time.time_ns
+
+    def time_ns() -> int:
+        # up to 5 ms either way, so consecutive reads go backwards regularly
+        return real() + rng.randint(-5_000_000, 5_000_000)
+
+    return time_ns
+
+
+def _generate(args):
+    index, count, seed = args
+    if index % 2:
+        order_number.time.time_ns = _jittery_clock(seed + index)
+    gen = SnowflakeOrderNumberGenerator(node_id=_NODE_ID)
+    started = time.perf_counter()
+    ids = [gen.next_order_no() for _ in range(count)]
+    elapsed = time.perf_counter() - started
+    problems = []
+    for prev, cur in zip(ids, ids[1:]):
+        if cur <= prev:
+            problems.append(f"not increasing in pid {os.getpid()}: {prev} -> {cur}")
+            break
+    bad = next((i for i in ids if not _NEWEBPAY_SAFE.match(i)), None)
+    if bad is not None:
+        problems.append(f"not Newebpay-safe: {bad!r}")
+    return ids, elapsed, problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--per-process", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    with ctx.Pool(args.processes) as pool:
+        results = pool.map(_generate, [(i, args.per_process, args.seed) for i in range(args.processes)])
+
+    seen = set()
+    duplicates = 0
+    problems = []
+    for ids, _, errs in results:
+        problems.extend(errs)
+        before = len(seen)
+        seen.update(ids)
+        duplicates += len(ids) - (len(seen) - before)
+    total = args.processes * args.per_process
+    rate = sum(len(ids) / elapsed for ids, elapsed, _ in results) / len(results)
+    sample = results[0][0][0]
+
+    print(f"ids generated:      {total:,} from {args.processes} processes")
+    print(f"duplicates:         {duplicates}")
+    print(f"example:            {sample} ({len(sample)} chars)")
+    print(f"per-process rate:   {rate:,.0f} ids/s")
+    for p in problems:
+        print(f"FAIL {p}")
+    ok = duplicates == 0 and not problems
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+"""
+Local stand-in for the Newebpay endpoints the app calls, for load tests: QueryTradeInfo
+(CheckValue verified, answers TradeStatus from --trade-status with a valid CheckCode), credit-card cancel/close,
+e-wallet refund and the MPG gateway page. Optional --delay-ms adds upstream latency.
+
+    python benchmarks/fake_newebpay.py [--port 18090] [--delay-ms 0] [--trade-status 0]
+
+Reads MERCHANT_ID / HASH_KEY / HASH_IV from the environment, like the app.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse
+from starlette.routing import Route
+
+QUERY_PATH = "/API/QueryTradeInfo"
+CANCEL_PATH = "/API/CreditCard/Cancel"
+CLOSE_PATH = "/API/CreditCard/Close"
+EWALLET_REFUND_PATH = "/API/EWallet/refund"
+MPG_PATH = "/MPG/mpg_gateway"
+
+
+def _check_value(hash_key: str, hash_iv: str, merchant_id: str, merchant_order_no: str, amt: str) -> str:
+    # 4.1.6: SHA256("IV={iv}&Amt=..&MerchantID=..&MerchantOrderNo=..&Key={key}"), upper-case
+    raw = f"IV={hash_iv}&Amt={amt}&MerchantID={merchant_id}&MerchantOrderNo={merchant_order_no}&Key={hash_key}"
+    return hashlib.sha256(raw.encode()).hexdigest().upper()
+
+
+def _check_code(hash_key: str, hash_iv: str, merchant_id: str, merchant_order_no: str, amt: str, trade_no: str) -> str:
+    # 4.3.2: SHA256("HashIV={iv}&Amt=..&MerchantID=..&MerchantOrderNo=..&TradeNo=..&HashKey={key}"), upper-case
+    raw = (
+        f"HashIV={hash_iv}&Amt={amt}&MerchantID={merchant_id}&MerchantOrderNo={merchant_order_no}"
+        f"&TradeNo={trade_no}&HashKey={hash_key}"
+    )
+    return hashlib.sha256(raw.encode()).hexdigest().upper()
+
+
+def build_app(merchant_id: str, hash_key: str, hash_iv: str, delay_ms: float = 0.0, trade_status: str = "0") -> Starlette:
+    async def _delay() -> None:
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    async def query_trade_info(request: Request) -> JSONResponse:
+        await _delay()
+        form = await request.form()
+        order_no, amt = str(form.get("MerchantOrderNo", "")), str(form.get("Amt", ""))
+        expected = _check_value(hash_key, hash_iv, merchant_id, order_no, amt)
+        if form.get("MerchantID") != merchant_id or form.get("CheckValue") != expected:
+            return JSONResponse({"Status": "TRA10003", "Message": "CheckValue mismatch", "Result": {}})
+        trade_no = f"FAKE{order_no[-16:]}"
+        return JSONResponse({
+            "Status": "SUCCESS",
+            "Message": "",
+            "Result": {
+                "MerchantID": merchant_id,
+                "Amt": int(amt or 0),
+                "TradeNo": trade_no,
+                "MerchantOrderNo": order_no,
+                "TradeStatus": trade_status,
+                "PaymentType": "CREDIT",
+                "PayTime": "2026-01-01 00:00:00",
+                "CheckCode": _check_code(hash_key, hash_iv, merchant_id, order_no, str(int(amt or 0)), trade_no),
+            },
+        })
+
+    async def accept_post_data(request: Request) -> JSONResponse:
+        await _delay()
+        await request.form()
+        return JSONResponse({"Status": "SUCCESS", "Message": "", "Result": {}})
+
+    async def mpg_gateway(request: Request) -> HTMLResponse:
+        await request.form()
+        return HTMLResponse("<html><body>fake MPG</body></html>")
+
+    return Starlette(routes=[
+        Route(QUERY_PATH, query_trade_info, methods=["POST"]),
+        Route(CANCEL_PATH, accept_post_data, methods=["POST"]),
+        Route(CLOSE_PATH, accept_post_data, methods=["POST"]),
+        Route(EWALLET_REFUND_PATH, accept_post_data, methods=["POST"]),
+        Route(MPG_PATH, mpg_gateway, methods=["POST"]),
+    ])
+
+
+def endpoint_env(base_url: str) -> dict:
+    """Environment overrides pointing the app's NewebpayEndpoints at this server."""
+    return {
+        "MPG": base_url + MPG_PATH,
+        "QUERY": base_url + QUERY_PATH,
+        "CANCEL": base_url + CANCEL_PATH,
+        "CLOSE": base_url + CLOSE_PATH,
+        "EWALLET_REFUND": base_url + EWALLET_REFUND_PATH,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18090)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--trade-status", default="0", help="QueryTradeInfo TradeStatus: 0 unpaid, 1 paid, 2 failed, 3 canceled")
+    args = parser.parse_args()
+
+    missing = [k for k in ("MERCHANT_ID", "HASH_KEY", "HASH_IV") if not os.environ.get(k)]
+    if missing:
+        sys.exit(f"missing environment: {', '.join(missing)}")
+    app = build_app(
+        os.environ["MERCHANT_ID"], os.environ["HASH_KEY"], os.environ["HASH_IV"],
+        delay_ms=args.delay_ms, trade_status=args.trade_status,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+"""
+End-to-end load test. Boots the app under uvicorn against the Postgres in DATABASE_URL, with
+the Newebpay endpoints pointed at a local fake (benchmarks/fake_newebpay.py). It then drives
+/payment/checkout, /newebpay/notify (TradeInfo encrypted with the configured HASH_KEY/IV),
+/login and /me at a fixed concurrency, one scenario at a time.
+
+Per scenario it reports p50/p95/p99 latency, throughput, status codes and SQL statements per
+request; the statement counts come from the app's X-DB-* debug headers. Results are written as
+JSON, so runs can be compared across commits. With --baseline it exits 1 when a scenario got
+slower than --max-regression allows.
+
+    python benchmarks/loadtest.py [--scenarios checkout,notify,login,me] [--concurrency 16]
+        [--duration 10] [--warmup 2] [--workers 1] [--out results.json]
+        [--baseline previous.json] [--max-regression 0.10] [--min-delta-ms 1.0]
+
+Use a throwaway database; it is brought to `alembic upgrade head` first. Rows are seeded in a
+reserved range (reservation ids >= 900000000, BENCH* payments, user "bench"), and that range
+is wiped at the start of every run. The app's environment (JWT_*, MERCHANT_ID, HASH_KEY,
+HASH_IV) must be set; the Newebpay endpoint variables are overridden. Every notify pays one
+seeded payment; once --notify-pool is used up the payloads repeat and take the duplicate path.
+Latency is measured client-side from one asyncio process, so keep --concurrency in the range
+that process can drive (watch its CPU) when comparing runs.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_DIR = os.path.join(ROOT, "app")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from fake_newebpay import endpoint_env  # noqa: E402
+from infrastructure.external.newebpay.crypto import (  # noqa: E402
+    aes256_cbc_encrypt_hex,
+    build_urlencoded_query,
+    newebpay_trade_sha,
+)
+from infrastructure.external.security.password_hasher import _pwd_ctx  # noqa: E402
+
+SCENARIOS = ("checkout", "notify", "login", "me")
+BENCH_RESERVATION_BASE = 900_000_000
+BENCH_ORDER_PREFIX = "BENCH"
+BENCH_USER = "bench"
+BENCH_PASSWORD = "bench-password"
+AMOUNT_TWD = 100
+
+
+# ---------- fixtures ----------
+
+def _sync_url(url: str) -> str:
+    # the app accepts an asyncpg URL for DATABASE_URL; seeding runs on psycopg2
+    return url.replace("postgresql+asyncpg://", "postgresql+psycopg2://", 1)
+
+
+def migrate(database_url: str) -> None:
+    # the schema comes from the shipped migrations, exactly as in production
+    env = {**os.environ, "DATABASE_URL": _sync_url(database_url)}
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "-c", os.path.join(ROOT, "alembic.ini"), "upgrade", "head"],
+        cwd=ROOT, env=env, check=True,
+    )
+
+
+def seed(database_url: str, reservations: int, notify_pool: int) -> None:
+    engine = create_engine(_sync_url(database_url))
+    with engine.begin() as c:
+        # payments, totals and participants go with their reservation (ON DELETE CASCADE)
+        c.execute(text("DELETE FROM reservations WHERE id >= :base"), {"base": BENCH_RESERVATION_BASE})
+        c.execute(text("DELETE FROM processed_notifies WHERE merchant_order_no LIKE :p"), {"p": BENCH_ORDER_PREFIX + "%"})
+        c.execute(
+            text("""
+                INSERT INTO reservations (id, status, court_name, starts_at, fee_per_person, total_amount_twd)
+                SELECT :base + g, 'UNPAID', 'bench', now() + interval '1 day', :amt, :amt * 4
+                FROM generate_series(0, :n - 1) g
+            """),
+            {"base": BENCH_RESERVATION_BASE, "n": reservations, "amt": AMOUNT_TWD},
+        )
+        c.execute(
+            text("""
+                INSERT INTO payments (id, reservation_id, payer_name, payer_email, payer_phone, amount_twd,
+                                      payment_provider, status, merchant_order_no, created_at, updated_at)
+                SELECT :prefix || lpad(g::text, 10, '0'), :base + g % :n, 'bench', 'bench@example.com',
+                       '0900000000', :amt, 'NEWEBPAY', 'PENDING', :prefix || lpad(g::text, 10, '0'), now(), now()
+                FROM generate_series(0, :pool - 1) g
+            """),
+            {"prefix": BENCH_ORDER_PREFIX, "base": BENCH_RESERVATION_BASE, "n": reservations,
+             "pool": notify_pool, "amt": AMOUNT_TWD},
+        )
+        c.execute(
+            text("""
+                INSERT INTO users (id, username, password_hash)
+                VALUES ((SELECT coalesce(max(id), 0) + 1 FROM users), :u, :h)
+                ON CONFLICT (username) DO UPDATE SET password_hash = EXCLUDED.password_hash
+            """),
+            {"u": BENCH_USER, "h": _pwd_ctx.hash(BENCH_PASSWORD)},
+        )
+    engine.dispose()
+
+
+def notify_payloads(merchant_id: str, hash_key: str, hash_iv: str, pool: int) -> List[Dict[str, str]]:
+    # encrypted up front so the client's AES work stays off the clock
+    payloads = []
+    for i in range(pool):
+        order_no = f"{BENCH_ORDER_PREFIX}{i:010d}"
+        trade_info = aes256_cbc_encrypt_hex(
+            build_urlencoded_query({
+                "Status": "SUCCESS", "MerchantID": merchant_id, "MerchantOrderNo": order_no,
+                "TradeNo": f"T{order_no}", "Amt": AMOUNT_TWD, "PaymentType": "CREDIT",
+                "PayTime": "2026-01-01 10:00:00",
+            }).encode(),
+            hash_key.encode(),
+            hash_iv.encode(),
+        )
+        payloads.append({
+            "Status": "SUCCESS", "MerchantID": merchant_id, "Version": "2.3",
+            "TradeInfo": trade_info, "TradeSha": newebpay_trade_sha(hash_key, hash_iv, trade_info),
+        })
+    return payloads
+
+
+# ---------- processes ----------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, proc: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f"{proc.args[1]} exited with {proc.returncode} before listening on {port}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    sys.exit(f"nothing listening on {port} after {timeout:.0f}s")
+
+
+def start_servers(args: argparse.Namespace) -> List[subprocess.Popen]:
+    fake_port, app_port = _free_port(), _free_port()
+    fake = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "benchmarks", "fake_newebpay.py"),
+         "--port", str(fake_port), "--delay-ms", str(args.upstream_delay_ms)],
+    )
+    _wait_for_port(fake_port, fake)
+
+    env = {
+        **os.environ,
+        **endpoint_env(f"http://127.0.0.1:{fake_port}"),
+        "SQL_DEBUG_HEADERS": "true",
+        "ORDER_NO_NODE_ID": os.environ.get("ORDER_NO_NODE_ID", "0"),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+        # background loops would compete with the measured requests
+        "EXPIRY_INTERVAL_SECONDS": "0",
+        "RECONCILE_INTERVAL_SECONDS": "0",
+    }
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(app_port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=APP_DIR,
+        env=env,
+    )
+    _wait_for_port(app_port, app)
+    args.base_url = f"http://127.0.0.1:{app_port}"
+    return [app, fake]
+
+
+def stop_servers(procs: List[subprocess.Popen]) -> None:
+    for proc in procs:
+        proc.terminate()
+    for proc in procs:
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# ---------- driver ----------
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    db_statements: List[int] = field(default_factory=list)
+    db_ms: List[float] = field(default_factory=list)
+
+
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def build_scenarios(args: argparse.Namespace, token: Optional[str], payloads: List[dict]) -> Dict[str, RequestFn]:
+    async def checkout(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.post("/payment/checkout", json={
+            "reservation_info": {"id": str(BENCH_RESERVATION_BASE + i % args.reservations), "players": ["bench"]},
+            "payer_info": {"name": "bench", "email": "bench@example.com", "phone": "0900000000"},
+            "amount_twd": AMOUNT_TWD,
+            "item_desc": "court",
+            "notify_url": "http://127.0.0.1/notify",
+        })
+
+    async def notify(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.post("/newebpay/notify", data=payloads[i % len(payloads)])
+
+    async def login(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.post("/login", data={"username": BENCH_USER, "password": BENCH_PASSWORD})
+
+    async def me(c: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await c.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+    return {"checkout": checkout, "notify": notify, "login": login, "me": me}
+
+
+async def _drive(client: httpx.AsyncClient, fn: RequestFn, counter: itertools.count,
+                 deadline: float, samples: Optional[Samples]) -> None:
+    while time.perf_counter() < deadline:
+        i = next(counter)
+        started = time.perf_counter()
+        try:
+            r = await fn(client, i)
+            status = r.status_code
+        except httpx.HTTPError:
+            r, status = None, 0
+        elapsed = time.perf_counter() - started
+        if samples is None:
+            continue
+        samples.latencies.append(elapsed)
+        samples.statuses[status] += 1
+        if r is not None and "x-db-statements" in r.headers:
+            samples.db_statements.append(int(r.headers["x-db-statements"]))
+            samples.db_ms.append(float(r.headers["x-db-time-ms"]))
+
+
+async def run_scenario(base_url: str, fn: RequestFn, counter: itertools.count, args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        if args.warmup > 0:
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(_drive(client, fn, counter, deadline, None) for _ in range(args.concurrency)))
+        samples = Samples()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(_drive(client, fn, counter, deadline, samples) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+async def login_token(base_url: str) -> str:
+    async with httpx.AsyncClient(base_url=base_url) as c:
+        r = await c.post("/login", data={"username": BENCH_USER, "password": BENCH_PASSWORD})
+        r.raise_for_status()
+        return r.json()["access_token"]
+
+
+# ---------- report ----------
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # nearest rank
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))]
+
+
+def summarize(samples: Samples, elapsed: float) -> dict:
+    lat = sorted(x * 1000 for x in samples.latencies)
+    total = len(lat)
+    ok = sum(n for s, n in samples.statuses.items() if 200 <= s < 300)
+    rejected = samples.statuses.get(429, 0) + samples.statuses.get(503, 0)
+    stmts = sorted(samples.db_statements)
+    return {
+        "requests": total,
+        "ok": ok,
+        "rejected": rejected,             # 429 / 503 backpressure, not failures
+        "errors": total - ok - rejected,  # includes transport errors (status 0)
+        "statuses": {str(s): n for s, n in sorted(samples.statuses.items())},
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(lat) / total, 3) if total else 0.0,
+        "p50_ms": round(_percentile(lat, 0.50), 3),
+        "p95_ms": round(_percentile(lat, 0.95), 3),
+        "p99_ms": round(_percentile(lat, 0.99), 3),
+        "max_ms": round(lat[-1], 3) if lat else 0.0,
+        "db_statements_mean": round(sum(stmts) / len(stmts), 2) if stmts else None,
+        "db_statements_p95": _percentile(stmts, 0.95) if stmts else None,
+        "db_ms_mean": round(sum(samples.db_ms) / len(samples.db_ms), 3) if samples.db_ms else None,
+    }
+
+
+def _git(*cmd: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *cmd], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(args: argparse.Namespace) -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+    }
+
+
+def print_table(results: Dict[str, dict]) -> None:
+    print(f"{'scenario':<10}{'req':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'err':>6}{'rej':>6}{'sql/req':>9}{'db ms':>8}")
+    for name, r in results.items():
+        sql = f"{r['db_statements_mean']:.1f}" if r["db_statements_mean"] is not None else "-"
+        db_ms = f"{r['db_ms_mean']:.2f}" if r["db_ms_mean"] is not None else "-"
+        print(f"{name:<10}{r['requests']:>8}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['errors']:>6}{r['rejected']:>6}{sql:>9}{db_ms:>8}")
+
+
+def find_regressions(current: Dict[str, dict], baseline: Dict[str, dict],
+                     max_regression: float, min_delta_ms: float) -> List[str]:
+    """Latency may grow by `max_regression` (and at least `min_delta_ms`); throughput may drop by as much."""
+    problems = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = base[key] * (1 + max_regression)
+            if cur[key] > limit and cur[key] - base[key] > min_delta_ms:
+                problems.append(f"{name} {key}: {base[key]:.2f} -> {cur[key]:.2f} (limit {limit:.2f})")
+        floor = base["throughput_rps"] * (1 - max_regression)
+        if cur["throughput_rps"] < floor:
+            problems.append(f"{name} throughput_rps: {base['throughput_rps']:.1f} -> {cur['throughput_rps']:.1f} (floor {floor:.1f})")
+        if cur["errors"] and cur["errors"] / max(cur["requests"], 1) > base["errors"] / max(base["requests"], 1):
+            problems.append(f"{name} errors: {base['errors']}/{base['requests']} -> {cur['errors']}/{cur['requests']}")
+    return problems
+
+
+# ---------- main ----------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds per scenario")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--reservations", type=int, default=200)
+    parser.add_argument("--notify-pool", type=int, default=5000, help="seeded PENDING payments for notify")
+    parser.add_argument("--upstream-delay-ms", type=float, default=0.0, help="fake Newebpay response delay")
+    parser.add_argument("--base-url", default=None, help="drive an already running app instead of booting one")
+    parser.add_argument("--out", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=None, help="results JSON of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore latency changes smaller than this")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    missing = [k for k in ("DATABASE_URL", "MERCHANT_ID", "HASH_KEY", "HASH_IV") if not os.environ.get(k)]
+    if missing:
+        sys.exit(f"missing environment: {', '.join(missing)}")
+
+    migrate(os.environ["DATABASE_URL"])
+    seed(os.environ["DATABASE_URL"], args.reservations, args.notify_pool)
+    payloads = notify_payloads(os.environ["MERCHANT_ID"], os.environ["HASH_KEY"], os.environ["HASH_IV"], args.notify_pool)
+
+    procs = [] if args.base_url else start_servers(args)
+    try:
+        token = asyncio.run(login_token(args.base_url)) if "me" in scenarios else None
+        fns = build_scenarios(args, token, payloads)
+        results = {}
+        for name in scenarios:
+            # one counter per scenario: notify walks the payment pool once before repeating
+            results[name] = asyncio.run(run_scenario(args.base_url, fns[name], itertools.count(), args))
+    finally:
+        stop_servers(procs)
+
+    print_table(results)
+    report = {"meta": run_metadata(args), "scenarios": results}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        base_args = baseline["meta"].get("args", {})
+        changed = [k for k in ("concurrency", "duration", "workers", "upstream_delay_ms") if base_args.get(k) != vars(args)[k]]
+        if changed:
+            print(f"\nwarning: baseline was run with different {', '.join(changed)}; numbers are not comparable")
+        problems = find_regressions(results, baseline["scenarios"], args.max_regression, args.min_delta_ms)
+        if problems:
+            print(f"\nregressions against {args.baseline} (commit {baseline['meta'].get('commit')}):")
+            for p in problems:
+                print(f"  {p}")
+            sys.exit(1)
+        print(f"\nno regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()